@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Cheapest Architecture Search
+Finds the provably cheapest assignment of catalog services to the roles
+of an architecture (web tier, database, storage, ...) under per-role
+minimum specs, allowed providers and a single-provider or multi-cloud
+rule, by branch-and-bound over providers
+"""
+
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from comparison_engine import CatalogArrays
+
+
+class Role(NamedTuple):
+    """
+    One part of the architecture, filled by `count` copies of a single
+    service of `category` with at least min_vcpu vCPUs and min_ram_gb GB
+    """
+    name: str
+    category: str = 'compute'
+    min_vcpu: float = 0
+    min_ram_gb: float = 0
+    min_gpu: float = 0
+    count: int = 1
+
+
+class Choice(NamedTuple):
+    role: str
+    provider: str
+    id: str
+    name: str
+    unit_price: float   # monthly price of one copy
+    count: int
+
+    @property
+    def price(self) -> float:
+        return self.unit_price * self.count
+
+
+class Plan(NamedTuple):
+    total: float
+    choices: List[Choice]
+    providers: List[str]
+    nodes: int          # search nodes expanded
+
+
+class ArchitectureOptimizer:
+    """
+    Every feasible service of a role is interchangeable apart from its
+    price and provider, so each role is first reduced to its cheapest
+    offer per provider (one vectorized pass, however many SKUs match).
+    The search then branches over providers role by role, bounded below
+    by the cheapest remaining offer of each unassigned role.
+    """
+
+    def __init__(self, arrays: CatalogArrays):
+        self.arrays = arrays
+
+    def _offers(self, role: Role, providers: List[str], region: Optional[str]) -> np.ndarray:
+        """
+        (providers,) cheapest row of the role per provider, -1 if none qualifies
+        """
+        a = self.arrays
+        best = np.full(len(providers), -1, dtype=np.int64)
+        if role.category not in a.categories:
+            return best
+        mask = (a.category == a.categories.index(role.category)) & (a.price >= 0)
+        # Unknown specs (NaN) only satisfy a role that has no minimum
+        for column, minimum in (('vcpu', role.min_vcpu), ('ram_gb', role.min_ram_gb), ('gpu', role.min_gpu)):
+            if minimum > 0:
+                mask &= getattr(a, column) >= minimum
+        if region is not None:
+            mask &= a.region == (a.regions.index(region) if region in a.regions else -1)
+
+        rows = np.flatnonzero(mask)
+        for p, provider in enumerate(providers):
+            if provider not in a.providers:
+                continue
+            candidates = rows[a.provider[rows] == a.providers.index(provider)]
+            if len(candidates):
+                best[p] = candidates[np.argmin(a.price[candidates])]
+        return best
+
+    def optimize(self, roles: Sequence[Role], providers: Optional[List[str]] = None,
+                 max_providers: Optional[int] = None, min_providers: int = 1,
+                 region: Optional[str] = None) -> Optional[Plan]:
+        """
+        Cheapest plan using only `providers` (default: all) and between
+        min_providers and max_providers distinct providers: 1/1 is
+        single-provider, min_providers=2 forces a multi-cloud spread.
+        Returns None when no plan satisfies the constraints.
+        """
+        a = self.arrays
+        providers = list(providers) if providers is not None else [p for p in a.providers if p]
+        max_providers = len(providers) if max_providers is None else max_providers
+        if not roles or min_providers > min(max_providers, len(roles), len(providers)):
+            return None
+
+        best_rows = np.stack([self._offers(role, providers, region) for role in roles])
+        counts = np.array([role.count for role in roles], dtype=np.float64)
+        cost = np.where(best_rows >= 0, a.price[np.maximum(best_rows, 0)], np.inf) * counts[:, None]
+
+        if not np.isfinite(cost.min(axis=1)).all():
+            return None
+
+        # Roles with the widest price spread are decided first: they move the bound most
+        finite = np.where(np.isfinite(cost), cost, np.nan)
+        spread = np.nanmax(finite, axis=1) - np.nanmin(finite, axis=1)
+        order = np.argsort(-spread, kind='stable')
+        cost = cost[order]
+        # lower[i]: cheapest completion of roles i.. ignoring the provider rules
+        lower = np.concatenate([np.cumsum(cost.min(axis=1)[::-1])[::-1], [0.0]])
+
+        n_roles, n_providers = cost.shape
+        branch_order = [np.argsort(cost[i], kind='stable') for i in range(n_roles)]
+        best_total = np.inf
+        best_assignment: Optional[List[int]] = None
+        assignment = [0] * n_roles
+        used = [0] * n_providers
+        nodes = 0
+
+        def search(i: int, total: float, n_used: int):
+            nonlocal best_total, best_assignment, nodes
+            nodes += 1
+            if i == n_roles:
+                if n_used >= min_providers and total < best_total:
+                    best_total, best_assignment = total, list(assignment)
+                return
+            # Each provider still missing needs a role of its own
+            if n_used + (n_roles - i) < min_providers:
+                return
+            rest = lower[i + 1]
+            if n_used == max_providers and i + 1 < n_roles:
+                # No more providers can be opened: bound with the ones in use
+                rest = cost[i + 1:, np.array(used) > 0].min(axis=1).sum()
+            for p in branch_order[i]:
+                step = cost[i, p]
+                if not np.isfinite(step):
+                    break
+                opens = used[p] == 0
+                if opens and n_used == max_providers:
+                    continue
+                if total + step + rest >= best_total:
+                    # Later providers of this role are dearer still
+                    break
+                assignment[i] = p
+                used[p] += 1
+                search(i + 1, total + step, n_used + opens)
+                used[p] -= 1
+
+        search(0, 0.0, 0)
+        if best_assignment is None:
+            return None
+
+        choices: List[Optional[Choice]] = [None] * n_roles
+        for position, role_index in enumerate(order):
+            role = roles[role_index]
+            provider = best_assignment[position]
+            row = best_rows[role_index, provider]
+            choices[role_index] = Choice(role.name, providers[provider], a.ids[row], a.names[row],
+                                         float(a.price[row]), role.count)
+        return Plan(
+            total=float(best_total),
+            choices=choices,
+            providers=sorted({choice.provider for choice in choices}),
+            nodes=nodes,
+        )
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Concurrent Pricing Refresh
+Fans provider/service/region fetches out on an asyncio event loop with
+per-host concurrency limits and a global deadline
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+class RefreshJob(NamedTuple):
+    """
+    One unit of refresh work. `fetch` runs on a worker thread and returns a
+    {category: [records]} dict that is merged into `provider`'s catalog.
+    """
+    provider: str
+    host: str
+    label: str
+    fetch: Callable[[], Dict]
+
+
+class AsyncPricingRefresh:
+    """
+    Runs RefreshJobs concurrently. The blocking fetchers are reused as-is on a
+    thread pool; asyncio only schedules them, so total wall-clock time is
+    bounded by the slowest job (or the deadline) rather than the sum of all.
+    """
+
+    def __init__(self, per_host_limit: int = 4, host_limits: Optional[Dict[str, int]] = None,
+                 deadline: float = 300.0, max_threads: int = 32):
+        self.per_host_limit = per_host_limit
+        self.host_limits = host_limits or {}
+        self.deadline = deadline
+        self.max_threads = max_threads
+        self.timings: Dict[str, float] = {}
+        self.failed: List[str] = []
+        self.timed_out: List[str] = []
+
+    def _semaphore(self, semaphores: Dict[str, asyncio.Semaphore], host: str) -> asyncio.Semaphore:
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(self.host_limits.get(host, self.per_host_limit))
+        return semaphores[host]
+
+    async def _run_job(self, job: RefreshJob, semaphore: asyncio.Semaphore,
+                       executor: ThreadPoolExecutor) -> Dict:
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            started = time.monotonic()
+            try:
+                return await loop.run_in_executor(executor, job.fetch)
+            finally:
+                self.timings[job.label] = round(time.monotonic() - started, 3)
+
+    async def refresh(self, jobs: List[RefreshJob]) -> Dict[str, Dict]:
+        """
+        Run every job and merge the results per provider.
+        Jobs still running at the deadline are abandoned and reported in
+        `timed_out`; their provider keeps whatever other jobs returned.
+        """
+        self.timings = {}
+        self.failed = []
+        self.timed_out = []
+
+        results: Dict[str, Dict] = {job.provider: {} for job in jobs}
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix='refresh')
+
+        tasks = {
+            asyncio.ensure_future(self._run_job(job, self._semaphore(semaphores, job.host), executor)): job
+            for job in jobs
+        }
+
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+
+            for task in pending:
+                task.cancel()
+                self.timed_out.append(tasks[task].label)
+                print(f"✗ {tasks[task].label}: missed the {self.deadline:.0f}s deadline")
+
+            # Merge in submission order so the output does not depend on timing
+            for task, job in tasks.items():
+                if task not in done:
+                    continue
+                if task.exception() is not None:
+                    self.failed.append(job.label)
+                    print(f"✗ {job.label}: {task.exception()}")
+                    continue
+                for category, records in (task.result() or {}).items():
+                    results[job.provider].setdefault(category, []).extend(records)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def run(self, jobs: List[RefreshJob]) -> Dict[str, Dict]:
+        """
+        Blocking entry point for synchronous callers
+        """
+        return asyncio.run(self.refresh(jobs))
@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+AWS Bulk Offer File Parsing
+Streams `products` and `terms` out of AWS Price List offer files
+without loading the whole document into memory
+"""
+
+import codecs
+import json
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from downloads import DEFAULT_DOWNLOAD_DIR, DownloadManager
+from specs import InstanceShape, parse_aws_attributes
+
+
+AWS_PRICING_BASE = "https://pricing.us-east-1.amazonaws.com"
+AWS_OFFER_INDEX_PATH = "/offers/v1.0/aws/index.json"
+HOURS_PER_MONTH = 730
+
+# Structural characters we care about while skipping over a value
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_WHITESPACE = ' \t\n\r'
+
+# Maps AWS service codes onto the app's service categories
+SERVICE_CATEGORIES = {
+    'AmazonEC2': 'compute',
+    'AmazonRDS': 'database',
+    'AmazonDynamoDB': 'database',
+    'AmazonElastiCache': 'cache',
+    'AmazonS3': 'storage',
+    'AWSLambda': 'serverless',
+    'AmazonCloudFront': 'networking',
+}
+
+PRICING_URLS = {
+    'AmazonEC2': 'https://aws.amazon.com/ec2/pricing/on-demand/',
+    'AmazonRDS': 'https://aws.amazon.com/rds/pricing/',
+    'AmazonDynamoDB': 'https://aws.amazon.com/dynamodb/pricing/',
+    'AmazonElastiCache': 'https://aws.amazon.com/elasticache/pricing/',
+    'AmazonS3': 'https://aws.amazon.com/s3/pricing/',
+    'AWSLambda': 'https://aws.amazon.com/lambda/pricing/',
+    'AmazonCloudFront': 'https://aws.amazon.com/cloudfront/pricing/',
+}
+
+# Product families that carry an instance price we know how to normalize
+INSTANCE_FAMILIES = {
+    'Compute Instance',
+    'Database Instance',
+    'Cache Instance',
+}
+
+
+class JsonStreamReader:
+    """
+    Minimal pull parser over a JSON document that arrives in chunks.
+    Callers walk objects key by key and decide per value whether to
+    decode it, descend into it or skip it, so only one small value is
+    ever materialized at a time.
+    """
+
+    def __init__(self, chunks: Iterable, read_size: int = 1 << 16):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._eof = False
+        self.read_size = read_size
+        self.buf = ''
+        self.pos = 0
+        self.bytes_read = 0
+
+    def _fill(self) -> bool:
+        """
+        Append the next chunk to the buffer, dropping consumed text
+        """
+        if self._eof:
+            return False
+
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            tail = self._decoder.decode(b'', final=True)
+            if tail:
+                self.buf = self.buf[self.pos:] + tail
+                self.pos = 0
+                return True
+            return False
+
+        if isinstance(chunk, bytes):
+            self.bytes_read += len(chunk)
+            chunk = self._decoder.decode(chunk)
+
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _skip_ws(self) -> str:
+        """
+        Advance past whitespace and return the next character
+        """
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON stream')
+
+    def _expect(self, char: str):
+        found = self._skip_ws()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found '{found}'")
+        self.pos += 1
+
+    def read_value(self):
+        """
+        Decode the next complete value, reading more input as needed
+        """
+        self._skip_ws()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """
+        Skip the next value without decoding it
+        """
+        first = self._skip_ws()
+        if first not in '{[':
+            self.read_value()
+            return
+
+        depth = 0
+        in_string = False
+        while True:
+            buf = self.buf
+            i = self.pos
+            n = len(buf)
+            while i < n:
+                if in_string:
+                    match = _STRING_SPECIAL.search(buf, i)
+                    if match is None:
+                        i = n
+                        break
+                    i = match.start()
+                    if buf[i] == '\\':
+                        if i + 1 >= n:
+                            break  # Escape split across chunks
+                        i += 2
+                        continue
+                    in_string = False
+                    i += 1
+                    continue
+
+                match = _STRUCTURAL.search(buf, i)
+                if match is None:
+                    i = n
+                    break
+                i = match.start()
+                char = buf[i]
+                if char == '"':
+                    in_string = True
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = i + 1
+                        return
+                i += 1
+
+            self.pos = i
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON stream')
+
+    def iter_keys(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the next object.
+        The caller must consume each value (read, skip or descend)
+        before asking for the next key.
+        """
+        self._expect('{')
+        if self._skip_ws() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self._expect(':')
+            yield key
+
+            following = self._skip_ws()
+            self.pos += 1
+            if following == '}':
+                return
+            if following != ',':
+                raise ValueError(f"Expected ',' or '}}' at offset {self.pos - 1}, found '{following}'")
+
+
+def iter_source_chunks(source: Union[str, Iterable], read_size: int = 1 << 16) -> Iterator:
+    """
+    Turn a file path, a file object or an iterable of chunks
+    (e.g. response.iter_content()) into an iterator of chunks
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from iter(lambda: f.read(read_size), b'')
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(read_size), source.read(0))
+    else:
+        yield from source
+
+
+def _format_memory(memory: str) -> str:
+    """
+    '0.5 GiB' -> '0.5GB', matching the specs format used elsewhere
+    """
+    match = re.match(r'([\d.,]+)\s*GiB', memory or '')
+    if not match:
+        return memory or ''
+    return f"{match.group(1).replace(',', '')}GB"
+
+
+def project_product(service_code: str, product: Dict, regions: Optional[set] = None) -> Optional[Dict]:
+    """
+    Reduce an offer-file product to the handful of attributes we keep,
+    or None if it is not a product we price
+    """
+    attributes = product.get('attributes', {})
+    region = attributes.get('regionCode') or attributes.get('location', '')
+
+    if regions and region not in regions:
+        return None
+
+    family = product.get('productFamily', '')
+    if service_code in ('AmazonEC2', 'AmazonRDS', 'AmazonElastiCache'):
+        if family not in INSTANCE_FAMILIES:
+            return None
+        # Skip the license, tenancy and reservation variants of each instance
+        if attributes.get('operatingSystem', 'Linux') != 'Linux':
+            return None
+        if attributes.get('tenancy', 'Shared') != 'Shared':
+            return None
+        if attributes.get('preInstalledSw', 'NA') != 'NA':
+            return None
+        if attributes.get('capacitystatus', 'Used') != 'Used':
+            return None
+        if attributes.get('deploymentOption', 'Single-AZ') != 'Single-AZ':
+            return None
+
+    return {
+        'family': family,
+        'region': region,
+        'instanceType': attributes.get('instanceType', ''),
+        'usagetype': attributes.get('usagetype', ''),
+        'vcpu': attributes.get('vcpu', ''),
+        'memory': attributes.get('memory', ''),
+        'engine': attributes.get('databaseEngine') or attributes.get('cacheEngine', ''),
+        'gpu': attributes.get('gpu', ''),
+        'storage': attributes.get('storage', ''),
+    }
+
+
+def extract_tiers(dimensions: Dict) -> List[List]:
+    """
+    [begin, end, price] usage tiers of a priceDimensions map (end is None
+    for the open-ended tier); empty unless the SKU is priced in ranges
+    """
+    tiers = []
+    for dimension in dimensions.values():
+        begin, end = dimension.get('beginRange'), dimension.get('endRange')
+        if begin is None:
+            continue
+        tiers.append([
+            float(begin),
+            None if end in (None, 'Inf') else float(end),
+            float(dimension.get('pricePerUnit', {}).get('USD', 0) or 0),
+        ])
+    tiers.sort(key=lambda tier: tier[0])
+    return tiers if len(tiers) > 1 else []
+
+
+def extract_on_demand_price(offers: Dict) -> Optional[Dict]:
+    """
+    Pull the first non-zero price dimension out of a terms.OnDemand entry,
+    with the offer's whole tier table when it is priced in usage ranges
+    """
+    for offer in offers.values():
+        dimensions = offer.get('priceDimensions', {})
+        for dimension in dimensions.values():
+            price = float(dimension.get('pricePerUnit', {}).get('USD', 0) or 0)
+            if price > 0:
+                return {
+                    'price': price,
+                    'unit': dimension.get('unit', ''),
+                    'description': dimension.get('description', ''),
+                    'effectiveDate': offer.get('effectiveDate', ''),
+                    'tiers': extract_tiers(dimensions),
+                }
+    return None
+
+
+def normalize_record(service_code: str, sku: str, product: Dict, price: Dict) -> Dict:
+    """
+    Combine a projected product and its On-Demand price into the
+    service record format used by the scrapers
+    """
+    category = SERVICE_CATEGORIES.get(service_code, 'other')
+    instance_type = product['instanceType']
+    name = instance_type or product['usagetype'] or sku
+
+    if service_code == 'AmazonEC2':
+        service_id = f"ec2-{instance_type.replace('.', '-')}"
+    elif service_code == 'AmazonRDS':
+        engine = product['engine'].lower().replace(' ', '-')
+        service_id = f"rds-{engine}-{instance_type.replace('db.', '').replace('.', '-')}"
+        name = f"RDS {product['engine']} ({instance_type})"
+    else:
+        service_id = f"{service_code.lower()}-{sku.lower()}"
+
+    if product['vcpu']:
+        specs = f"{product['vcpu']} vCPU, {_format_memory(product['memory'])} RAM"
+        if product['gpu'] and product['gpu'] not in ('0', 'NA'):
+            specs += f", {product['gpu']} GPU"
+        shape = parse_aws_attributes(product['vcpu'], product['memory'], product['gpu'], product['storage'])
+    else:
+        specs = price['description']
+        shape = InstanceShape()
+
+    # Hourly prices are reported as monthly cost like the rest of the catalog
+    if price['unit'] in ('Hrs', 'Hours'):
+        base_cost = round(price['price'] * HOURS_PER_MONTH, 4)
+    else:
+        base_cost = price['price']
+
+    return {
+        'id': service_id,
+        'name': name,
+        'baseCost': base_cost,
+        'category': category,
+        'specs': specs,
+        'description': product['family'] or price['description'],
+        'source': 'AWS Price List API',
+        'service_code': service_code,
+        'region': product['region'],
+        'sku': sku,
+        'unit': price['unit'],
+        'hourly': price['price'] if price['unit'] in ('Hrs', 'Hours') else None,
+        'pricing_url': PRICING_URLS.get(service_code, 'https://aws.amazon.com/pricing/'),
+        **(shape.as_fields() if shape.vcpu else {}),
+        # Ranged SKUs (S3 storage, Lambda GB-seconds, transfer) keep every tier
+        **({'tiers': price['tiers']} if price.get('tiers') else {}),
+    }
+
+
+class AwsOfferStreamParser:
+    """
+    Incrementally joins `products` with `terms.OnDemand` in an AWS offer file.
+    Only a compact projection of each product is held in memory; On-Demand
+    prices are turned into records as soon as they are read.
+    """
+
+    def __init__(self, service_code: str, regions: Optional[List[str]] = None):
+        self.service_code = service_code
+        self.regions = set(regions) if regions else None
+        self.metadata: Dict = {}
+        self.products: Dict[str, Dict] = {}
+
+    def iter_records(self, source: Union[str, Iterable], read_size: int = 1 << 16) -> Iterator[Dict]:
+        """
+        Yield normalized service records from a path, file object or chunk iterator
+        """
+        reader = JsonStreamReader(iter_source_chunks(source, read_size), read_size)
+        self.products = {}
+        # Prices that arrive before their product (not the AWS layout, but valid JSON)
+        pending: Dict[str, Dict] = {}
+        products_done = False
+
+        for key in reader.iter_keys():
+            if key == 'products':
+                for sku in reader.iter_keys():
+                    projected = project_product(self.service_code, reader.read_value(), self.regions)
+                    if projected is None:
+                        continue
+                    if sku in pending:
+                        yield normalize_record(self.service_code, sku, projected, pending.pop(sku))
+                    else:
+                        self.products[sku] = projected
+                products_done = True
+                pending.clear()
+
+            elif key == 'terms':
+                for term_type in reader.iter_keys():
+                    if term_type != 'OnDemand':
+                        reader.skip_value()
+                        continue
+
+                    for sku in reader.iter_keys():
+                        if products_done and sku not in self.products:
+                            reader.skip_value()
+                            continue
+                        price = extract_on_demand_price(reader.read_value())
+                        if price is None:
+                            continue
+                        product = self.products.pop(sku, None)
+                        if product is not None:
+                            yield normalize_record(self.service_code, sku, product, price)
+                        elif not products_done:
+                            pending[sku] = price
+
+            elif key in ('formatVersion', 'offerCode', 'version', 'publicationDate', 'regionCode'):
+                self.metadata[key] = reader.read_value()
+
+            else:
+                reader.skip_value()
+
+        self.products = {}
+
+
+# Entry starts inside `products` and `terms.OnDemand`. The inner key check
+# (sku == key, offer key == key + ".TERM") keeps them from matching anything else.
+_PRODUCT_ENTRY = re.compile(rb'"(?P<sku>[^"\\]+)"\s*:\s*(?P<value>\{)\s*"sku"\s*:\s*"(?P=sku)"')
+_TERM_ENTRY = re.compile(rb'"(?P<sku>[^"\\]+)"\s*:\s*(?P<value>\{)\s*"(?P=sku)\.[^"\\]+"\s*:\s*\{')
+_SECTION = {
+    'products': re.compile(rb'"products"\s*:\s*\{'),
+    'terms': re.compile(rb'"terms"\s*:\s*\{'),
+    'OnDemand': re.compile(rb'"OnDemand"\s*:\s*\{'),
+    'Reserved': re.compile(rb'"Reserved"\s*:\s*\{'),
+}
+
+
+def _parse_offer_range(args: Tuple) -> List[Tuple[str, Dict]]:
+    """
+    Worker: decode every entry whose key starts inside [start, end).
+    Entries are cut at the start of the next entry (or the section end),
+    so a worker never needs to know where its neighbours' entries stop.
+    """
+    path, kind, service_code, regions, start, end, section_end = args
+    pattern = _PRODUCT_ENTRY if kind == 'products' else _TERM_ENTRY
+    decoder = json.JSONDecoder()
+    results = []
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        matches = pattern.finditer(mm, start, section_end)
+        match = next(matches, None)
+        while match is not None and match.start() < end:
+            following = next(matches, None)
+            stop = following.start() if following else section_end
+            value, _ = decoder.raw_decode(mm[match.start('value'):stop].decode('utf-8'))
+            sku = match.group('sku').decode('utf-8')
+
+            if kind == 'products':
+                parsed = project_product(service_code, value, regions)
+            else:
+                parsed = extract_on_demand_price(value)
+            if parsed is not None:
+                results.append((sku, parsed))
+            match = following
+
+        # The scanner holds a buffer export; release it before the map closes
+        del matches
+
+    return results
+
+
+def _offer_sections(path: str) -> Optional[Dict[str, Tuple[int, int]]]:
+    """
+    Byte spans of `products` and `terms.OnDemand`, or None if the file
+    does not have the usual offer layout
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        products = _SECTION['products'].search(mm)
+        terms = _SECTION['terms'].search(mm, products.end() if products else 0)
+        if not products or not terms:
+            return None
+        on_demand = _SECTION['OnDemand'].search(mm, terms.end())
+        if not on_demand:
+            return None
+        reserved = _SECTION['Reserved'].search(mm, on_demand.end())
+        return {
+            'products': (products.end(), terms.start()),
+            'OnDemand': (on_demand.end(), reserved.start() if reserved else len(mm)),
+        }
+
+
+def read_offer_header(path: str) -> Dict:
+    """
+    Top-level metadata (version, publicationDate, ...) that precedes `products`
+    """
+    reader = JsonStreamReader(iter_source_chunks(path))
+    metadata = {}
+    for key in reader.iter_keys():
+        if key == 'products':
+            break
+        value = reader.read_value()
+        if key in ('formatVersion', 'offerCode', 'version', 'publicationDate', 'regionCode'):
+            metadata[key] = value
+    return metadata
+
+
+def _split(span: Tuple[int, int], parts: int) -> List[Tuple[int, int]]:
+    start, end = span
+    step = max(1, -(-(end - start) // parts))
+    return [(offset, min(offset + step, end)) for offset in range(start, end, step)]
+
+
+def iter_offer_records_parallel(path: str, service_code: str, regions: Optional[List[str]] = None,
+                                workers: Optional[int] = None,
+                                executor: Optional[Executor] = None) -> Iterator[Dict]:
+    """
+    Same records as AwsOfferStreamParser.iter_records for an offer file on
+    disk, with decoding spread over a process pool. `products` and
+    `terms.OnDemand` are cut into byte ranges that workers parse straight
+    from a memory map; results are joined in file order, so the output is
+    identical to the serial parser. Pass `executor` to share a pool.
+    """
+    sections = _offer_sections(path)
+    if sections is None:
+        yield from AwsOfferStreamParser(service_code, regions).iter_records(path)
+        return
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    parts = 4 * (workers or getattr(executor, '_max_workers', None) or os.cpu_count() or 1)
+    region_set = set(regions) if regions else None
+
+    def submit(kind: str):
+        section_end = sections[kind][1]
+        return [
+            executor.submit(_parse_offer_range,
+                            (path, kind, service_code, region_set, start, end, section_end))
+            for start, end in _split(sections[kind], parts)
+        ]
+
+    try:
+        # Both sections are parsed at once; prices are joined once products are in
+        product_futures = submit('products')
+        term_futures = submit('OnDemand')
+
+        products: Dict[str, Dict] = {}
+        for future in product_futures:
+            products.update(future.result())
+
+        for future in term_futures:
+            for sku, price in future.result():
+                product = products.pop(sku, None)
+                if product is not None:
+                    yield normalize_record(service_code, sku, product, price)
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+
+class AwsRegionalOfferFetcher:
+    """
+    Downloads per-region offer files instead of the global one.
+    Follows index.json -> currentRegionIndexUrl -> currentVersionUrl for
+    each requested service and region, and streams the files in parallel.
+    With parse_workers > 1 each file is downloaded to disk first and parsed
+    on a process pool shared by all slices.
+    """
+
+    def __init__(self, session, max_workers: int = 4, timeout: int = 60,
+                 parse_workers: int = 1, download_dir: str = DEFAULT_DOWNLOAD_DIR):
+        self.session = session
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.parse_workers = parse_workers
+        self.download_dir = download_dir
+        self._pool: Optional[Executor] = None
+        self.bytes_downloaded = 0
+        # (service_code, region) -> offer file metadata (version, publicationDate, url)
+        self.versions: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+    def _get_json(self, path: str) -> Dict:
+        response = self.session.get(f"{AWS_PRICING_BASE}{path}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def region_offer_urls(self, service_codes: List[str], regions: Optional[List[str]] = None,
+                          index: Optional[Dict] = None) -> List[Tuple[str, str, str]]:
+        """
+        Resolve (service_code, region, offer path) for every requested slice.
+        `index` may be an already-downloaded offers/v1.0/aws/index.json.
+        """
+        if index is None:
+            index = self._get_json(AWS_OFFER_INDEX_PATH)
+
+        slices = []
+        for service_code in service_codes:
+            offer = index.get('offers', {}).get(service_code)
+            if not offer or not offer.get('currentRegionIndexUrl'):
+                print(f"✗ AWS index has no regional offers for {service_code}")
+                continue
+
+            region_index = self._get_json(offer['currentRegionIndexUrl']).get('regions', {})
+            for region in (regions or sorted(region_index)):
+                entry = region_index.get(region)
+                if entry is None:
+                    print(f"✗ {service_code} is not offered in {region}")
+                    continue
+                slices.append((service_code, region, entry['currentVersionUrl']))
+
+        return slices
+
+    def _fetch_region(self, service_code: str, region: str, path: str) -> List[Dict]:
+        if self._pool is not None:
+            return self._fetch_region_parallel(service_code, region, path)
+
+        parser = AwsOfferStreamParser(service_code)
+        with self.session.get(f"{AWS_PRICING_BASE}{path}", timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            records = list(parser.iter_records(response.iter_content(chunk_size=1 << 16)))
+            downloaded = int(response.headers.get('Content-Length', 0) or 0)
+
+        with self._lock:
+            self.bytes_downloaded += downloaded
+            self.versions[(service_code, region)] = dict(parser.metadata, url=path)
+        return records
+
+    def _fetch_region_parallel(self, service_code: str, region: str, path: str) -> List[Dict]:
+        downloads = DownloadManager(self.session, self.download_dir, max_attempts=3)
+        local_path = downloads.download(f"{AWS_PRICING_BASE}{path}", f"{service_code}-{region}.json")
+        records = list(iter_offer_records_parallel(local_path, service_code, executor=self._pool))
+
+        with self._lock:
+            self.bytes_downloaded += downloads.bytes_transferred
+            self.versions[(service_code, region)] = dict(read_offer_header(local_path), url=path)
+        return records
+
+    def fetch(self, service_codes: List[str], regions: Optional[List[str]] = None,
+              index: Optional[Dict] = None) -> Tuple[Dict, int]:
+        """
+        Fetch and merge the regional offers, grouped by category.
+        Slices are merged in request order so output is deterministic.
+        """
+        return self.fetch_slices(self.region_offer_urls(service_codes, regions, index))
+
+    def fetch_slices(self, slices: List[Tuple[str, str, str]]) -> Tuple[Dict, int]:
+        """
+        Fetch already-resolved (service_code, region, offer path) slices
+        """
+        catalog: Dict[str, List[Dict]] = {}
+        for _, _, records in self.iter_slices(slices):
+            for record in records:
+                catalog.setdefault(record['category'], []).append(record)
+
+        count = sum(len(records) for records in catalog.values())
+        return catalog, count
+
+    def iter_slices(self, slices: List[Tuple[str, str, str]]) -> Iterator[Tuple[str, str, List[Dict]]]:
+        """
+        Yield (service_code, region, records) per slice in request order.
+        At most max_workers slices are in flight or waiting to be consumed.
+        """
+        if self.parse_workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                remaining = iter(slices)
+                pending = deque(
+                    (offer_slice, executor.submit(self._fetch_region, *offer_slice))
+                    for offer_slice in islice(remaining, self.max_workers)
+                )
+                while pending:
+                    (service_code, region, _), future = pending.popleft()
+                    for offer_slice in islice(remaining, 1):
+                        pending.append((offer_slice, executor.submit(self._fetch_region, *offer_slice)))
+                    try:
+                        records = future.result()
+                    except Exception as e:
+                        print(f"✗ Error fetching {service_code} {region}: {e}")
+                        continue
+                    print(f"✓ {service_code} {region}: {len(records)} SKUs")
+                    yield service_code, region, records
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
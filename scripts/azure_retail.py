@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Azure Retail Prices Fetcher
+Walks every `NextPageLink` of the Retail Prices API, fetching pages on
+background threads while the caller parses the ones already received
+"""
+
+import queue
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from specs import InstanceShape, parse_azure_vm_size
+
+
+AZURE_RETAIL_URL = "https://prices.azure.com/api/retail/prices"
+AZURE_API_VERSION = '2023-01-01-preview'
+HOURS_PER_MONTH = 730
+
+# Maps Retail Prices `serviceName` onto the app's service categories
+SERVICE_CATEGORIES = {
+    'Virtual Machines': 'compute',
+    'Storage': 'storage',
+    'Azure Cosmos DB': 'database',
+    'SQL Database': 'database',
+    'Functions': 'serverless',
+    'Content Delivery Network': 'networking',
+    'Load Balancer': 'networking',
+    'Redis Cache': 'cache',
+}
+
+PRICING_URLS = {
+    'Virtual Machines': 'https://azure.microsoft.com/en-us/pricing/details/virtual-machines/',
+    'Storage': 'https://azure.microsoft.com/en-us/pricing/details/storage/blobs/',
+    'Azure Cosmos DB': 'https://azure.microsoft.com/en-us/pricing/details/cosmos-db/',
+    'Functions': 'https://azure.microsoft.com/en-us/pricing/details/functions/',
+}
+
+_DONE = object()
+
+
+def build_filter(service_name: str, region: Optional[str] = None,
+                 price_type: str = 'Consumption', changed_since: Optional[str] = None) -> str:
+    """
+    Build an OData `$filter` for one service, optionally pinned to a region
+    and to prices that took effect after `changed_since`
+    """
+    clauses = [f"serviceName eq '{service_name}'"]
+    if region:
+        clauses.append(f"armRegionName eq '{region}'")
+    if price_type:
+        clauses.append(f"priceType eq '{price_type}'")
+    if changed_since:
+        clauses.append(f"effectiveStartDate gt {changed_since}")
+    return ' and '.join(clauses)
+
+
+def _slug(*parts: str) -> str:
+    text = '-'.join(part for part in parts if part)
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def normalize_item(item: Dict) -> Optional[Dict]:
+    """
+    Convert one Retail Prices item into a service record,
+    or None for variants we do not price (Spot, Windows, zero cost)
+    """
+    if item.get('type') != 'Consumption':
+        return None
+
+    retail_price = item.get('retailPrice', 0) or 0
+    if retail_price <= 0:
+        return None
+
+    service_name = item.get('serviceName', '')
+    sku_name = item.get('skuName', '')
+    product_name = item.get('productName', '')
+    unit = item.get('unitOfMeasure', '')
+    region = item.get('armRegionName', '')
+
+    if service_name == 'Virtual Machines':
+        if 'Spot' in sku_name or 'Low Priority' in sku_name or 'Windows' in product_name:
+            return None
+        arm_sku = item.get('armSkuName', '')
+        service_id = f"azure-{arm_sku.lower().replace('_', '-')}"
+        name = arm_sku
+        # The API has no vCPU/memory attributes; decode them from the size name
+        shape = parse_azure_vm_size(arm_sku)
+        specs = shape.describe() if shape.matchable else sku_name
+    else:
+        service_id = _slug('azure', service_name, sku_name, item.get('meterName', ''))
+        name = f"{product_name} {sku_name}".strip()
+        shape = InstanceShape()
+        specs = sku_name
+
+    # Hourly prices are reported as monthly cost like the rest of the catalog
+    hourly = unit.endswith('Hour')
+    monthly_cost = round(retail_price * HOURS_PER_MONTH, 2) if hourly else retail_price
+
+    return {
+        'id': service_id,
+        'name': name,
+        'baseCost': monthly_cost,
+        'category': SERVICE_CATEGORIES.get(service_name, 'other'),
+        'specs': specs,
+        'description': product_name or service_name,
+        'source': 'Azure Retail Prices API',
+        'service': service_name,
+        'region': region,
+        'unit': unit,
+        'hourly': retail_price if hourly else None,
+        'effectiveStartDate': item.get('effectiveStartDate', ''),
+        'pricing_url': PRICING_URLS.get(service_name, 'https://azure.microsoft.com/en-us/pricing/'),
+        **(shape.as_fields() if shape.vcpu else {}),
+    }
+
+
+class AzureRetailPricesFetcher:
+    """
+    Bounded producer/consumer pipeline over the Retail Prices API.
+    Each filter is a chain of pages linked by `NextPageLink`; up to
+    `max_workers` chains are walked concurrently and at most `queue_size`
+    pages wait in memory for the consumer.
+    """
+
+    def __init__(self, session: requests.Session, max_workers: int = 4,
+                 queue_size: int = 8, timeout: int = 30):
+        self.session = session
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.pages_fetched = 0
+        self.failed_filters: List[str] = []
+        self._lock = threading.Lock()
+
+    def _walk_filter(self, odata_filter: str, pages: queue.Queue, stop: threading.Event):
+        """
+        Producer: follow one filter's page chain into the queue
+        """
+        url = AZURE_RETAIL_URL
+        params = {'$filter': odata_filter, 'api-version': AZURE_API_VERSION}
+
+        while url and not stop.is_set():
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code != 200:
+                    print(f"✗ Azure API returned: {response.status_code} ({odata_filter})")
+                    self._failed(odata_filter)
+                    break
+                # An HTML error page or a truncated body fails like a request
+                data = response.json()
+            except Exception as e:
+                print(f"✗ Azure page request failed ({odata_filter}): {e}")
+                self._failed(odata_filter)
+                break
+
+            with self._lock:
+                self.pages_fetched += 1
+            if not self._put(pages, data.get('Items', []), stop):
+                break
+
+            # NextPageLink already carries the filter and $skip
+            url = data.get('NextPageLink')
+            params = None
+
+    def _failed(self, odata_filter: str):
+        with self._lock:
+            self.failed_filters.append(odata_filter)
+
+    def _put(self, pages: queue.Queue, item, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(self, filters: queue.Queue, pages: queue.Queue, stop: threading.Event):
+        try:
+            while not stop.is_set():
+                try:
+                    odata_filter = filters.get_nowait()
+                except queue.Empty:
+                    break
+                self._walk_filter(odata_filter, pages, stop)
+        finally:
+            # The consumer waits for one _DONE per worker, however it exits
+            self._put(pages, _DONE, stop)
+
+    def iter_items(self, filters: Iterable[str]) -> Iterator[Dict]:
+        """
+        Yield raw Retail Prices items for every page of every filter
+        """
+        pending = queue.Queue()
+        for odata_filter in filters:
+            pending.put(odata_filter)
+
+        workers = min(self.max_workers, pending.qsize()) or 1
+        pages = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self._worker, args=(pending, pages, stop), daemon=True)
+            for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            finished = 0
+            while finished < workers:
+                page = pages.get()
+                if page is _DONE:
+                    finished += 1
+                    continue
+                yield from page
+        finally:
+            # Lets producers exit if the consumer stops early
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def iter_records(self, filters: Iterable[str]) -> Iterator[Dict]:
+        """
+        Yield normalized service records, one per SKU and region
+        """
+        seen = set()
+        for item in self.iter_items(filters):
+            record = normalize_item(item)
+            if record is None:
+                continue
+            key = (record['id'], record['region'])
+            if key in seen:
+                continue
+            seen.add(key)
+            yield record
+
+    def fetch(self, services: List[str], regions: Optional[List[str]] = None) -> Tuple[Dict, int]:
+        """
+        Fetch the full catalog for the given services and regions
+        (None means every region), grouped by category
+        """
+        filters = [
+            build_filter(service, region)
+            for service in services
+            for region in (regions or [None])
+        ]
+
+        catalog: Dict[str, List[Dict]] = {}
+        count = 0
+        for record in self.iter_records(filters):
+            catalog.setdefault(record['category'], []).append(record)
+            count += 1
+        return catalog, count
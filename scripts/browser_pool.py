@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Selenium Browser Pool
+Runs a queue of pages across several WebDriver instances in parallel,
+waiting on page conditions instead of fixed sleeps and restarting each
+driver after a number of pages to keep browser memory bounded. Pages can
+also be read from Chrome's network log instead of the DOM.
+"""
+
+import base64
+import json
+import queue
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+def document_ready(driver) -> bool:
+    return driver.execute_script("return document.readyState") == 'complete'
+
+
+def element_present(css_selector: str) -> Callable:
+    """
+    Condition: the document has loaded and `css_selector` matches an element
+    """
+    present = EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+
+    def condition(driver):
+        return document_ready(driver) and present(driver)
+    return condition
+
+
+# Never needed when prices are read from the network log
+BLOCKED_RESOURCES = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+                     '*.woff', '*.woff2', '*.ttf', '*.css', '*.mp4']
+
+
+class NetworkCapture:
+    """
+    WebDriverWait condition over Chrome's performance log: true once
+    `min_responses` responses whose URL matches `pattern` have finished
+    loading. The driver needs the `goog:loggingPrefs` performance capability.
+    """
+
+    def __init__(self, pattern: str, min_responses: int = 1):
+        self.pattern = re.compile(pattern)
+        self.min_responses = min_responses
+        self.pending: Dict[str, str] = {}              # requestId -> url
+        self.finished: List[Tuple[str, str]] = []      # (requestId, url)
+
+    def __call__(self, driver) -> bool:
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            params = message.get('params', {})
+            if message.get('method') == 'Network.responseReceived':
+                url = params.get('response', {}).get('url', '')
+                if self.pattern.search(url):
+                    self.pending[params['requestId']] = url
+            elif message.get('method') == 'Network.loadingFinished' and params.get('requestId') in self.pending:
+                request_id = params['requestId']
+                self.finished.append((request_id, self.pending.pop(request_id)))
+        return len(self.finished) >= self.min_responses
+
+    def responses(self, driver) -> List[Tuple[str, object]]:
+        """
+        (url, decoded JSON) of every finished response; bodies Chrome has
+        already evicted or that are not JSON are skipped
+        """
+        result = []
+        for request_id, url in self.finished:
+            try:
+                body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                text = base64.b64decode(body['body']).decode('utf-8') if body.get('base64Encoded') else body['body']
+                result.append((url, json.loads(text)))
+            except Exception:
+                continue
+        return result
+
+
+class CalculatorPage(NamedTuple):
+    """
+    One unit of work: load `url`, wait for `ready`, return `extract(driver)`.
+    With `capture` (a URL regex) the page is instead ready once a matching
+    response has loaded, and extract() gets its [(url, json)] rather than
+    the driver; images, fonts and stylesheets are not fetched.
+    """
+    name: str
+    url: str
+    ready: Callable = document_ready
+    extract: Callable = lambda driver: []
+    timeout: float = 20.0
+    capture: Optional[str] = None
+
+
+class BrowserPool:
+    """
+    Up to `size` drivers work through a shared page queue, one thread per
+    driver. A driver is quit and replaced after `pages_per_driver` pages or
+    after a page fails; idle drivers are kept for the next run().
+    """
+
+    def __init__(self, driver_factory: Callable, size: int = 3, pages_per_driver: int = 20):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.pages_per_driver = pages_per_driver
+        self.errors: Dict[str, str] = {}
+        self.drivers_started = 0
+        self.pages_loaded = 0
+        self._idle: List[Tuple[object, int]] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> Tuple[object, int]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        driver = self.driver_factory()
+        with self._lock:
+            self.drivers_started += 1
+        return driver, 0
+
+    def _release(self, driver, served: int):
+        if served >= self.pages_per_driver:
+            self._quit(driver)
+            return
+        with self._lock:
+            self._idle.append((driver, served))
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _wait(self, driver, page: CalculatorPage, condition: Callable):
+        try:
+            WebDriverWait(driver, page.timeout, poll_frequency=0.1).until(condition)
+        except TimeoutException:
+            raise TimeoutException(f"not ready after {page.timeout:g}s ({page.url})")
+
+    def _load(self, driver, page: CalculatorPage) -> List[Dict]:
+        if page.capture is None:
+            driver.get(page.url)
+            self._wait(driver, page, page.ready)
+            return page.extract(driver)
+
+        capture = NetworkCapture(page.capture)
+        driver.get_log('performance')  # drop entries left by earlier pages
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCES})
+        try:
+            driver.get(page.url)
+            self._wait(driver, page, capture)
+            capture(driver)  # responses that finished while waiting
+            return page.extract(capture.responses(driver))
+        finally:
+            try:
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+            except Exception:
+                pass
+
+    def _worker(self, pages: queue.Queue, results: Dict[str, List[Dict]]):
+        driver = None
+        served = 0
+        while True:
+            try:
+                page = pages.get_nowait()
+            except queue.Empty:
+                break
+
+            if driver is None:
+                try:
+                    driver, served = self._acquire()
+                except Exception as e:
+                    # No browser for this thread; the other workers keep draining the queue
+                    print(f"✗ Could not start a browser: {e}")
+                    self.errors[page.name] = f"browser did not start: {e}"
+                    return
+
+            started = time.time()
+            try:
+                results[page.name] = self._load(driver, page)
+                print(f"✓ {page.name}: {len(results[page.name])} services in {time.time() - started:.1f}s")
+                served += 1
+            except Exception as e:
+                print(f"✗ {page.name}: {e}")
+                self.errors[page.name] = str(e)
+                # A failed page may have left the browser in a bad state
+                served = self.pages_per_driver
+            with self._lock:
+                self.pages_loaded += 1
+
+            if served >= self.pages_per_driver:
+                self._quit(driver)
+                driver = None
+
+        if driver is not None:
+            self._release(driver, served)
+
+    def run(self, pages: Iterable[CalculatorPage]) -> Dict[str, List[Dict]]:
+        """
+        Load every page; returns page name -> extracted services. Pages
+        that failed are missing from the result and listed in self.errors.
+        """
+        self.errors = {}
+        pending = queue.Queue()
+        for page in pages:
+            pending.put(page)
+        total = pending.qsize()
+
+        results: Dict[str, List[Dict]] = {}
+        threads = [
+            threading.Thread(target=self._worker, args=(pending, results), daemon=True)
+            for _ in range(min(self.size, total) or 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Only left over when every browser failed to start
+        while not pending.empty():
+            self.errors[pending.get_nowait().name] = 'no browser available'
+        return results
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver, _ in idle:
+            self._quit(driver)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Pricing Calculator JSON
+Normalizes the pricing documents the AWS, Azure and GCP calculators load
+in the browser into the scrapers' service record format
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from gcp_pricelist import iter_vm_records
+from specs import InstanceShape, parse_aws_attributes
+
+
+HOURS_PER_MONTH = 730
+
+# Responses the calculators fetch their prices from
+AWS_CAPTURE = r'/pricing/.*meteredUnitMaps/ec2/'
+AZURE_CAPTURE = r'/api/v\d+/pricing/virtual-machines/calculator'
+GCP_CAPTURE = r'pricelist.*\.json'
+
+_AZURE_OFFER = re.compile(r'^linux-(?P<size>[a-z0-9-]+?)-standard$')
+_LEADING_NUMBER = re.compile(r'^\s*(\d+(?:\.\d+)?)')
+
+
+def _float(value) -> float:
+    try:
+        return float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def normalize_aws_calculator(payload: Dict) -> Iterator[Dict]:
+    """
+    meteredUnitMaps documents: {"regions": {"US East (N. Virginia)": {<key>: {
+    "Instance Type", "vCPU", "Memory", "Storage", "price" (hourly)}}}}
+    """
+    for region, entries in (payload.get('regions') or {}).items():
+        for entry in entries.values():
+            instance_type = entry.get('Instance Type')
+            hourly = _float(entry.get('price'))
+            if not instance_type or hourly <= 0:
+                continue
+            shape = parse_aws_attributes(entry.get('vCPU'), entry.get('Memory'),
+                                         entry.get('GPU', ''), entry.get('Storage', ''))
+            yield {
+                'id': f"ec2-{instance_type.replace('.', '-')}",
+                'name': instance_type,
+                'baseCost': round(hourly * HOURS_PER_MONTH, 4),
+                'category': 'compute',
+                'specs': shape.describe() if shape.matchable else entry.get('Memory', ''),
+                'description': entry.get('Instance Family') or 'Amazon EC2',
+                'source': 'AWS Pricing Calculator',
+                'region': region,
+                'unit': 'Hrs',
+                'hourly': hourly,
+                **(shape.as_fields() if shape.vcpu else {}),
+            }
+
+
+def normalize_azure_calculator(payload: Dict) -> Iterator[Dict]:
+    """
+    Virtual machine calculator document: {"offers": {"linux-d2sv5-standard": {
+    "cores", "ram", "gpu", "prices": {"perhour": {<region>: {"value"}}}}}}.
+    Windows, low-priority and spot offers are skipped.
+    """
+    for key, offer in (payload.get('offers') or {}).items():
+        match = _AZURE_OFFER.match(key)
+        if not match or not isinstance(offer, dict):
+            continue
+        size = match.group('size')
+        gpu = _LEADING_NUMBER.match(str(offer.get('gpu') or ''))
+        shape = InstanceShape(
+            vcpu=_float(offer.get('cores')) or None,
+            ram_gb=_float(offer.get('ram')) or None,
+            gpu=float(gpu.group(1)) if gpu else 0.0,
+            storage_gb=_float(offer.get('diskSize')),
+        )
+        for region, price in ((offer.get('prices') or {}).get('perhour') or {}).items():
+            hourly = _float(price.get('value') if isinstance(price, dict) else price)
+            if hourly <= 0:
+                continue
+            yield {
+                'id': f"azure-standard-{size}",
+                'name': size.upper(),
+                'baseCost': round(hourly * HOURS_PER_MONTH, 2),
+                'category': 'compute',
+                'specs': shape.describe() if shape.matchable else size,
+                'description': offer.get('series') or 'Virtual Machines',
+                'source': 'Azure Pricing Calculator',
+                'region': region,
+                'unit': '1 Hour',
+                'hourly': hourly,
+                **(shape.as_fields() if shape.vcpu else {}),
+            }
+
+
+NORMALIZERS = {
+    'AWS': normalize_aws_calculator,
+    'Azure': normalize_azure_calculator,
+    'GCP': iter_vm_records,
+}
+
+
+def normalize_responses(provider: str, responses: Iterable[Tuple[str, Dict]]) -> List[Dict]:
+    """
+    Records from every captured (url, payload) of one calculator, first
+    occurrence of each (id, region) kept
+    """
+    normalize = NORMALIZERS[provider]
+    seen = set()
+    records = []
+    for _, payload in responses:
+        if not isinstance(payload, dict):
+            continue
+        for record in normalize(payload):
+            key = (record['id'], record['region'])
+            if key not in seen:
+                seen.add(key)
+                records.append(record)
+    return records
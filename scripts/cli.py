@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Cloud Pricing CLI
+One entry point for fetching, comparing, exporting, costing and serving prices. Each
+subcommand imports its own modules, so `compare` never loads requests,
+numpy, pyarrow or selenium unless it needs them.
+
+    python cli.py fetch [--all-regions | --delta] [--hybrid]
+    python cli.py compare [--section storage | --section optimize]
+    python cli.py export cloud_pricing_api.json --format modules
+    python cli.py export --format server
+    python cli.py cost submissions.json
+    python cli.py simulate --samples 1000000 --seed 7
+    python cli.py serve --port 8787
+    python cli.py browser-scrape
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+
+DEFAULT_SNAPSHOT = 'cloud_pricing_api.json'
+DEFAULT_PARTITION_DIR = 'cloud_pricing_api'   # partitions.DEFAULT_PARTITION_DIR
+DEFAULT_DB = 'cloud_pricing.db'
+DEFAULT_REGION_MATRIX = 'region_prices.npz'
+
+SECTIONS = ('report', 'compute', 'serverless', 'storage', 'database', 'regions', 'sample', 'optimize')
+
+
+def cmd_fetch(args) -> int:
+    if args.hybrid:
+        import scrape_cloud_pricing
+        scrape_cloud_pricing.main()
+        return 0
+
+    from http_cache import DEFAULT_CACHE_DIR
+    from scrape_pricing_api import CloudPricingAPI
+
+    api = CloudPricingAPI(
+        aws_regions=None if args.all_regions else args.aws_regions,
+        azure_regions=None if args.all_regions else args.azure_regions,
+        cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+        aws_parse_workers=args.parse_workers,
+    )
+
+    if args.all_regions:
+        matrix = api.fetch_region_matrix()
+        matrix.save(args.region_matrix)
+        print(f"✅ Saved {matrix.nnz} regional prices to {args.region_matrix}")
+        return 0
+
+    if args.delta:
+        from delta_refresh import DeltaRefresher
+        DeltaRefresher(api, args.output, partition_dir=args.partition_dir).refresh()
+        return 0
+
+    pricing = api.fetch_all_pricing_async() if args.concurrent else api.fetch_all_pricing()
+    api.save_to_json(pricing, args.output)
+    api.save_partitioned(pricing, args.partition_dir)
+    api.print_summary(pricing)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    from compare_prices import PriceComparator
+
+    pricing_file = args.pricing_file
+    if pricing_file is None:
+        pricing_file = DEFAULT_PARTITION_DIR if os.path.isdir(DEFAULT_PARTITION_DIR) else DEFAULT_SNAPSHOT
+    # The region matrix (and numpy with it) is only loaded for sections that use it
+    region_matrix = args.region_matrix if args.section in ('report', 'regions') else None
+
+    comparator = PriceComparator(pricing_file, db_path=args.db, region_matrix_file=region_matrix)
+    if not comparator.catalog.count():
+        return 1
+
+    if args.section == 'report':
+        comparator.generate_report()
+    else:
+        {
+            'compute': comparator.compare_compute_instances,
+            'serverless': comparator.compare_serverless,
+            'storage': comparator.compare_storage,
+            'database': comparator.compare_databases,
+            'regions': comparator.compare_regions,
+            'sample': comparator.cost_breakdown_sample_app,
+            'optimize': comparator.optimize_sample_app,
+        }[args.section]()
+    return 0
+
+
+def cmd_export(args) -> int:
+    if args.format == 'server':
+        from server_catalog import DEFAULT_BASE_CATALOG, DEFAULT_SERVER_CATALOG, build_server_catalog
+        data = None
+        if args.snapshot:
+            with open(args.snapshot, 'r') as f:
+                data = json.load(f)
+        output = args.output or DEFAULT_SERVER_CATALOG
+        count = build_server_catalog(data, args.base or DEFAULT_BASE_CATALOG, output)
+        print(f"✓ {count} services with monthly costs saved to {output}")
+        return 0
+
+    args.snapshot = args.snapshot or DEFAULT_SNAPSHOT
+    try:
+        with open(args.snapshot, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"✗ File not found: {args.snapshot}")
+        return 1
+
+    if args.format == 'js':
+        from scrape_pricing_api import CloudPricingAPI
+        CloudPricingAPI().generate_js_file(data, args.output or 'cloudServices_updated.js')
+    elif args.format == 'app':
+        from scrape_cloud_pricing import CloudPricingScraper
+        output = args.output or 'cloudServices_generated.js'
+        with open(output, 'w') as f:
+            f.write(CloudPricingScraper().convert_to_app_format(data))
+        print(f"✓ App format saved to {output}")
+    elif args.format == 'modules':
+        from scrape_pricing_api import CloudPricingAPI
+        CloudPricingAPI().generate_js_modules(data, args.output or 'cloudServices', args.module_format)
+    elif args.format == 'parquet':
+        from columnar import write_catalog
+        output = args.output or 'cloud_pricing_api.parquet'
+        print(f"✓ {write_catalog(data, output)} rows saved to {output}/")
+    elif args.format == 'partitions':
+        from partitions import write_partitions
+        output = args.output or DEFAULT_PARTITION_DIR
+        manifest = write_partitions(data, output)
+        print(f"✓ {len(manifest['partitions'])} partitions saved to {output}/ ({manifest['written']} rewritten)")
+    return 0
+
+
+def cmd_cost(args) -> int:
+    from cost_engine import Architecture, CostEngine
+
+    try:
+        with open(args.architectures, 'r') as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        print(f"✗ File not found: {args.architectures}")
+        return 1
+
+    if args.snapshot:
+        with open(args.snapshot, 'r') as f:
+            engine = CostEngine.from_snapshot(json.load(f))
+    else:
+        engine = CostEngine.from_server_catalog()
+
+    # Stored submissions ({provider, architecture: {nodes}}) or {provider, services, usage}
+    architectures = [
+        Architecture.from_submission(entry) if 'architecture' in entry
+        else Architecture(entry['provider'], entry.get('services', []), entry.get('usage'))
+        for entry in entries
+    ]
+    batch = engine.price(architectures)
+    print(f"✓ Priced {len(architectures)} architectures ({len(batch.row)} services, "
+          f"{len(batch.missing)} not in the catalog)")
+    for provider in sorted({arch.provider for arch in architectures}):
+        totals = batch.totals[[i for i, arch in enumerate(architectures) if arch.provider == provider]]
+        print(f"  {provider:8s} {len(totals):6d}  min ${totals.min():10.2f}  "
+              f"mean ${totals.mean():10.2f}  max ${totals.max():10.2f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([round(float(total), 4) for total in batch.totals], f)
+        print(f"✓ Monthly costs saved to {args.output}")
+    return 0
+
+
+def cmd_simulate(args) -> int:
+    from compare_prices import PriceComparator
+
+    pricing_file = args.pricing_file
+    if pricing_file is None:
+        pricing_file = DEFAULT_PARTITION_DIR if os.path.isdir(DEFAULT_PARTITION_DIR) else DEFAULT_SNAPSHOT
+    if args.samples <= 0:
+        print(f"✗ --samples must be positive, not {args.samples}")
+        return 1
+    comparator = PriceComparator(pricing_file, db_path=args.db)
+    if not comparator.catalog.count():
+        return 1
+    comparator.simulate_sample_app(args.samples, args.seed, args.workers)
+    return 0
+
+
+def cmd_serve(args) -> int:
+    import price_service
+
+    source = args.pricing_file
+    if source is None:
+        source = DEFAULT_PARTITION_DIR if os.path.isdir(DEFAULT_PARTITION_DIR) else DEFAULT_SNAPSHOT
+    if not os.path.exists(source):
+        print(f"✗ File not found: {source}")
+        return 1
+    price_service.main(source, args.host, args.port, args.poll, args.cache_size)
+    return 0
+
+
+def cmd_browser_scrape(args) -> int:
+    # selenium is imported here and nowhere else
+    import scrape_pricing_selenium
+    scrape_pricing_selenium.main(headless=not args.show_browser, workers=args.workers,
+                                 pages_per_driver=args.pages_per_driver)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='cli.py', description='Cloud pricing scraper and comparison tool')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch = commands.add_parser('fetch', help='Fetch prices from the provider APIs')
+    fetch.add_argument('--hybrid', action='store_true', help='Use the hybrid scraper (scrape_cloud_pricing.py)')
+    fetch.add_argument('--all-regions', action='store_true',
+                       help='Fetch every region into a SKU x region price matrix')
+    fetch.add_argument('--delta', action='store_true', help='Only re-fetch slices that changed since the last run')
+    fetch.add_argument('--concurrent', action='store_true', help='Fetch providers concurrently')
+    fetch.add_argument('--aws-regions', nargs='+', default=['us-east-1'])
+    fetch.add_argument('--azure-regions', nargs='+', default=['eastus'])
+    fetch.add_argument('--parse-workers', type=int, default=1, help='Processes used to parse each AWS offer file')
+    fetch.add_argument('--no-cache', action='store_true', help='Disable the revalidating HTTP cache')
+    fetch.add_argument('-o', '--output', default=DEFAULT_SNAPSHOT)
+    fetch.add_argument('--partition-dir', default=DEFAULT_PARTITION_DIR)
+    fetch.add_argument('--region-matrix', default=DEFAULT_REGION_MATRIX)
+    fetch.set_defaults(func=cmd_fetch)
+
+    compare = commands.add_parser('compare', help='Compare prices across providers')
+    compare.add_argument('pricing_file', nargs='?',
+                         help=f"Snapshot or partition directory (default: {DEFAULT_PARTITION_DIR}/ or {DEFAULT_SNAPSHOT})")
+    compare.add_argument('--section', choices=SECTIONS, default='report')
+    compare.add_argument('--db', default=DEFAULT_DB, help='SQLite catalog kept between runs')
+    compare.add_argument('--region-matrix', default=DEFAULT_REGION_MATRIX)
+    compare.set_defaults(func=cmd_compare)
+
+    export = commands.add_parser('export', help='Convert a saved snapshot')
+    export.add_argument('snapshot', nargs='?',
+                        help=f"Snapshot to convert (default: {DEFAULT_SNAPSHOT}; optional for --format server)")
+    export.add_argument('--format', choices=('js', 'modules', 'app', 'parquet', 'partitions', 'server'),
+                        default='js',
+                        help='modules: one JS module per provider/category plus index.js; '
+                             'server: the evaluator catalog with precomputed monthly costs')
+    export.add_argument('--module-format', choices=('esm', 'cjs'), default='esm')
+    export.add_argument('--base', help='Server catalog the snapshot prices are merged into '
+                                       '(default: server/data/cloudServices.js)')
+    export.add_argument('-o', '--output')
+    export.set_defaults(func=cmd_export)
+
+    cost = commands.add_parser('cost', help='Price a batch of architectures like the server evaluator')
+    cost.add_argument('architectures', help='JSON list of submissions or {provider, services, usage} objects')
+    cost.add_argument('--snapshot', help='Price from a scraped snapshot instead of server/data/cloudServices.js')
+    cost.add_argument('-o', '--output', help='Write the monthly cost of each architecture as a JSON list')
+    cost.set_defaults(func=cmd_cost)
+
+    simulate = commands.add_parser('simulate', help='Monte Carlo monthly cost distribution of the sample app')
+    simulate.add_argument('pricing_file', nargs='?',
+                          help=f"Snapshot or partition directory (default: {DEFAULT_PARTITION_DIR}/ or {DEFAULT_SNAPSHOT})")
+    simulate.add_argument('--samples', type=int, default=1_000_000)
+    simulate.add_argument('--seed', type=int, default=0, help='Same seed, same results for any --workers')
+    simulate.add_argument('--workers', type=int, help='Processes (default: one per CPU)')
+    simulate.add_argument('--db', default=DEFAULT_DB, help='SQLite catalog kept between runs')
+    simulate.set_defaults(func=cmd_simulate)
+
+    serve = commands.add_parser('serve', help='HTTP price lookup service that reloads new snapshots')
+    serve.add_argument('pricing_file', nargs='?',
+                       help=f"Snapshot or partition directory (default: {DEFAULT_PARTITION_DIR}/ or {DEFAULT_SNAPSHOT})")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8787)
+    serve.add_argument('--poll', type=float, default=5.0, help='Seconds between checks for a new snapshot')
+    serve.add_argument('--cache-size', type=int, default=1024, help='Responses kept in the LRU cache')
+    serve.set_defaults(func=cmd_serve)
+
+    browser = commands.add_parser('browser-scrape', help='Scrape the pricing calculators with Selenium')
+    browser.add_argument('--workers', type=int, help='Browsers run in parallel (default: one per calculator)')
+    browser.add_argument('--pages-per-driver', type=int, default=20, help='Pages loaded before a browser restarts')
+    browser.add_argument('--show-browser', action='store_true', help='Run Chrome with a window')
+    browser.set_defaults(func=cmd_browser_scrape)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
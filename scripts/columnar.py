@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Columnar Catalog Output
+Flattens the nested provider -> category -> [service] catalog into typed,
+dictionary-encoded Arrow columns and writes one Parquet file per
+provider/category partition, so readers only touch what they scan
+"""
+
+import importlib.util
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional
+
+from specs import service_shape
+
+# Optional and slow to import, so loaded on first Parquet use
+pa = None
+ds = None
+pq = None
+
+
+DEFAULT_PARQUET_DIR = 'cloud_pricing.parquet'
+
+
+def have_pyarrow() -> bool:
+    return pa is not None or importlib.util.find_spec('pyarrow') is not None
+
+
+def _require_pyarrow():
+    global pa, ds, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+    pa, ds, pq = pyarrow, pyarrow.dataset, pyarrow.parquet
+
+
+def catalog_schema() -> 'pa.Schema':
+    """
+    Columns of one partition file. provider and category are not stored
+    in the files: they come back from the provider=/category= directories.
+    """
+    _require_pyarrow()
+    return pa.schema([
+        ('region', pa.dictionary(pa.int16(), pa.string())),
+        ('id', pa.string()),
+        ('name', pa.string()),
+        ('specs', pa.dictionary(pa.int32(), pa.string())),
+        ('vcpu', pa.float32()),
+        ('ram_gb', pa.float32()),
+        ('gpu', pa.float32()),
+        ('storage_gb', pa.float32()),
+        ('price', pa.float64()),
+        ('hourly', pa.float64()),
+        ('unit', pa.dictionary(pa.int16(), pa.string())),
+    ])
+
+
+def iter_partitions(data: Dict):
+    """
+    (provider, category, services) for every non-empty category.
+    Top-level entries that are not provider dicts (metadata, timestamp) are skipped.
+    """
+    for provider, categories in data.items():
+        if provider == 'metadata' or not isinstance(categories, dict):
+            continue
+        for category, services in categories.items():
+            if isinstance(services, list) and services:
+                yield provider, category, services
+
+
+def records_to_table(services: Iterable[Dict]) -> 'pa.Table':
+    """
+    Build one partition's table; string columns are dictionary-encoded
+    """
+    _require_pyarrow()
+    columns: Dict[str, List] = {name: [] for name in catalog_schema().names}
+    for service in services:
+        shape = service_shape(service)
+        columns['region'].append(service.get('region'))
+        columns['id'].append(service.get('id'))
+        columns['name'].append(service.get('name'))
+        columns['specs'].append(service.get('specs'))
+        columns['vcpu'].append(shape.vcpu)
+        columns['ram_gb'].append(shape.ram_gb)
+        columns['gpu'].append(shape.gpu)
+        columns['storage_gb'].append(shape.storage_gb)
+        columns['price'].append(service.get('baseCost'))
+        columns['hourly'].append(service.get('hourly'))
+        columns['unit'].append(service.get('unit'))
+    return pa.Table.from_pydict(columns, schema=catalog_schema())
+
+
+def write_catalog(data: Dict, root: str = DEFAULT_PARQUET_DIR, compression: str = 'zstd') -> int:
+    """
+    Write `data` as root/provider=<p>/category=<c>/part-0.parquet and
+    return the number of rows. The new dataset replaces `root` only once
+    every partition has been written.
+    """
+    _require_pyarrow()
+    tmp_root = f"{root}.tmp"
+    shutil.rmtree(tmp_root, ignore_errors=True)
+
+    rows = 0
+    for provider, category, services in iter_partitions(data):
+        partition = os.path.join(tmp_root, f"provider={provider}", f"category={category}")
+        os.makedirs(partition, exist_ok=True)
+        table = records_to_table(services)
+        pq.write_table(table, os.path.join(partition, 'part-0.parquet'),
+                       compression=compression, use_dictionary=True)
+        rows += table.num_rows
+
+    os.makedirs(tmp_root, exist_ok=True)
+    old_root = f"{root}.old"
+    if os.path.exists(root):
+        shutil.rmtree(old_root, ignore_errors=True)
+        os.replace(root, old_root)
+    os.replace(tmp_root, root)
+    shutil.rmtree(old_root, ignore_errors=True)
+    return rows
+
+
+def open_catalog(root: str = DEFAULT_PARQUET_DIR) -> 'ds.Dataset':
+    """
+    The partitioned dataset, with provider and category as dictionary columns
+    """
+    _require_pyarrow()
+    return ds.dataset(root, format='parquet',
+                      partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+
+
+def read_catalog(root: str = DEFAULT_PARQUET_DIR, columns: Optional[List[str]] = None,
+                 providers: Optional[List[str]] = None,
+                 categories: Optional[List[str]] = None) -> 'pa.Table':
+    """
+    Read only the requested columns; provider/category filters prune
+    whole partitions before any file is opened
+    """
+    dataset = open_catalog(root)
+    if columns is not None:
+        columns = ['provider', 'category'] + [c for c in columns if c not in ('provider', 'category')]
+    expression = None
+    if providers:
+        expression = ds.field('provider').isin(providers)
+    if categories:
+        category_filter = ds.field('category').isin(categories)
+        expression = category_filter if expression is None else expression & category_filter
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def table_to_catalog(table: 'pa.Table') -> Dict:
+    """
+    Back to the nested provider -> category -> [service] shape, with
+    `price` under the app's `baseCost` name
+    """
+    catalog: Dict[str, Dict[str, List[Dict]]] = {}
+    for row in table.to_pylist():
+        provider = str(row.pop('provider'))
+        category = str(row.pop('category'))
+        if 'price' in row:
+            row['baseCost'] = row.pop('price')
+        row['category'] = category
+        catalog.setdefault(provider, {}).setdefault(category, []).append(row)
+    return catalog
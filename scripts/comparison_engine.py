@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Vectorized Price Comparison
+Holds the catalog as NumPy arrays and computes, for every spec bucket of
+a category at once, each provider's cheapest offer, the cheapest provider,
+the savings against the most expensive one and a normalized unit price
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from columnar import iter_partitions
+from specs import service_shape
+
+
+HOURS_PER_MONTH = 730
+
+# Bucket key columns and unit-price normalization per category
+BUCKET_COLUMNS = {
+    'compute': ('vcpu', 'ram_gb', 'gpu'),
+    'cache': ('vcpu', 'ram_gb'),
+}
+UNIT_PRICES = {
+    'compute': 'vcpu_hour',
+    'cache': 'vcpu_hour',
+    'storage': 'gb_month',
+}
+
+# Offers of different sizes are only comparable per GB
+RANK_BY_UNIT_PRICE = {'storage'}
+
+
+class CatalogArrays:
+    """
+    Column arrays over every service of the catalog. Strings are kept as
+    integer codes into the `providers`/`categories`/`regions` lists.
+    """
+
+    NUMERIC = ('vcpu', 'ram_gb', 'gpu', 'storage_gb', 'price')
+
+    def __init__(self, rows: List[Tuple]):
+        """
+        rows: (provider, category, region, id, name, vcpu, ram_gb, gpu, storage_gb, price)
+        """
+        columns = list(zip(*rows)) if rows else [()] * 10
+        self.providers, self.provider = self._encode(columns[0])
+        self.categories, self.category = self._encode(columns[1])
+        self.regions, self.region = self._encode(columns[2])
+        self.ids = np.array(columns[3], dtype=object)
+        self.names = np.array(columns[4], dtype=object)
+        for offset, name in enumerate(self.NUMERIC, start=5):
+            # None (unknown) becomes NaN
+            setattr(self, name, np.array(columns[offset], dtype=np.float64))
+
+    @staticmethod
+    def _encode(values) -> Tuple[List[str], np.ndarray]:
+        labels = sorted({value or '' for value in values})
+        lookup = {label: code for code, label in enumerate(labels)}
+        return labels, np.fromiter((lookup[value or ''] for value in values), dtype=np.int32, count=len(values))
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @classmethod
+    def from_catalog(cls, catalog) -> 'CatalogArrays':
+        """
+        From a PriceCatalog (one SQL scan)
+        """
+        return cls(catalog.query(
+            "SELECT provider, category, region, id, name, vcpu, ram_gb, gpu, storage_gb, price FROM services"
+        ))
+
+    @classmethod
+    def from_data(cls, data: Dict) -> 'CatalogArrays':
+        """
+        From the nested provider -> category -> [service] snapshot
+        """
+        rows = []
+        for provider, category, services in iter_partitions(data):
+            for service in services:
+                shape = service_shape(service)
+                rows.append((provider, category, service.get('region'), service.get('id'),
+                             service.get('name'), *shape, service.get('baseCost')))
+        return cls(rows)
+
+
+class ComparisonMatrix(NamedTuple):
+    """
+    One row per spec bucket, one column per provider. Missing offers are
+    NaN in the price matrices and -1 in the index/provider arrays.
+    """
+    category: str
+    ranked_by: str                 # 'price' or 'unit_price'
+    bucket_columns: Tuple[str, ...]
+    buckets: np.ndarray            # (buckets, len(bucket_columns)) bucket keys
+    providers: List[str]
+    min_price: np.ndarray          # (buckets, providers) cheapest monthly price
+    best_row: np.ndarray           # (buckets, providers) catalog row of that offer
+    unit_price: np.ndarray         # (buckets, providers) $/vCPU-hour, $/GB-month or NaN
+    cheapest_provider: np.ndarray  # (buckets,) column index into providers
+    savings: np.ndarray            # (buckets,) most expensive minus cheapest provider, in ranked_by units
+    savings_pct: np.ndarray        # (buckets,) savings as % of the most expensive
+    names: np.ndarray              # (buckets, providers) service names, None if missing
+
+    def rows(self) -> List[Dict]:
+        """
+        Plain dicts (one per bucket) for reports and JSON
+        """
+        result = []
+        for b in range(len(self.buckets)):
+            cheapest = int(self.cheapest_provider[b])
+            result.append({
+                'bucket': dict(zip(self.bucket_columns, self.buckets[b].tolist())),
+                'prices': {
+                    provider: {'name': self.names[b, p], 'price': float(self.min_price[b, p]),
+                               'unit_price': None if np.isnan(self.unit_price[b, p]) else float(self.unit_price[b, p])}
+                    for p, provider in enumerate(self.providers) if not np.isnan(self.min_price[b, p])
+                },
+                'cheapest': self.providers[cheapest] if cheapest >= 0 else None,
+                'ranked_by': self.ranked_by,
+                'savings': float(self.savings[b]),
+                'savings_pct': float(self.savings_pct[b]),
+            })
+        return result
+
+
+class ComparisonEngine:
+    """
+    Compares whole categories in one pass: rows are grouped by
+    (bucket, provider) with a single lexsort, so cost is O(n log n)
+    regardless of how many buckets or providers there are
+    """
+
+    def __init__(self, arrays: CatalogArrays):
+        self.arrays = arrays
+
+    def _mask(self, category: str, region: Optional[str], providers: Optional[List[str]]) -> np.ndarray:
+        a = self.arrays
+        if category not in a.categories:
+            return np.zeros(len(a), dtype=bool)
+        mask = (a.category == a.categories.index(category)) & ~np.isnan(a.price)
+        if region is not None:
+            mask &= a.region == (a.regions.index(region) if region in a.regions else -1)
+        if providers is not None:
+            mask &= np.isin(a.provider, [a.providers.index(p) for p in providers if p in a.providers])
+        return mask
+
+    def compare(self, category: str = 'compute', region: Optional[str] = None,
+                providers: Optional[List[str]] = None,
+                bucket_columns: Optional[Tuple[str, ...]] = None) -> ComparisonMatrix:
+        """
+        Cross-provider matrix for one category. Compute buckets are exact
+        (vCPU, memory, GPU) shapes; categories without a bucket definition
+        are compared as a single bucket.
+        """
+        a = self.arrays
+        bucket_columns = tuple(bucket_columns if bucket_columns is not None else BUCKET_COLUMNS.get(category, ()))
+        mask = self._mask(category, region, providers)
+        for column in bucket_columns:
+            mask &= ~np.isnan(getattr(a, column))
+        rank_by_unit = category in RANK_BY_UNIT_PRICE
+        if rank_by_unit:
+            mask &= a.storage_gb > 0
+        rows = np.flatnonzero(mask)
+
+        if bucket_columns:
+            keys = np.column_stack([getattr(a, column)[rows] for column in bucket_columns])
+            buckets, bucket_of = np.unique(keys, axis=0, return_inverse=True)
+            bucket_of = bucket_of.reshape(-1)
+        else:
+            buckets = np.zeros((1 if len(rows) else 0, 0))
+            bucket_of = np.zeros(len(rows), dtype=np.int64)
+
+        # Provider columns are the providers present in this comparison
+        provider_codes, provider_of = np.unique(a.provider[rows], return_inverse=True)
+        provider_of = provider_of.reshape(-1)
+        n_buckets, n_providers = len(buckets), len(provider_codes)
+
+        # Cheapest row per (bucket, provider): sort by group then price, keep group heads
+        price = a.price[rows]
+        score = price / a.storage_gb[rows] if rank_by_unit else price
+        group = bucket_of * n_providers + provider_of
+        order = np.lexsort((score, group))
+        heads = order[np.r_[True, group[order][1:] != group[order][:-1]]] if len(order) else order
+
+        min_price = np.full((n_buckets, n_providers), np.nan)
+        best_row = np.full((n_buckets, n_providers), -1, dtype=np.int64)
+        min_price[bucket_of[heads], provider_of[heads]] = price[heads]
+        best_row[bucket_of[heads], provider_of[heads]] = rows[heads]
+
+        unit_price = self._unit_prices(category, best_row, min_price)
+
+        ranked = unit_price if rank_by_unit else min_price
+        offered = ~np.isnan(ranked)
+        any_offer = offered.any(axis=1)
+        filled_low = np.where(offered, ranked, np.inf)
+        filled_high = np.where(offered, ranked, -np.inf)
+        cheapest = np.where(any_offer, filled_low.argmin(axis=1), -1)
+        low = np.where(any_offer, filled_low.min(axis=1), np.nan)
+        high = np.where(any_offer, filled_high.max(axis=1), np.nan)
+        savings = np.where(any_offer, high - low, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            savings_pct = np.where(high > 0, 100 * savings / high, 0.0)
+
+        names = np.where(best_row >= 0, a.names[np.maximum(best_row, 0)], None)
+
+        return ComparisonMatrix(
+            category=category,
+            ranked_by='unit_price' if rank_by_unit else 'price',
+            bucket_columns=bucket_columns,
+            buckets=buckets,
+            providers=[a.providers[code] for code in provider_codes],
+            min_price=min_price,
+            best_row=best_row,
+            unit_price=unit_price,
+            cheapest_provider=cheapest,
+            savings=savings,
+            savings_pct=savings_pct,
+            names=names,
+        )
+
+    def _unit_prices(self, category: str, best_row: np.ndarray, min_price: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        rows = np.maximum(best_row, 0)
+        unit = UNIT_PRICES.get(category)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if unit == 'vcpu_hour':
+                result = min_price / HOURS_PER_MONTH / a.vcpu[rows]
+            elif unit == 'gb_month':
+                result = min_price / a.storage_gb[rows]
+            else:
+                return np.full(min_price.shape, np.nan)
+        result[(best_row < 0) | ~np.isfinite(result)] = np.nan
+        return result
+
+    def compare_all(self, region: Optional[str] = None,
+                    providers: Optional[List[str]] = None) -> Dict[str, ComparisonMatrix]:
+        """
+        One matrix per category in the catalog
+        """
+        return {
+            category: self.compare(category, region, providers)
+            for category in self.arrays.categories if category
+        }
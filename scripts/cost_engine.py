@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Batched Architecture Costing
+Prices many architectures at once with the rules of the server's
+ArchitectureEvaluator.calculateCost: every (architecture, service) pair is
+resolved with one sorted-key search over the catalog and costed as
+unit cost * monthly usage, with per-architecture usage overrides
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from server_catalog import DEFAULT_BASE_CATALOG, from_snapshot, pricing_model, read_js_catalog
+
+
+_SEPARATOR = '\x1f'
+
+
+class Architecture(NamedTuple):
+    """
+    Service ids deployed on one provider; `usage` overrides the monthly
+    usage assumed per unit ('hours', 'GB', 'requests', 'messages',
+    'images', 'month') for this architecture only
+    """
+    provider: str
+    services: Sequence[str]
+    usage: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_submission(cls, submission: Dict, usage: Optional[Dict[str, float]] = None) -> 'Architecture':
+        """
+        From a stored submission: {provider, architecture: {nodes: [{id}]}}
+        """
+        nodes = (submission.get('architecture') or {}).get('nodes') or []
+        return cls(submission.get('provider', ''), [service_id_from_node(node) for node in nodes], usage)
+
+
+def service_id_from_node(node: Dict) -> str:
+    """
+    Service ID from a node ID: [provider]-[service-id]-[timestamp]
+    (the evaluator's serviceIdFromNode)
+    """
+    parts = (node.get('id') or '').split('-')
+    return '-'.join(parts[1:-1]) if len(parts) >= 3 else ''
+
+
+class CostBatch(NamedTuple):
+    """
+    Costs of a batch of architectures. Item arrays have one entry per
+    (architecture, service) pair in input order; services the catalog
+    does not have cost 0, as in the evaluator.
+    """
+    totals: np.ndarray         # (architectures,) monthly cost
+    architecture: np.ndarray   # (items,) index into the batch
+    row: np.ndarray            # (items,) catalog row, -1 if not found
+    usage: np.ndarray          # (items,) monthly usage applied
+    cost: np.ndarray           # (items,) monthly cost
+
+    @property
+    def missing(self) -> np.ndarray:
+        """
+        Item positions whose service id is not in the catalog
+        """
+        return np.flatnonzero(self.row < 0)
+
+
+class CostEngine:
+    """
+    Catalog as parallel arrays sorted by "provider<US>id" key, so a batch
+    of lookups is a single np.searchsorted
+    """
+
+    def __init__(self, catalog: Dict[str, Dict[str, List[Dict]]]):
+        """
+        catalog: server layout, provider -> group -> [{id, name, cost,
+        category, specs}]. The first service listed under an id wins.
+        """
+        keys, ids, names, costs, usages, units = [], [], [], [], [], []
+        for provider, groups in catalog.items():
+            for services in groups.values():
+                for service in services:
+                    model = pricing_model(service)
+                    keys.append(f"{provider}{_SEPARATOR}{service['id']}")
+                    ids.append(service['id'])
+                    names.append(service.get('name'))
+                    costs.append(service.get('cost') or 0.0)
+                    usages.append(model.usage)
+                    units.append(model.unit)
+
+        self.units = sorted(set(units))
+        unit_codes = {unit: code for code, unit in enumerate(self.units)}
+        keys = np.array(keys, dtype=str)
+        # np.unique keeps the first occurrence index of each key
+        self.keys, first = np.unique(keys, return_index=True)
+        self.ids = np.array(ids, dtype=object)[first]
+        self.names = np.array(names, dtype=object)[first]
+        self.cost = np.array(costs, dtype=np.float64)[first]
+        self.default_usage = np.array(usages, dtype=np.float64)[first]
+        self.unit = np.array([unit_codes[unit] for unit in units], dtype=np.int64)[first]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_server_catalog(cls, path: str = DEFAULT_BASE_CATALOG) -> 'CostEngine':
+        """
+        From server/data/cloudServices.js (needs node)
+        """
+        return cls(read_js_catalog(path))
+
+    @classmethod
+    def from_snapshot(cls, data: Dict) -> 'CostEngine':
+        """
+        From a scraper snapshot (monthly baseCost records)
+        """
+        return cls(from_snapshot(data))
+
+    def lookup(self, providers: Sequence[str], service_ids: Sequence[str]) -> np.ndarray:
+        """
+        Catalog rows for parallel provider/id sequences, -1 where missing
+        """
+        if not len(service_ids):
+            return np.zeros(0, dtype=np.int64)
+        query = np.char.add(np.char.add(np.asarray(providers, dtype=str), _SEPARATOR),
+                            np.asarray(service_ids, dtype=str))
+        if not len(self.keys):
+            return np.full(len(query), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.keys, query), len(self.keys) - 1)
+        return np.where(self.keys[pos] == query, pos, -1).astype(np.int64)
+
+    def price(self, architectures: Iterable[Architecture]) -> CostBatch:
+        """
+        Monthly cost of every architecture in one vectorized pass
+        """
+        architectures = list(architectures)
+        n = len(architectures)
+        counts = np.fromiter((len(arch.services) for arch in architectures), dtype=np.int64, count=n)
+        arch_of = np.repeat(np.arange(n), counts)
+        providers = np.repeat(np.array([arch.provider for arch in architectures], dtype=str), counts)
+        service_ids = [service_id for arch in architectures for service_id in arch.services]
+        rows = self.lookup(providers, service_ids)
+
+        found = rows >= 0
+        safe = np.maximum(rows, 0)
+        usage = np.where(found, self.default_usage[safe] if len(self) else 0.0, 0.0)
+        overrides = self._usage_overrides(architectures)
+        if overrides is not None and len(rows):
+            override = overrides[arch_of, self.unit[safe]]
+            usage = np.where(found & ~np.isnan(override), override, usage)
+
+        cost = np.where(found, self.cost[safe] * usage if len(self) else 0.0, 0.0)
+        totals = np.bincount(arch_of, weights=cost, minlength=n)
+        return CostBatch(totals=totals, architecture=arch_of, row=rows, usage=usage, cost=cost)
+
+    def _usage_overrides(self, architectures: List[Architecture]) -> Optional[np.ndarray]:
+        """
+        (architectures, units) usage matrix, NaN where the default applies
+        """
+        if not any(arch.usage for arch in architectures):
+            return None
+        codes = {unit: code for code, unit in enumerate(self.units)}
+        overrides = np.full((len(architectures), max(len(self.units), 1)), np.nan)
+        for i, arch in enumerate(architectures):
+            for unit, value in (arch.usage or {}).items():
+                if unit in codes:
+                    overrides[i, codes[unit]] = value
+        return overrides
+
+    def breakdown(self, batch: CostBatch, index: int) -> List[Tuple[str, Optional[str], float]]:
+        """
+        (service id, name, monthly cost) per service of one architecture
+        """
+        items = np.flatnonzero(batch.architecture == index)
+        return [
+            (self.ids[batch.row[i]] if batch.row[i] >= 0 else None,
+             self.names[batch.row[i]] if batch.row[i] >= 0 else None,
+             float(batch.cost[i]))
+            for i in items
+        ]
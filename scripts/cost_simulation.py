@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Cost Simulation
+Monthly cost as a distribution: usage (requests, GB stored, egress, ...)
+is drawn from per-variable distributions, every provider's stack is
+priced on the same draws with its tier tables, and percentiles are
+reported per provider. Samples are generated in fixed-size chunks with
+seeds spawned from one SeedSequence, so a run is reproducible whatever
+the number of worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from tiered_pricing import TIERED_MODELS, TieredPrice
+
+
+DEFAULT_PERCENTILES = (5, 50, 95, 99)
+CHUNK_SIZE = 131_072
+
+
+class Distribution(NamedTuple):
+    """
+    Monthly usage of one variable; draws below zero are clipped to zero
+    """
+    kind: str                     # fixed, uniform, normal, lognormal, triangular
+    params: Tuple[float, ...]
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.kind == 'fixed':
+            return np.full(size, float(self.params[0]))
+        if self.kind == 'uniform':
+            values = rng.uniform(*self.params, size)
+        elif self.kind == 'normal':
+            values = rng.normal(*self.params, size)
+        elif self.kind == 'lognormal':
+            median, sigma = self.params
+            values = median * np.exp(sigma * rng.standard_normal(size))
+        elif self.kind == 'triangular':
+            values = rng.triangular(*self.params, size)
+        else:
+            raise ValueError(f"Unknown distribution {self.kind!r}")
+        return np.maximum(values, 0.0)
+
+
+def fixed(value: float) -> Distribution:
+    return Distribution('fixed', (value,))
+
+
+def uniform(low: float, high: float) -> Distribution:
+    return Distribution('uniform', (low, high))
+
+
+def normal(mean: float, sd: float) -> Distribution:
+    return Distribution('normal', (mean, sd))
+
+
+def lognormal(median: float, sigma: float) -> Distribution:
+    """
+    Right-skewed usage: `median` with a spread of sigma in log space
+    (sigma=0.5 puts the 95th percentile at about 2.3x the median)
+    """
+    return Distribution('lognormal', (median, sigma))
+
+
+def triangular(low: float, mode: float, high: float) -> Distribution:
+    return Distribution('triangular', (low, mode, high))
+
+
+# A model dimension fed by a usage variable, optionally scaled
+# ('requests', or ('requests', 0.015) for GB-seconds per request)
+UsageRef = Union[str, Tuple[str, float]]
+
+
+class Component(NamedTuple):
+    """
+    Part of a provider's stack: a fixed monthly price, a tiered model
+    (TIERED_MODELS id or TieredPrice) priced on usage variables, or both
+    """
+    name: str
+    model: Optional[Union[str, TieredPrice]] = None
+    usage: Optional[Dict[str, UsageRef]] = None
+    monthly: float = 0.0
+
+
+def _resolve(model: Optional[Union[str, TieredPrice]]) -> Optional[TieredPrice]:
+    if model is None or isinstance(model, TieredPrice):
+        return model
+    if model not in TIERED_MODELS:
+        raise ValueError(f"No tiered model {model!r}")
+    return TIERED_MODELS[model]
+
+
+def _stack_cost(components: Sequence[Component], draws: Dict[str, np.ndarray], size: int) -> np.ndarray:
+    total = np.zeros(size)
+    for component in components:
+        total += component.monthly
+        model = _resolve(component.model)
+        if model is None:
+            continue
+        usage = {}
+        for dimension, ref in (component.usage or {}).items():
+            variable, factor = (ref, 1.0) if isinstance(ref, str) else ref
+            usage[dimension] = draws[variable] * factor
+        total += model.cost(**usage)
+    return total
+
+
+def _simulate_chunk(args: Tuple) -> np.ndarray:
+    """
+    (providers, size) costs of one chunk (runs in a worker process)
+    """
+    usage, stacks, seed, size = args
+    rng = np.random.default_rng(seed)
+    # Variables are drawn in sorted order so a chunk only depends on its seed
+    draws = {name: usage[name].sample(rng, size) for name in sorted(usage)}
+    return np.stack([_stack_cost(components, draws, size) for components in stacks.values()])
+
+
+class SimulationResult(NamedTuple):
+    providers: List[str]
+    costs: np.ndarray      # (providers, samples) monthly cost
+    seed: int
+
+    def percentiles(self, q: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[float, float]]:
+        values = np.percentile(self.costs, q, axis=1)
+        return {provider: {p: float(values[i, j]) for i, p in enumerate(q)}
+                for j, provider in enumerate(self.providers)}
+
+    def mean(self) -> Dict[str, float]:
+        return dict(zip(self.providers, self.costs.mean(axis=1).tolist()))
+
+    def cheapest_share(self) -> Dict[str, float]:
+        """
+        Fraction of samples in which each provider is the cheapest
+        """
+        if not len(self.providers):
+            return {}
+        counts = np.bincount(self.costs.argmin(axis=0), minlength=len(self.providers))
+        return dict(zip(self.providers, (counts / self.costs.shape[1]).tolist()))
+
+
+def simulate(usage: Dict[str, Distribution], stacks: Dict[str, List[Component]],
+             samples: int = 1_000_000, seed: int = 0, workers: Optional[int] = None,
+             chunk_size: int = CHUNK_SIZE) -> SimulationResult:
+    """
+    Draw `samples` months of usage and price every provider's stack on
+    each. Chunks are spread over `workers` processes (default: one per
+    CPU; 1 runs in-process) and the same seed gives the same costs for
+    any worker count.
+    """
+    if samples <= 0:
+        raise ValueError(f"samples must be positive, not {samples}")
+    if not stacks:
+        raise ValueError("no provider stacks to simulate")
+    for components in stacks.values():
+        for component in components:
+            _resolve(component.model)
+            for ref in (component.usage or {}).values():
+                variable = ref if isinstance(ref, str) else ref[0]
+                if variable not in usage:
+                    raise ValueError(f"{component.name}: no usage distribution for {variable!r}")
+
+    sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(usage, stacks, chunk_seed, size) for chunk_seed, size in zip(seeds, sizes)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        chunks = [_simulate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            chunks = list(executor.map(_simulate_chunk, tasks))
+
+    costs = np.concatenate(chunks, axis=1)
+    return SimulationResult(providers=list(stacks), costs=costs, seed=seed)
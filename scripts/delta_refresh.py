@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Incremental Pricing Refresh
+Records the offer version of every source we price and, on the next run,
+re-fetches only the slices whose version moved, patching them into the
+stored catalog instead of rebuilding it
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from aws_offers import AwsRegionalOfferFetcher, SERVICE_CATEGORIES as AWS_CATEGORIES
+from azure_retail import AzureRetailPricesFetcher, build_filter
+from gcp_pricelist import GCP_PRICELIST_URL
+
+
+DEFAULT_STATE_FILE = 'refresh_state.json'
+
+
+def _slice_key(service: str, region: Optional[str]) -> str:
+    return f"{service}/{region or '*'}"
+
+
+class DeltaRefresher:
+    """
+    Keeps a small state file next to the saved catalog:
+
+        aws:   {"AmazonEC2/us-east-1": {"url", "version", "publicationDate"}}
+        azure: {"Virtual Machines/eastus": "<max effectiveStartDate seen>"}
+        gcp:   {"version", "updated"}
+
+    AWS slices are compared through the region index's currentVersionUrl,
+    Azure slices are queried for prices effective after their watermark,
+    and GCP is re-parsed only when the pricelist version changes.
+    With partition_dir the partitioned copy is updated as well; only the
+    provider/category files whose content changed are rewritten.
+    """
+
+    def __init__(self, api, catalog_file: str = 'cloud_pricing_api.json',
+                 state_file: str = DEFAULT_STATE_FILE, partition_dir: Optional[str] = None):
+        self.api = api
+        self.catalog_file = catalog_file
+        self.state_file = state_file
+        self.partition_dir = partition_dir
+        self.changes: Dict[str, List[str]] = {'AWS': [], 'Azure': [], 'GCP': []}
+
+    def _load(self) -> Tuple[Optional[Dict], Dict]:
+        try:
+            with open(self.catalog_file, 'r') as f:
+                catalog = json.load(f)
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None, {}
+        return catalog, state
+
+    def _save_catalog(self, catalog: Dict):
+        self.api.save_to_json(catalog, self.catalog_file)
+        if self.partition_dir:
+            self.api.save_partitioned(catalog, self.partition_dir)
+
+    def _save_state(self, state: Dict):
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def _gcp_version(self) -> Dict:
+        """
+        Version stamp of the GCP pricelist (cheap with the HTTP cache: a 304)
+        """
+        try:
+            response = self.api.session.get(GCP_PRICELIST_URL, timeout=30)
+            if response.status_code == 200:
+                data = response.json()
+                return {'version': data.get('version'), 'updated': data.get('updated')}
+        except Exception as e:
+            print(f"✗ Could not read GCP pricelist version: {e}")
+        return {}
+
+    def _azure_watermarks(self, azure: Dict) -> Dict[str, str]:
+        """
+        Highest effectiveStartDate per configured service/region slice
+        """
+        watermarks: Dict[str, str] = {}
+        for records in azure.values():
+            for record in records:
+                if not record.get('effectiveStartDate') or not record.get('service'):
+                    continue
+                region = record['region'] if self.api.azure_regions else None
+                key = _slice_key(record['service'], region)
+                watermarks[key] = max(watermarks.get(key, ''), record['effectiveStartDate'])
+        return watermarks
+
+    def _snapshot_state(self, pricing: Dict) -> Dict:
+        return {
+            'aws': {
+                _slice_key(code, region): meta
+                for (code, region), meta in self.api.aws_versions.items()
+            },
+            'azure': self._azure_watermarks(pricing.get('Azure', {})),
+            'gcp': self._gcp_version(),
+        }
+
+    def full_refresh(self) -> Dict:
+        """
+        Rebuild everything and record versions for the next delta run
+        """
+        pricing = self.api.fetch_all_pricing()
+        self._save_catalog(pricing)
+        self._save_state(self._snapshot_state(pricing))
+        return pricing
+
+    def _patch_aws(self, aws: Dict, state: Dict):
+        fetcher = AwsRegionalOfferFetcher(self.api.session, parse_workers=self.api.aws_parse_workers)
+        slices = fetcher.region_offer_urls(self.api.aws_services, self.api.aws_regions)
+
+        changed = [
+            offer_slice for offer_slice in slices
+            if state.get(_slice_key(offer_slice[0], offer_slice[1]), {}).get('url') != offer_slice[2]
+        ]
+        if not changed:
+            print("✓ AWS: all regional offers unchanged")
+            return
+
+        fresh, count = fetcher.fetch_slices(changed)
+        replaced = set(fetcher.versions)
+
+        # Drop every record of a re-fetched slice, then add its new records
+        for category in {AWS_CATEGORIES.get(code, 'other') for code, _ in replaced}:
+            aws[category] = [
+                record for record in aws.get(category, [])
+                if (record.get('service_code'), record.get('region')) not in replaced
+            ]
+        for category, records in fresh.items():
+            aws.setdefault(category, []).extend(records)
+
+        for (code, region), meta in fetcher.versions.items():
+            state[_slice_key(code, region)] = meta
+            self.changes['AWS'].append(f"{code} {region} -> {meta.get('version')}")
+        print(f"✓ AWS: {len(replaced)} changed slices, {count} SKUs re-parsed")
+
+    def _patch_azure(self, azure: Dict, state: Dict):
+        fetcher = AzureRetailPricesFetcher(self.api.session)
+        index = {
+            (record['id'], record.get('region')): (category, position)
+            for category, category_records in azure.items()
+            for position, record in enumerate(category_records)
+        }
+
+        for service in self.api.azure_services:
+            for region in (self.api.azure_regions or [None]):
+                key = _slice_key(service, region)
+                watermark = state.get(key)
+                odata_filter = build_filter(service, region, changed_since=watermark)
+
+                records = list(fetcher.iter_records([odata_filter]))
+                if odata_filter in fetcher.failed_filters and watermark:
+                    # Watermark filter rejected: fall back to the whole slice
+                    records = list(fetcher.iter_records([build_filter(service, region)]))
+
+                if not records:
+                    continue
+
+                for record in records:
+                    found = index.get((record['id'], record['region']))
+                    if found:
+                        azure[found[0]][found[1]] = record
+                    else:
+                        category_records = azure.setdefault(record['category'], [])
+                        index[(record['id'], record['region'])] = (record['category'], len(category_records))
+                        category_records.append(record)
+                    state[key] = max(state.get(key) or '', record['effectiveStartDate'])
+
+                self.changes['Azure'].append(f"{key}: {len(records)} SKUs")
+                print(f"✓ Azure {key}: {len(records)} SKUs changed since {watermark}")
+
+    def refresh(self) -> Dict:
+        """
+        Patch the stored catalog with whatever changed since the last run
+        """
+        catalog, state = self._load()
+        if catalog is None:
+            print("No previous snapshot, running a full refresh")
+            return self.full_refresh()
+
+        self.changes = {'AWS': [], 'Azure': [], 'GCP': []}
+
+        if self.api.aws_services:
+            self._patch_aws(catalog.setdefault('AWS', {}), state.setdefault('aws', {}))
+
+        self._patch_azure(catalog.setdefault('Azure', {}), state.setdefault('azure', {}))
+
+        gcp_version = self._gcp_version()
+        if gcp_version and gcp_version != state.get('gcp'):
+            catalog['GCP'] = self.api.fetch_gcp_pricing()
+            state['gcp'] = gcp_version
+            self.changes['GCP'].append(f"pricelist {gcp_version.get('version')}")
+
+        catalog.setdefault('metadata', {})['timestamp'] = datetime.now().isoformat()
+        catalog['metadata']['delta'] = self.changes
+
+        if any(self.changes.values()):
+            self._save_catalog(catalog)
+        else:
+            print("\n✓ Nothing changed since the last snapshot")
+        self._save_state(state)
+
+        return catalog
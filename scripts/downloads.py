@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Resumable Download Manager
+Downloads large offer files to disk with HTTP Range requests, resuming
+after network errors and optionally fetching several ranges in parallel
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+
+DEFAULT_DOWNLOAD_DIR = '.downloads'
+
+# S3-style single-part ETags are the MD5 of the body
+_MD5_ETAG = re.compile(r'^"?([0-9a-f]{32})"?$')
+
+
+class DownloadError(Exception):
+    """
+    Raised when a download cannot be completed or fails verification
+    """
+
+
+class DownloadManager:
+    """
+    Writes to `<file>.part` next to a small JSON state file recording the
+    validators and finished ranges, so an interrupted download picks up
+    where it left off instead of starting again from byte zero
+    """
+
+    def __init__(self, session: requests.Session, download_dir: str = DEFAULT_DOWNLOAD_DIR,
+                 chunk_size: int = 16 * 1024 ** 2, parallel_ranges: int = 4,
+                 max_attempts: int = 5, timeout: Tuple[int, int] = (10, 60)):
+        self.session = session
+        self.download_dir = download_dir
+        self.chunk_size = chunk_size
+        self.parallel_ranges = parallel_ranges
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.bytes_transferred = 0
+        self.resumed_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(download_dir, exist_ok=True)
+
+    def _state_path(self, path: str) -> str:
+        return f"{path}.part.json"
+
+    def _load_state(self, path: str) -> Dict:
+        try:
+            with open(self._state_path(path), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, path: str, state: Dict):
+        tmp_path = f"{self._state_path(path)}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._state_path(path))
+
+    def _probe(self, url: str) -> Dict:
+        """
+        HEAD the URL for size, ETag and range support
+        """
+        response = self.session.head(url, timeout=self.timeout, allow_redirects=True,
+                                     headers={'Accept-Encoding': 'identity'})
+        response.raise_for_status()
+        size = response.headers.get('Content-Length')
+        return {
+            'url': url,
+            'size': int(size) if size else None,
+            'etag': response.headers.get('ETag'),
+            'ranges': response.headers.get('Accept-Ranges', '').lower() == 'bytes',
+        }
+
+    def _get(self, url: str, start: int, end: Optional[int], etag: Optional[str]) -> requests.Response:
+        headers = {'Accept-Encoding': 'identity'}
+        if start or end is not None:
+            headers['Range'] = f"bytes={start}-{'' if end is None else end}"
+            if etag:
+                # Server sends the whole (new) file if it changed under us
+                headers['If-Range'] = etag
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def _with_retries(self, label: str, attempt_fn):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return attempt_fn()
+            except (requests.RequestException, OSError) as e:
+                if attempt == self.max_attempts:
+                    raise DownloadError(f"{label} failed after {attempt} attempts: {e}")
+                delay = min(2 ** attempt, 30)
+                print(f"  ↻ {label}: {e} (retrying in {delay}s)")
+                time.sleep(delay)
+
+    def _fetch_range(self, url: str, part_path: str, start: int, end: int, etag: Optional[str]):
+        """
+        Write bytes [start, end] into the preallocated part file
+        """
+        def attempt():
+            response = self._get(url, start, end, etag)
+            with response:
+                if response.status_code != 206:
+                    raise DownloadError(f"{url} changed during download (got {response.status_code})")
+                offset = start
+                with open(part_path, 'r+b') as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.seek(offset)
+                        f.write(chunk)
+                        offset += len(chunk)
+                        with self._lock:
+                            self.bytes_transferred += len(chunk)
+            if offset != end + 1:
+                raise requests.ConnectionError(f"short read for bytes {start}-{end}")
+
+        self._with_retries(f"bytes {start}-{end}", attempt)
+
+    def _download_parallel(self, url: str, path: str, state: Dict):
+        part_path = f"{path}.part"
+        size = state['size']
+        if not os.path.exists(part_path) or os.path.getsize(part_path) != size:
+            with open(part_path, 'wb') as f:
+                f.truncate(size)
+
+        done = set(state.setdefault('done', []))
+        ranges: List[Tuple[int, int]] = [
+            (start, min(start + self.chunk_size, size) - 1)
+            for start in range(0, size, self.chunk_size)
+            if start not in done
+        ]
+        self.resumed_bytes += size - sum(end - start + 1 for start, end in ranges)
+
+        def run(byte_range: Tuple[int, int]):
+            self._fetch_range(url, part_path, byte_range[0], byte_range[1], state['etag'])
+            with self._lock:
+                state['done'].append(byte_range[0])
+                self._save_state(path, state)
+
+        with ThreadPoolExecutor(max_workers=self.parallel_ranges) as executor:
+            # list() re-raises the first failure after every range has finished
+            list(executor.map(run, ranges))
+
+    def _download_sequential(self, url: str, part_path: str, state: Dict):
+        if os.path.exists(part_path):
+            self.resumed_bytes += os.path.getsize(part_path)
+
+        def attempt():
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if state['size'] is not None and offset >= state['size']:
+                return
+            response = self._get(url, offset, None, state['etag'] if state['ranges'] else None)
+            with response:
+                # 200 means the server ignored (or rejected) the range: start over
+                mode = 'ab' if response.status_code == 206 else 'wb'
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+                        self.bytes_transferred += len(chunk)
+            if state['size'] is not None and os.path.getsize(part_path) < state['size']:
+                raise requests.ConnectionError('connection closed before end of file')
+
+        self._with_retries(url, attempt)
+
+    def _verify(self, part_path: str, state: Dict):
+        actual = os.path.getsize(part_path)
+        if state['size'] is not None and actual != state['size']:
+            raise DownloadError(f"size mismatch: expected {state['size']} bytes, got {actual}")
+
+        match = _MD5_ETAG.match(state.get('etag') or '')
+        if match:
+            digest = hashlib.md5()
+            with open(part_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            if digest.hexdigest() != match.group(1):
+                raise DownloadError('ETag (MD5) mismatch')
+
+    def download(self, url: str, filename: Optional[str] = None) -> str:
+        """
+        Download `url` into the download directory and return the local path.
+        A previous complete download with the same ETag is reused as-is.
+        """
+        path = os.path.join(self.download_dir, filename or url.rstrip('/').split('/')[-1])
+        part_path = f"{path}.part"
+        meta_path = f"{path}.meta.json"
+
+        probe = self._probe(url)
+
+        # Already have this exact version
+        if os.path.exists(path) and os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            if probe['etag'] and meta.get('etag') == probe['etag'] and meta.get('size') == probe['size']:
+                print(f"✓ {os.path.basename(path)} is up to date")
+                return path
+
+        # Only resume a partial file for the same version of the remote file
+        state = self._load_state(path)
+        if state.get('etag') != probe['etag'] or state.get('size') != probe['size'] or not probe['etag']:
+            for stale in (part_path, self._state_path(path)):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            state = dict(probe, done=[])
+            self._save_state(path, state)
+
+        if probe['ranges'] and probe['size'] and self.parallel_ranges > 1:
+            self._download_parallel(url, path, state)
+        else:
+            self._download_sequential(url, part_path, state)
+
+        self._verify(part_path, state)
+
+        os.replace(part_path, path)
+        os.remove(self._state_path(path))
+        with open(meta_path, 'w') as f:
+            json.dump({'url': url, 'etag': probe['etag'], 'size': os.path.getsize(path)}, f)
+
+        print(f"✓ Downloaded {os.path.basename(path)} "
+              f"({self.bytes_transferred / 1024 ** 2:.1f} MB transferred, "
+              f"{self.resumed_bytes / 1024 ** 2:.1f} MB resumed)")
+        return path
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+GCP Pricelist Parsing
+Turns the public Cloud Pricing Calculator pricelist into per-region
+service records for Compute Engine machine types
+"""
+
+import re
+from typing import Dict, Iterator
+
+from specs import InstanceShape
+
+
+GCP_PRICELIST_URL = "https://cloudpricingcalculator.appspot.com/static/data/pricelist.json"
+HOURS_PER_MONTH = 730
+VM_PREFIX = 'CP-COMPUTEENGINE-VMIMAGE-'
+
+# Region keys look like us-central1 / europe-west4; multi-region keys (us, europe) are skipped
+_REGION = re.compile(r'^[a-z]+-[a-z]+\d+$')
+
+
+def iter_vm_records(pricelist: Dict) -> Iterator[Dict]:
+    """
+    One record per (machine type, region) priced in `gcp_price_list`.
+    Preemptible and custom-core entries are skipped.
+    """
+    for key, entry in pricelist.get('gcp_price_list', {}).items():
+        if not key.startswith(VM_PREFIX) or not isinstance(entry, dict):
+            continue
+        machine_type = key[len(VM_PREFIX):].lower()
+        if 'preemptible' in machine_type or 'custom' in machine_type:
+            continue
+
+        cores = entry.get('cores')
+        try:
+            vcpu = float(cores)
+        except (TypeError, ValueError):
+            # Shared-core types (e2-micro etc.) report 'shared'
+            vcpu = float(entry.get('fractionalCpu') or 0) or None
+        try:
+            ram_gb = float(entry.get('memory'))
+        except (TypeError, ValueError):
+            ram_gb = None
+        shape = InstanceShape(vcpu=vcpu, ram_gb=ram_gb, gpu=float(entry.get('gpu') or 0))
+
+        for region, hourly in entry.items():
+            if not _REGION.match(region) or not isinstance(hourly, (int, float)) or hourly <= 0:
+                continue
+            yield {
+                'id': f"gcp-{machine_type}",
+                'name': machine_type,
+                'baseCost': round(hourly * HOURS_PER_MONTH, 4),
+                'category': 'compute',
+                'specs': shape.describe(),
+                'description': 'GCP Compute Engine machine type',
+                'source': 'GCP Pricing Calculator',
+                'region': region,
+                'unit': 'Hour',
+                'hourly': hourly,
+                **(shape.as_fields() if shape.vcpu else {}),
+            }
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Response Cache
+Transport adapter for requests.Session that revalidates cached responses
+with ETag/Last-Modified and keeps gzip-compressed bodies on disk under a
+byte budget (least recently used entries are evicted first)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from rate_limit import ScheduledAdapter
+
+
+DEFAULT_CACHE_DIR = '.http_cache'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB of compressed bodies
+
+# Bodies are stored decoded, so these no longer describe them
+_DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class ResponseCache:
+    """
+    Directory of gzip-compressed bodies plus a JSON index holding the
+    validators, headers, size and last access time of each entry
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(self.index_path, 'r') as f:
+                self.index: Dict[str, Dict] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.gz")
+
+    def total_bytes(self) -> int:
+        return sum(entry['size'] for entry in self.index.values())
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self.index.get(self.key(url))
+            if entry and not os.path.exists(self.body_path(self.key(url))):
+                del self.index[self.key(url)]
+                return None
+            return entry
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def touch(self, url: str):
+        with self._lock:
+            entry = self.index.get(self.key(url))
+            if entry:
+                entry['last_access'] = time.time()
+                self.hits += 1
+                self._save_index()
+
+    def commit(self, url: str, tmp_path: str, headers: Dict[str, str]):
+        """
+        Move a fully written body into place and evict down to the budget
+        """
+        key = self.key(url)
+        size = os.path.getsize(tmp_path)
+
+        with self._lock:
+            if size > self.max_bytes:
+                os.remove(tmp_path)
+                return
+
+            os.replace(tmp_path, self.body_path(key))
+            self.index[key] = {
+                'url': url,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'headers': {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS},
+                'size': size,
+                'last_access': time.time(),
+            }
+            self.stored += 1
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        total = self.total_bytes()
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= entry['size']
+            del self.index[key]
+            self.evicted += 1
+            try:
+                os.remove(self.body_path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self.index),
+            'bytes': self.total_bytes(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stored': self.stored,
+            'evicted': self.evicted,
+        }
+
+
+class _TeeRaw:
+    """
+    Wraps a urllib3 response body, copying what the caller reads into a
+    compressed temp file that is committed to the cache at end of stream
+    """
+
+    def __init__(self, raw, cache: ResponseCache, url: str, headers: Dict[str, str]):
+        self._raw = raw
+        self._cache = cache
+        self._url = url
+        self._headers = headers
+        self._tmp_path = f"{cache.body_path(cache.key(url))}.{threading.get_ident()}.part"
+        self._out = gzip.open(self._tmp_path, 'wb', compresslevel=6)
+
+    def read(self, amt: Optional[int] = None, decode_content: bool = True) -> bytes:
+        data = self._raw.read(amt, decode_content=True)
+        if self._out is None:
+            return data
+        if data:
+            self._out.write(data)
+        else:
+            self._out.close()
+            self._out = None
+            self._cache.commit(self._url, self._tmp_path, self._headers)
+        return data
+
+    def close(self):
+        # Abandoned before EOF: keep nothing
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+            try:
+                os.remove(self._tmp_path)
+            except FileNotFoundError:
+                pass
+        self._raw.close()
+
+    def release_conn(self):
+        release = getattr(self._raw, 'release_conn', None)
+        if release:
+            release()
+
+
+class CachingAdapter(ScheduledAdapter):
+    """
+    HTTPAdapter that turns repeat GETs into conditional requests and
+    serves 304 Not Modified responses from the on-disk cache.
+    Network sends still go through the session's scheduler, if any.
+    """
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        # Partial content is never cached or answered from the cache
+        if request.method != 'GET' or 'Range' in request.headers:
+            return super().send(request, **kwargs)
+
+        entry = self.cache.lookup(request.url)
+        if entry:
+            if entry.get('etag'):
+                request.headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            response.close()
+            self.cache.touch(request.url)
+            return self._cached_response(request, entry)
+
+        self.cache.record_miss()
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            response.raw = _TeeRaw(response.raw, self.cache, request.url, dict(response.headers))
+            for header in _DROPPED_HEADERS:
+                response.headers.pop(header, None)
+
+        return response
+
+    def _cached_response(self, request, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = gzip.open(self.cache.body_path(self.cache.key(request.url)), 'rb')
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+
+def install_cache(session: requests.Session, cache_dir: str = DEFAULT_CACHE_DIR,
+                  max_bytes: int = DEFAULT_MAX_BYTES) -> ResponseCache:
+    """
+    Mount a CachingAdapter on both schemes of `session` and return its cache
+    """
+    cache = ResponseCache(cache_dir, max_bytes)
+    scheduler = getattr(session.adapters.get('https://'), 'scheduler', None)
+    adapter = CachingAdapter(cache, scheduler=scheduler)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return cache
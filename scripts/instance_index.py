@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Cross-Provider Instance Matching
+k-d trees over normalized (vCPU, memory, GPU, storage) vectors, one per
+provider, answering "what are the k closest instances to this shape on
+every other cloud?"
+"""
+
+import heapq
+import math
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from specs import InstanceShape, service_shape
+
+
+# Doubling vCPU or memory is a distance of 1; a GPU more or less counts
+# for more, local storage for much less
+FEATURE_WEIGHTS = (1.0, 1.0, 2.0, 0.25)
+
+
+def feature_vector(shape: InstanceShape) -> Tuple[float, ...]:
+    return (
+        FEATURE_WEIGHTS[0] * math.log2(shape.vcpu),
+        FEATURE_WEIGHTS[1] * math.log2(shape.ram_gb),
+        FEATURE_WEIGHTS[2] * (shape.gpu or 0),
+        FEATURE_WEIGHTS[3] * math.log2(1 + (shape.storage_gb or 0)),
+    )
+
+
+class _Node(NamedTuple):
+    point: Tuple[float, ...]
+    item: Dict
+    axis: int
+    left: Optional['_Node']
+    right: Optional['_Node']
+
+
+class KDTree:
+    """
+    Static k-d tree built by median splits. Ties in distance are broken
+    by the item's price, so equally good matches come back cheapest first.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, ...]], items: Sequence[Dict]):
+        self.size = len(points)
+        self.dims = len(points[0]) if points else 0
+        self.root = self._build(list(zip(points, items)), 0)
+
+    def _build(self, entries: List, depth: int) -> Optional[_Node]:
+        if not entries:
+            return None
+        axis = depth % self.dims
+        entries.sort(key=lambda entry: entry[0][axis])
+        median = len(entries) // 2
+        point, item = entries[median]
+        return _Node(point, item, axis,
+                     self._build(entries[:median], depth + 1),
+                     self._build(entries[median + 1:], depth + 1))
+
+    def nearest(self, target: Tuple[float, ...], k: int = 1) -> List[Tuple[float, Dict]]:
+        """
+        The k closest items as (euclidean distance, item), closest first
+        """
+        # Max-heap of the best k so far, keyed on (-distance², -price)
+        best: List[Tuple[float, float, int, Dict]] = []
+
+        def visit(node: Optional[_Node]):
+            if node is None:
+                return
+            distance = sum((a - b) ** 2 for a, b in zip(node.point, target))
+            key = (-distance, -(node.item.get('price') or 0.0), id(node), node.item)
+            if len(best) < k:
+                heapq.heappush(best, key)
+            elif key > best[0]:
+                heapq.heapreplace(best, key)
+
+            diff = target[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            visit(near)
+            # Equal distances are still explored so ties can be broken on price
+            if len(best) < k or diff * diff <= -best[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return [(math.sqrt(-distance), item) for distance, _, _, item in sorted(best, reverse=True)]
+
+
+class InstanceIndex:
+    """
+    One KDTree per provider over every instance whose vCPU and memory are
+    known. Items are the catalog records (anything with a `price` and the
+    fields service_shape() understands).
+    """
+
+    def __init__(self, records_by_provider: Dict[str, Iterable[Dict]]):
+        self.trees: Dict[str, KDTree] = {}
+        self.skipped = 0
+        for provider, records in records_by_provider.items():
+            points, items = [], []
+            for record in records:
+                shape = service_shape(record)
+                if not shape.matchable:
+                    self.skipped += 1
+                    continue
+                points.append(feature_vector(shape))
+                items.append(dict(record, provider=provider))
+            if points:
+                self.trees[provider] = KDTree(points, items)
+
+    @classmethod
+    def from_catalog(cls, catalog, category: str = 'compute', region: Optional[str] = None) -> 'InstanceIndex':
+        """
+        Build from a PriceCatalog's rows of one category (optionally one region)
+        """
+        records: Dict[str, List[Dict]] = {}
+        for provider in catalog.providers():
+            rows = catalog.find(provider, category, region=region, order='rowid')
+            records[provider] = [dict(row) for row in rows]
+        return cls(records)
+
+    def nearest(self, shape: InstanceShape, k: int = 1,
+                providers: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[float, Dict]]]:
+        """
+        The k closest instances to `shape` on each provider
+        """
+        target = feature_vector(shape)
+        return {
+            provider: tree.nearest(target, k)
+            for provider, tree in self.trees.items()
+            if providers is None or provider in providers
+        }
+
+    def equivalents(self, record: Dict, provider: str, k: int = 1) -> Dict[str, List[Tuple[float, Dict]]]:
+        """
+        The k closest instances to `record` on every provider but its own
+        """
+        shape = service_shape(record)
+        if not shape.matchable:
+            return {}
+        return self.nearest(shape, k, [other for other in self.trees if other != provider])
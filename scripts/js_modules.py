@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+JavaScript Catalog Modules
+Streams the pricing catalog into JavaScript modules: one cloudServices
+module, or one content-hashed module per provider/category plus an index
+that loads them on demand. Strings are emitted as escaped JSON literals.
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import re
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from columnar import iter_partitions
+
+
+SERVICE_FIELDS = ('id', 'name', 'baseCost', 'category', 'specs', 'description')
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_$][A-Za-z0-9_$]*$')
+_SHARD = re.compile(r'^[a-z0-9-]+\.[0-9a-f]{8}\.js$')
+
+
+def js_literal(value) -> str:
+    """
+    JavaScript literal for a JSON-like value (None and NaN become null)
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return 'null'
+    return json.dumps(value)
+
+
+def js_key(key: str) -> str:
+    return key if _IDENTIFIER.match(key) else json.dumps(key)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+class _HashingWriter:
+    """
+    Text sink that hashes everything written through it
+    """
+
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def write(self, text: str):
+        self.f.write(text)
+        self.sha256.update(text.encode('utf-8'))
+
+
+def write_services(out, services: Iterable[Dict], indent: str = '      ',
+                   fields: Tuple[str, ...] = SERVICE_FIELDS) -> int:
+    """
+    Write `{ field: value, ... },` objects one service at a time
+    """
+    count = 0
+    inner = indent + '  '
+    for service in services:
+        out.write(f"{indent}{{\n")
+        out.write(',\n'.join(f"{inner}{js_key(field)}: {js_literal(service.get(field))}" for field in fields))
+        out.write(f"\n{indent}}},\n")
+        count += 1
+    return count
+
+
+def write_catalog_module(out, data: Dict, header: List[str], providers: Optional[List[str]] = None,
+                         fields: Tuple[str, ...] = SERVICE_FIELDS) -> int:
+    """
+    `export const cloudServices = { Provider: { category: [...] } };`
+    written to a text stream; returns the number of services
+    """
+    for line in header:
+        out.write(f"// {line}\n")
+    out.write("\nexport const cloudServices = {\n")
+
+    count = 0
+    for provider, categories in data.items():
+        # Same skip rule as iter_partitions, but empty categories are kept
+        if provider == 'metadata' or not isinstance(categories, dict):
+            continue
+        if providers is not None and provider not in providers:
+            continue
+        out.write(f"  {js_key(provider)}: {{\n")
+        for category, services in categories.items():
+            out.write(f"    {js_key(category)}: [\n")
+            count += write_services(out, services or [], fields=fields)
+            out.write("    ],\n")
+        out.write("  },\n")
+
+    out.write("};\n")
+    return count
+
+
+def write_module_file(data: Dict, path: str, header: List[str], providers: Optional[List[str]] = None,
+                      fields: Tuple[str, ...] = SERVICE_FIELDS) -> int:
+    """
+    Stream the single cloudServices module to `path` (replaced atomically)
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        count = write_catalog_module(f, data, header, providers, fields)
+    os.replace(tmp_path, path)
+    return count
+
+
+def render_catalog_module(data: Dict, header: List[str], providers: Optional[List[str]] = None,
+                          fields: Tuple[str, ...] = SERVICE_FIELDS) -> str:
+    out = io.StringIO()
+    write_catalog_module(out, data, header, providers, fields)
+    return out.getvalue()
+
+
+def _write_shard(out_dir: str, provider: str, category: str, services: List[Dict],
+                 module_format: str, fields: Tuple[str, ...]) -> Tuple[str, int]:
+    # No timestamp header: the file name must only change with the content
+    stem = f"{_slug(provider)}-{_slug(category)}"
+    tmp_path = os.path.join(out_dir, f".{stem}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        out = _HashingWriter(f)
+        out.write("export default [\n" if module_format == 'esm' else "module.exports = [\n")
+        count = write_services(out, services, indent='  ', fields=fields)
+        out.write("];\n")
+    filename = f"{stem}.{out.sha256.hexdigest()[:8]}.js"
+    os.replace(tmp_path, os.path.join(out_dir, filename))
+    return filename, count
+
+
+def _write_index(out, files: Dict[str, Dict[str, str]], header: List[str], module_format: str):
+    for line in header:
+        out.write(f"// {line}\n")
+    out.write("\n")
+    if module_format == 'esm':
+        out.write("export const modules = {\n")
+        for provider, categories in files.items():
+            out.write(f"  {js_key(provider)}: {{\n")
+            for category, filename in categories.items():
+                out.write(f"    {js_key(category)}: () => import({js_literal('./' + filename)}),\n")
+            out.write("  },\n")
+        out.write("};\n\n")
+        out.write("export async function loadCategory(provider, category) {\n"
+                  "  const load = modules[provider] && modules[provider][category];\n"
+                  "  return load ? (await load()).default : [];\n"
+                  "}\n\n"
+                  "export async function loadCloudServices(providers = Object.keys(modules)) {\n"
+                  "  const cloudServices = {};\n"
+                  "  for (const provider of providers) {\n"
+                  "    cloudServices[provider] = {};\n"
+                  "    for (const category of Object.keys(modules[provider] || {})) {\n"
+                  "      cloudServices[provider][category] = await loadCategory(provider, category);\n"
+                  "    }\n"
+                  "  }\n"
+                  "  return cloudServices;\n"
+                  "}\n")
+    else:
+        out.write(f"const files = {json.dumps(files, indent=2)};\n\n")
+        out.write("function loadCategory(provider, category) {\n"
+                  "  const file = files[provider] && files[provider][category];\n"
+                  "  return file ? require('./' + file) : [];\n"
+                  "}\n\n"
+                  "function loadCloudServices(providers = Object.keys(files)) {\n"
+                  "  const cloudServices = {};\n"
+                  "  for (const provider of providers) {\n"
+                  "    cloudServices[provider] = {};\n"
+                  "    for (const category of Object.keys(files[provider] || {})) {\n"
+                  "      cloudServices[provider][category] = loadCategory(provider, category);\n"
+                  "    }\n"
+                  "  }\n"
+                  "  return cloudServices;\n"
+                  "}\n\n"
+                  "module.exports = { files, loadCategory, loadCloudServices };\n")
+
+
+def write_sharded_modules(data: Dict, out_dir: str, header: List[str], module_format: str = 'esm',
+                          providers: Optional[List[str]] = None,
+                          fields: Tuple[str, ...] = SERVICE_FIELDS) -> Dict[str, Dict[str, str]]:
+    """
+    One `<provider>-<category>.<hash>.js` module per partition and an
+    `index.js` mapping provider/category to it (ESM dynamic imports, or
+    require() with module_format='cjs'). A shard's name changes only when
+    its content does, so it can be cached indefinitely. Shards from
+    earlier runs that the new index no longer references are removed.
+    Returns provider -> category -> filename.
+    """
+    if module_format not in ('esm', 'cjs'):
+        raise ValueError(f"module_format must be 'esm' or 'cjs', not {module_format!r}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    files: Dict[str, Dict[str, str]] = {}
+    for provider, category, services in iter_partitions(data):
+        if providers is not None and provider not in providers:
+            continue
+        filename, _ = _write_shard(out_dir, provider, category, services, module_format, fields)
+        files.setdefault(provider, {})[category] = filename
+
+    tmp_path = os.path.join(out_dir, '.index.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        _write_index(f, files, header, module_format)
+    os.replace(tmp_path, os.path.join(out_dir, 'index.js'))
+
+    current = {filename for categories in files.values() for filename in categories.values()}
+    for filename in os.listdir(out_dir):
+        if _SHARD.match(filename) and filename not in current:
+            os.remove(os.path.join(out_dir, filename))
+    return files
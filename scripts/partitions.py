@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Partitioned Catalog Files
+Writes a pricing snapshot as one JSON file per provider/category plus a
+small manifest, and reads partitions back individually so consumers only
+parse the sections they use
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from columnar import iter_partitions, read_catalog, table_to_catalog
+
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+DEFAULT_PARTITION_DIR = 'cloud_pricing_api'
+
+
+def _replace(path: str, content: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(root: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(root, MANIFEST_FILE), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_partitions(data: Dict, root: str = DEFAULT_PARTITION_DIR) -> Dict:
+    """
+    Write root/<provider>/<category>.json for every non-empty category and
+    then root/manifest.json. Partitions whose content is unchanged since
+    the previous manifest are not rewritten; partitions that disappeared
+    are removed. Returns the new manifest.
+    """
+    previous = {
+        (entry['provider'], entry['category']): entry
+        for entry in (read_manifest(root) or {}).get('partitions', [])
+    }
+
+    partitions = []
+    written = 0
+    for provider, category, services in iter_partitions(data):
+        content = json.dumps(services, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        relative = f"{provider}/{category}.json"
+        path = os.path.join(root, relative)
+
+        old = previous.pop((provider, category), None)
+        if not (old and old['sha256'] == digest and os.path.exists(path)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _replace(path, content)
+            written += 1
+
+        partitions.append({
+            'provider': provider,
+            'category': category,
+            'file': relative,
+            'count': len(services),
+            'bytes': len(content),
+            'sha256': digest,
+        })
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'metadata': data.get('metadata') or {'timestamp': data.get('timestamp')},
+        'partitions': partitions,
+    }
+    os.makedirs(root, exist_ok=True)
+    _replace(os.path.join(root, MANIFEST_FILE), json.dumps(manifest, indent=2).encode('utf-8'))
+
+    # The manifest no longer points at these, so they can go
+    for entry in previous.values():
+        try:
+            os.remove(os.path.join(root, entry['file']))
+        except FileNotFoundError:
+            pass
+
+    manifest['written'] = written
+    return manifest
+
+
+class JsonPartitions:
+    """
+    Partition source over a directory written by write_partitions()
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        manifest = read_manifest(root)
+        if manifest is None:
+            raise FileNotFoundError(os.path.join(root, MANIFEST_FILE))
+        self.metadata: Dict = manifest.get('metadata') or {}
+        self.entries: List[Dict] = manifest.get('partitions', [])
+
+    def version(self, entry: Dict) -> str:
+        return entry['sha256']
+
+    def read(self, entry: Dict) -> List[Dict]:
+        with open(os.path.join(self.root, entry['file']), 'r') as f:
+            return json.load(f)
+
+
+class ParquetPartitions:
+    """
+    Partition source over a dataset written by columnar.write_catalog()
+    (provider=<p>/category=<c>/part-0.parquet); counts are unknown until read
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.metadata: Dict = {}
+        self.entries: List[Dict] = []
+        for provider_dir in sorted(os.listdir(root)):
+            if not provider_dir.startswith('provider='):
+                continue
+            for category_dir in sorted(os.listdir(os.path.join(root, provider_dir))):
+                if not category_dir.startswith('category='):
+                    continue
+                path = os.path.join(root, provider_dir, category_dir, 'part-0.parquet')
+                if os.path.exists(path):
+                    stat = os.stat(path)
+                    self.entries.append({
+                        'provider': provider_dir.split('=', 1)[1],
+                        'category': category_dir.split('=', 1)[1],
+                        'file': os.path.relpath(path, root),
+                        'count': None,
+                        'bytes': stat.st_size,
+                        'sha256': f"{stat.st_mtime_ns}-{stat.st_size}",
+                    })
+
+    def version(self, entry: Dict) -> str:
+        return entry['sha256']
+
+    def read(self, entry: Dict) -> List[Dict]:
+        table = read_catalog(self.root, providers=[entry['provider']], categories=[entry['category']])
+        return table_to_catalog(table).get(entry['provider'], {}).get(entry['category'], [])
+
+
+def open_partitions(root: str):
+    """
+    JsonPartitions when root has a manifest, else ParquetPartitions
+    """
+    if os.path.exists(os.path.join(root, MANIFEST_FILE)):
+        return JsonPartitions(root)
+    return ParquetPartitions(root)
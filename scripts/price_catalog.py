@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Indexed Price Catalog
+Loads a pricing snapshot into an embedded SQLite database so comparisons
+are indexed queries instead of linear scans over the nested JSON
+"""
+
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from columnar import iter_partitions, read_catalog, table_to_catalog
+from specs import service_shape
+
+
+# Bumped whenever the tables change; older databases are rebuilt
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS services (
+    provider    TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    region      TEXT,
+    id          TEXT,
+    name        TEXT,
+    specs       TEXT,
+    vcpu        REAL,
+    ram_gb      REAL,
+    gpu         REAL,
+    storage_gb  REAL,
+    price       REAL,
+    hourly      REAL,
+    unit        TEXT,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_services_shape
+    ON services (provider, category, region, vcpu, ram_gb, price);
+CREATE INDEX IF NOT EXISTS idx_services_name
+    ON services (provider, category, name);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Orderings find() accepts; the value is placed in the SQL text
+_FIND_ORDERS = ('price', 'rowid')
+
+_COLUMNS = ('provider', 'category', 'region', 'id', 'name', 'specs',
+            'vcpu', 'ram_gb', 'gpu', 'storage_gb', 'price', 'hourly', 'unit', 'description')
+
+
+def _rows(data: Dict) -> Iterable[Tuple]:
+    for provider, category, services in iter_partitions(data):
+        for service in services:
+            shape = service_shape(service)
+            yield (
+                provider, category, service.get('region'), service.get('id'),
+                service.get('name'), service.get('specs'), *shape,
+                service.get('baseCost'), service.get('hourly'), service.get('unit'),
+                service.get('description'),
+            )
+
+
+class PriceCatalog:
+    """
+    One `services` row per priced SKU (price is the monthly baseCost).
+    With a db_path the database is kept on disk and reused until the
+    snapshot it was built from changes. A catalog attached to a partition
+    source (see partitions.py) loads each provider/category on first access.
+    """
+
+    def __init__(self, db_path: str = ':memory:'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS services; DROP TABLE IF EXISTS meta;")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(SCHEMA)
+        self.source = None
+        self._loaded = set()
+
+    def close(self):
+        self.conn.close()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def load(self, data: Dict, source: Optional[str] = None) -> int:
+        """
+        Replace the catalog with `data` (provider -> category -> [service])
+        """
+        self.source = None
+        with self.conn:
+            self.conn.execute("DELETE FROM services")
+            self.conn.execute("DELETE FROM meta WHERE key LIKE 'partition:%'")
+            self.conn.executemany(
+                f"INSERT INTO services ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                _rows(data)
+            )
+            meta = {
+                'metadata': json.dumps(data.get('metadata') or {'timestamp': data.get('timestamp')}),
+                'source': source,
+                'source_mtime': str(os.path.getmtime(source)) if source and os.path.exists(source) else None,
+            }
+            self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+        self.conn.execute("ANALYZE")
+        return self.count()
+
+    def is_current(self, source: str) -> bool:
+        """
+        True when the database was built from `source` as it is on disk now
+        """
+        return (
+            self.get_meta('source') == source
+            and os.path.exists(source)
+            and self.get_meta('source_mtime') == str(os.path.getmtime(source))
+        )
+
+    def load_json(self, pricing_file: str) -> int:
+        if self.is_current(pricing_file):
+            return self.count()
+        with open(pricing_file, 'r') as f:
+            return self.load(json.load(f), pricing_file)
+
+    def load_parquet(self, root: str) -> int:
+        return self.load(table_to_catalog(read_catalog(root)), root)
+
+    def attach(self, source):
+        """
+        Serve partitions from `source` without reading any of them yet.
+        Partitions already in the database at the same version are reused;
+        rows of partitions the source no longer has are dropped.
+        """
+        self.source = source
+        self._loaded = set()
+        keys = [(entry['provider'], entry['category']) for entry in source.entries]
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS attached (provider TEXT, category TEXT)")
+            self.conn.execute("DELETE FROM attached")
+            self.conn.executemany("INSERT INTO attached VALUES (?, ?)", keys)
+            self.conn.execute(
+                "DELETE FROM services WHERE (provider, category) NOT IN (SELECT provider, category FROM attached)"
+            )
+            self.conn.execute("DELETE FROM meta WHERE key LIKE 'partition:%' AND substr(key, 11) NOT IN "
+                              "(SELECT provider || '/' || category FROM attached)")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (source.root,))
+
+    def ensure(self, provider: Optional[str] = None, category: Optional[str] = None) -> int:
+        """
+        Load the matching partitions of the attached source that this
+        catalog does not hold yet; returns how many had to be read
+        """
+        if self.source is None:
+            return 0
+        read = 0
+        for entry in self.source.entries:
+            key = (entry['provider'], entry['category'])
+            if key in self._loaded or provider not in (None, key[0]) or category not in (None, key[1]):
+                continue
+            meta_key = f"partition:{key[0]}/{key[1]}"
+            version = self.source.version(entry)
+            if self.get_meta(meta_key) != version:
+                records = self.source.read(entry)
+                with self.conn:
+                    self.conn.execute("DELETE FROM services WHERE provider = ? AND category = ?", key)
+                    self.conn.executemany(
+                        f"INSERT INTO services ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                        _rows({key[0]: {key[1]: records}})
+                    )
+                    self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (meta_key, version))
+                read += 1
+            self._loaded.add(key)
+        return read
+
+    @property
+    def metadata(self) -> Dict:
+        if self.source is not None and self.source.metadata:
+            return self.source.metadata
+        return json.loads(self.get_meta('metadata') or '{}')
+
+    def count(self, provider: Optional[str] = None) -> int:
+        if self.source is not None:
+            # Answered from the manifest when it records row counts
+            entries = [entry for entry in self.source.entries if provider in (None, entry['provider'])]
+            if all(entry['count'] is not None for entry in entries):
+                return sum(entry['count'] for entry in entries)
+            self.ensure(provider)
+        if provider:
+            return self.conn.execute("SELECT COUNT(*) FROM services WHERE provider = ?", (provider,)).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM services").fetchone()[0]
+
+    def providers(self) -> List[str]:
+        if self.source is not None:
+            return sorted({entry['provider'] for entry in self.source.entries})
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT provider FROM services ORDER BY provider")]
+
+    def has(self, provider: str, category: str) -> bool:
+        self.ensure(provider, category)
+        return self.conn.execute(
+            "SELECT 1 FROM services WHERE provider = ? AND category = ? LIMIT 1", (provider, category)
+        ).fetchone() is not None
+
+    def find(self, provider: str, category: str, name: Optional[str] = None,
+             name_contains: Optional[str] = None, region: Optional[str] = None,
+             vcpu: Optional[float] = None, ram_gb: Optional[float] = None,
+             max_price: Optional[float] = None, order: str = 'price',
+             limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """
+        Services of one provider/category matching every given filter,
+        cheapest first (order='rowid' keeps snapshot order)
+        """
+        if order not in _FIND_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(_FIND_ORDERS)}, not {order!r}")
+        self.ensure(provider, category)
+        clauses = ["provider = ?", "category = ?"]
+        params: List = [provider, category]
+        for column, value in (('name', name), ('region', region), ('vcpu', vcpu), ('ram_gb', ram_gb)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if name_contains is not None:
+            # instr() is case-sensitive, like the substring checks it replaces
+            clauses.append("instr(name, ?) > 0")
+            params.append(name_contains)
+        if max_price is not None:
+            clauses.append("price <= ?")
+            params.append(max_price)
+
+        sql = f"SELECT * FROM services WHERE {' AND '.join(clauses)} ORDER BY {order}"
+        if order == 'price':
+            sql += ", rowid"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self.conn.execute(sql, params).fetchall()
+
+    def cheapest(self, provider: str, category: str, **filters) -> Optional[sqlite3.Row]:
+        rows = self.find(provider, category, limit=1, **filters)
+        return rows[0] if rows else None
+
+    def first(self, provider: str, category: str) -> Optional[sqlite3.Row]:
+        rows = self.find(provider, category, order='rowid', limit=1)
+        return rows[0] if rows else None
+
+    def query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        """
+        Ad-hoc read-only SQL against the `services` table (loads every
+        partition of an attached source first)
+        """
+        self.ensure()
+        return self.conn.execute(sql, params).fetchall()
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Price Lookup Service
+A small asyncio HTTP/1.1 server over the scraped catalog. The snapshot
+(JSON file or partition directory) is loaded once into in-memory indexes;
+hot GET responses are served from an LRU cache, and the index is rebuilt
+in the background and swapped in when a new snapshot lands.
+
+    GET  /lookup?provider=AWS&id=ec2-t3-micro
+    GET  /lookup?provider=AWS&category=compute&vcpu=2&ram_gb=4&limit=5
+    GET  /cheapest-equivalent?provider=AWS&id=ec2-t3-medium&k=1
+    GET  /cheapest-equivalent?vcpu=4&ram_gb=16
+    GET  /cost-estimate?provider=AWS&services=ec2-t3-micro,s3-standard&hours=200
+    POST /cost-estimate  {"architectures": [{"provider", "services", "usage"}]}
+    GET  /health
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from columnar import iter_partitions
+from instance_index import InstanceIndex
+from partitions import MANIFEST_FILE, open_partitions
+from specs import InstanceShape, service_shape
+
+# cost_engine (numpy) is imported when the first index is built
+
+
+DEFAULT_PORT = 8787
+MAX_BODY = 1 << 20
+USAGE_PARAMS = ('hours', 'GB', 'requests', 'messages', 'images', 'month')
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class NotFound(LookupError):
+    pass
+
+
+def read_snapshot(source: str) -> Dict:
+    """
+    Nested provider -> category -> [service] catalog from a JSON snapshot
+    or a partition directory (every partition is read)
+    """
+    if os.path.isdir(source):
+        partitions = open_partitions(source)
+        data: Dict = {'metadata': partitions.metadata}
+        for entry in partitions.entries:
+            data.setdefault(entry['provider'], {})[entry['category']] = partitions.read(entry)
+        return data
+    with open(source, 'r') as f:
+        return json.load(f)
+
+
+def snapshot_signature(source: str) -> Optional[Tuple]:
+    """
+    Changes whenever a new snapshot is written to `source` (None if missing)
+    """
+    path = source
+    if os.path.isdir(source):
+        path = os.path.join(source, MANIFEST_FILE)
+        if not os.path.exists(path):
+            # Parquet datasets have no manifest: every part file counts
+            return tuple(sorted((entry['file'], entry['sha256']) for entry in open_partitions(source).entries))
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class PriceIndex:
+    """
+    Immutable in-memory indexes over one snapshot: records by
+    (provider, id), price-sorted lists by (provider, category), a k-d
+    tree per provider for instance matching and the batched cost engine
+    """
+
+    def __init__(self, data: Dict, signature: Optional[Tuple] = None):
+        from cost_engine import CostEngine
+
+        self.signature = signature
+        self.metadata = data.get('metadata') or {}
+        self.loaded_at = time.time()
+        self.by_id: Dict[Tuple[str, str], List[Dict]] = {}
+        self.by_category: Dict[Tuple[str, str], List[Dict]] = {}
+        compute: Dict[str, List[Dict]] = {}
+
+        for provider, category, services in iter_partitions(data):
+            records = []
+            for service in services:
+                record = dict(service, provider=provider, price=service.get('baseCost'))
+                record.setdefault('category', category)
+                records.append(record)
+                self.by_id.setdefault((provider, record.get('id')), []).append(record)
+            records.sort(key=lambda r: (r['price'] is None, r['price'] or 0.0))
+            self.by_category[(provider, category)] = records
+            if category == 'compute':
+                compute.setdefault(provider, []).extend(records)
+
+        self.count = sum(len(records) for records in self.by_category.values())
+        self.instances = InstanceIndex(compute)
+        self.engine = CostEngine.from_snapshot(data)
+
+    def lookup(self, provider: str, id: Optional[str] = None, category: Optional[str] = None,
+               region: Optional[str] = None, vcpu: Optional[float] = None, ram_gb: Optional[float] = None,
+               max_price: Optional[float] = None, limit: int = 50) -> List[Dict]:
+        """
+        Records of one id (every region), or of one category matching the
+        filters, cheapest first
+        """
+        if id is not None:
+            records = self.by_id.get((provider, id), [])
+        elif category is not None:
+            records = self.by_category.get((provider, category), [])
+        else:
+            raise BadRequest("lookup needs id or category")
+
+        def keep(record: Dict) -> bool:
+            if region is not None and record.get('region') != region:
+                return False
+            if max_price is not None and (record['price'] is None or record['price'] > max_price):
+                return False
+            if vcpu is not None or ram_gb is not None:
+                shape = service_shape(record)
+                if (vcpu is not None and shape.vcpu != vcpu) or (ram_gb is not None and shape.ram_gb != ram_gb):
+                    return False
+            return True
+
+        result = []
+        for record in records:
+            if len(result) >= limit:
+                break
+            if keep(record):
+                result.append(record)
+        return result
+
+    def cheapest_equivalent(self, provider: Optional[str] = None, id: Optional[str] = None,
+                            shape: Optional[InstanceShape] = None, k: int = 1) -> Dict:
+        """
+        The k closest instances per provider (equally close ones cheapest
+        first) to a catalog instance or a shape, and which provider's best
+        match is cheapest
+        """
+        if id is not None:
+            if provider is None:
+                raise BadRequest("id needs provider")
+            records = self.by_id.get((provider, id))
+            if not records:
+                raise NotFound(f"{provider}/{id} is not in the catalog")
+            matches = self.instances.equivalents(records[0], provider, k)
+            shape = service_shape(records[0])
+        elif shape is not None and shape.matchable:
+            matches = self.instances.nearest(shape, k)
+        else:
+            raise BadRequest("cheapest-equivalent needs provider and id, or vcpu and ram_gb")
+
+        result = {other: [dict(item, distance=round(distance, 4)) for distance, item in found]
+                  for other, found in matches.items() if found}
+        priced = [(items[0]['price'], other) for other, items in result.items() if items[0]['price'] is not None]
+        return {
+            'shape': shape._asdict(),
+            'matches': result,
+            'cheapest': min(priced)[1] if priced else None,
+        }
+
+    def cost_estimate(self, architectures: List[Dict]) -> List[Dict]:
+        """
+        Monthly cost of each {provider, services, usage} with the server
+        evaluator's rules (see cost_engine)
+        """
+        from cost_engine import Architecture
+
+        for arch in architectures:
+            usage = arch.get('usage') if isinstance(arch, dict) else None
+            if usage is None:
+                continue
+            if not isinstance(usage, dict) or not all(
+                    isinstance(value, (int, float)) and not isinstance(value, bool) for value in usage.values()):
+                raise BadRequest("usage must map units to numbers")
+
+        try:
+            batch = self.engine.price(
+                Architecture(arch['provider'], list(arch.get('services') or []), arch.get('usage'))
+                for arch in architectures
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise BadRequest(f"architectures must be {{provider, services, usage}} objects ({e})")
+
+        results = []
+        for index, arch in enumerate(architectures):
+            items = self.engine.breakdown(batch, index)
+            results.append({
+                'provider': arch['provider'],
+                'total': round(float(batch.totals[index]), 4),
+                'services': [{'id': service_id, 'name': name, 'monthlyCost': round(cost, 4)}
+                             for service_id, name, cost in items if service_id is not None],
+                'missing': [service_id for service_id, (found, _, _) in zip(arch.get('services') or [], items)
+                            if found is None],
+            })
+        return results
+
+
+class LRUCache:
+    """
+    Most recently used responses, keyed on the normalized request
+    """
+
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self.entries: 'OrderedDict[Tuple, bytes]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: Tuple, body: bytes):
+        self.entries[key] = body
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+def _number(query: Dict[str, str], name: str, cast=float):
+    if name not in query:
+        return None
+    try:
+        return cast(query[name])
+    except ValueError:
+        raise BadRequest(f"{name} must be a number, not {query[name]!r}")
+
+
+class PriceService:
+    """
+    Serves a PriceIndex over HTTP. The index is replaced as a whole on
+    reload, so a request always sees one consistent snapshot.
+    """
+
+    def __init__(self, source: str, poll_interval: float = 5.0, cache_size: int = 1024):
+        self.source = source
+        self.poll_interval = poll_interval
+        self.cache = LRUCache(cache_size)
+        self.index: Optional[PriceIndex] = None
+        self.reloads = 0
+        self.routes = {
+            '/lookup': self._lookup,
+            '/cheapest-equivalent': self._cheapest_equivalent,
+            '/cost-estimate': self._cost_estimate,
+            '/health': self._health,
+        }
+
+    def load(self) -> PriceIndex:
+        signature = snapshot_signature(self.source)
+        index = PriceIndex(read_snapshot(self.source), signature)
+        self.index = index
+        self.cache.clear()
+        return index
+
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                signature = await loop.run_in_executor(None, snapshot_signature, self.source)
+                if signature is None or signature == self.index.signature:
+                    continue
+                # Built off the event loop; requests keep using the old index meanwhile
+                index = await loop.run_in_executor(
+                    None, lambda: PriceIndex(read_snapshot(self.source), signature)
+                )
+            except Exception as e:
+                print(f"✗ Reload of {self.source} failed, still serving the previous snapshot: {e}")
+                continue
+            self.index = index
+            self.cache.clear()
+            self.reloads += 1
+            print(f"✓ Reloaded {index.count} services from {self.source}")
+
+    # Handlers return a JSON-serializable payload
+
+    def _lookup(self, query: Dict[str, str], body: Optional[Dict]):
+        if 'provider' not in query:
+            raise BadRequest("provider is required")
+        limit = _number(query, 'limit', int)
+        if limit is not None and limit < 0:
+            raise BadRequest("limit must not be negative")
+        return self.index.lookup(
+            query['provider'], query.get('id'), query.get('category'), query.get('region'),
+            _number(query, 'vcpu'), _number(query, 'ram_gb'), _number(query, 'max_price'),
+            50 if limit is None else limit,
+        )
+
+    def _cheapest_equivalent(self, query: Dict[str, str], body: Optional[Dict]):
+        shape = InstanceShape(vcpu=_number(query, 'vcpu'), ram_gb=_number(query, 'ram_gb'),
+                              gpu=_number(query, 'gpu') or 0.0)
+        k = _number(query, 'k', int)
+        if k is not None and k < 1:
+            raise BadRequest("k must be at least 1")
+        return self.index.cheapest_equivalent(query.get('provider'), query.get('id'), shape,
+                                              1 if k is None else k)
+
+    def _cost_estimate(self, query: Dict[str, str], body: Optional[Dict]):
+        if body is not None:
+            architectures = body.get('architectures') if isinstance(body, dict) else None
+            if not isinstance(architectures, list):
+                raise BadRequest('body must be {"architectures": [...]}')
+            return self.index.cost_estimate(architectures)
+        if 'provider' not in query or 'services' not in query:
+            raise BadRequest("provider and services are required")
+        usage = {unit: _number(query, unit) for unit in USAGE_PARAMS if unit in query}
+        services = [service for service in query['services'].split(',') if service]
+        return self.index.cost_estimate([{'provider': query['provider'], 'services': services,
+                                          'usage': usage or None}])[0]
+
+    def _health(self, query: Dict[str, str], body: Optional[Dict]):
+        return {
+            'services': self.index.count,
+            'snapshot': self.index.metadata.get('timestamp'),
+            'loaded_at': self.index.loaded_at,
+            'reloads': self.reloads,
+            'cache': {'size': len(self.cache.entries), 'hits': self.cache.hits, 'misses': self.cache.misses},
+        }
+
+    def respond(self, method: str, target: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+        """
+        (status, JSON body) for one request; GETs are answered from the
+        cache when the same normalized query was seen on this snapshot
+        """
+        url = urlsplit(target)
+        handler = self.routes.get(url.path)
+        if handler is None:
+            return 404, json.dumps({'error': f"No route {url.path}"}).encode()
+        if method not in ('GET', 'POST') or (method == 'POST' and url.path != '/cost-estimate'):
+            return 405, json.dumps({'error': f"{method} not allowed on {url.path}"}).encode()
+
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        cacheable = method == 'GET' and url.path != '/health'
+        key = (url.path, tuple(sorted(query.items())))
+        if cacheable:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return 200, cached
+
+        if method == 'POST' and body is None:
+            return 400, json.dumps({'error': "POST needs a JSON body"}).encode()
+
+        try:
+            payload = json.loads(body) if method == 'POST' else None
+            result = json.dumps(handler(query, payload)).encode()
+        except (BadRequest, json.JSONDecodeError) as e:
+            return 400, json.dumps({'error': str(e)}).encode()
+        except NotFound as e:
+            return 404, json.dumps({'error': str(e)}).encode()
+        except Exception as e:
+            return 500, json.dumps({'error': f"{type(e).__name__}: {e}"}).encode()
+
+        if cacheable:
+            self.cache.put(key, result)
+        return 200, result
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body cannot be delimited, so the connection is closed after replying
+                    status, payload = 400, json.dumps({'error': 'Invalid Content-Length'}).encode()
+                elif length > MAX_BODY:
+                    status, payload = 413, json.dumps({'error': 'Body too large'}).encode()
+                else:
+                    body = await reader.readexactly(length) if length else None
+                    status, payload = self.respond(method, target, body)
+
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                              and 0 <= length <= MAX_BODY)
+                writer.write(
+                    f"{version} {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+        if self.index is None:
+            self.load()
+        server = await asyncio.start_server(self._handle, host, port)
+        watcher = asyncio.create_task(self._watch())
+        print(f"✓ Serving {self.index.count} services from {self.source} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def main(source: str = 'cloud_pricing_api.json', host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+         poll_interval: float = 5.0, cache_size: int = 1024):
+    service = PriceService(source, poll_interval, cache_size)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Adaptive Request Scheduler
+Per-host token buckets plus retries with exponential backoff and jitter,
+shared by every request a scraper session makes
+"""
+
+import random
+import threading
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Starting requests/second per host; buckets adapt from here
+DEFAULT_HOST_RATES = {
+    'pricing.us-east-1.amazonaws.com': 10.0,
+    'prices.azure.com': 5.0,
+    'cloudpricingcalculator.appspot.com': 2.0,
+    'www.runpod.io': 1.0,
+}
+
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate backs off multiplicatively when the
+    host throttles us and creeps back up additively while it does not
+    """
+
+    def __init__(self, rate: float, burst: int = 5, min_rate: float = 0.2, max_rate: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available. Returns seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now (possibly going negative) and sleep outside the lock
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate if self.tokens < 0 else 0.0, self.blocked_until - now)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def throttled(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After is either delta-seconds or an HTTP date
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """
+    Paces requests per host and retries 429/5xx responses and connection
+    errors. Counters are kept per host for reporting.
+    """
+
+    def __init__(self, host_rates: Optional[Dict[str, float]] = None, default_rate: float = 5.0,
+                 burst: int = 5, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 60.0):
+        self.host_rates = dict(DEFAULT_HOST_RATES, **(host_rates or {}))
+        self.default_rate = default_rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.counters: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.host_rates.get(host, self.default_rate), self.burst)
+            return self.buckets[host]
+
+    def _count(self, host: str, name: str, amount: float = 1):
+        with self._lock:
+            self.counters[host][name] += amount
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def send(self, send_fn: Callable, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        host = urlsplit(request.url).hostname or ''
+        bucket = self.bucket(host)
+
+        for attempt in range(self.max_attempts):
+            self._count(host, 'wait_seconds', bucket.acquire())
+            self._count(host, 'requests')
+
+            try:
+                response = send_fn(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._count(host, 'connection_errors')
+                if attempt == self.max_attempts - 1:
+                    self._count(host, 'gave_up')
+                    raise
+                delay = self.backoff(attempt)
+                print(f"  ↻ {host}: {e.__class__.__name__}, retrying in {delay:.1f}s")
+                self._count(host, 'retries')
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                bucket.succeeded()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status_code == 429:
+                self._count(host, 'throttled')
+                bucket.throttled(retry_after)
+            else:
+                self._count(host, 'server_errors')
+
+            if attempt == self.max_attempts - 1:
+                self._count(host, 'gave_up')
+                return response
+
+            delay = retry_after if retry_after is not None else self.backoff(attempt)
+            delay = min(delay, self.max_delay)
+            print(f"  ↻ {host}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+            self._count(host, 'retries')
+            response.close()
+            time.sleep(delay)
+
+        return response
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                host: dict(counts, rate=round(self.buckets[host].rate, 2))
+                for host, counts in self.counters.items()
+            }
+
+
+class ScheduledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that routes every send through a RequestScheduler when one is set
+    """
+
+    def __init__(self, scheduler: Optional[RequestScheduler] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.scheduler = scheduler
+
+    def send(self, request, **kwargs):
+        if self.scheduler is None:
+            return super().send(request, **kwargs)
+        return self.scheduler.send(super().send, request, **kwargs)
+
+
+def install_scheduler(session: requests.Session, scheduler: Optional[RequestScheduler] = None) -> RequestScheduler:
+    """
+    Attach `scheduler` to the session's adapters, mounting ScheduledAdapters
+    where a plain adapter is installed. Safe to call before or after install_cache.
+    """
+    scheduler = scheduler or RequestScheduler()
+    for prefix in ('https://', 'http://'):
+        adapter = session.adapters.get(prefix)
+        if isinstance(adapter, ScheduledAdapter):
+            adapter.scheduler = scheduler
+        else:
+            session.mount(prefix, ScheduledAdapter(scheduler))
+    return scheduler
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Multi-Region Price Matrix
+Stores every region's price of every SKU as a sparse SKU x region matrix
+(CSR arrays) instead of one record per (SKU, region) pair
+"""
+
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from specs import InstanceShape, service_shape
+
+
+class RegionalSpread(NamedTuple):
+    """
+    Per-SKU price statistics across the regions it is sold in
+    """
+    min_price: np.ndarray
+    max_price: np.ndarray
+    spread: np.ndarray         # max - min
+    spread_pct: np.ndarray     # spread as % of min
+    cheapest_region: np.ndarray
+    priciest_region: np.ndarray
+    regions: np.ndarray        # number of regions offering the SKU
+
+
+class RegionMatrixBuilder:
+    """
+    Accumulates (SKU, region, price) triples into typed arrays while records
+    stream past; SKU attributes are kept once per SKU
+    """
+
+    def __init__(self):
+        self.sku_index: Dict[Tuple[str, str], int] = {}
+        self.region_index: Dict[str, int] = {}
+        self.sku_category: List[str] = []
+        self.sku_name: List[str] = []
+        self.sku_shape = array('d')
+        self._sku = array('i')
+        self._region = array('i')
+        self._price = array('d')
+
+    def add(self, provider: str, record: Dict):
+        price = record.get('baseCost')
+        region = record.get('region')
+        if price is None or not region:
+            return
+
+        key = (provider, record['id'])
+        sku = self.sku_index.get(key)
+        if sku is None:
+            sku = self.sku_index[key] = len(self.sku_index)
+            self.sku_category.append(record.get('category', ''))
+            self.sku_name.append(record.get('name', ''))
+            shape = service_shape(record)
+            self.sku_shape.extend((
+                np.nan if shape.vcpu is None else shape.vcpu,
+                np.nan if shape.ram_gb is None else shape.ram_gb,
+                shape.gpu or 0.0,
+            ))
+
+        region_code = self.region_index.get(region)
+        if region_code is None:
+            region_code = self.region_index[region] = len(self.region_index)
+
+        self._sku.append(sku)
+        self._region.append(region_code)
+        self._price.append(price)
+
+    def add_records(self, provider: str, records: Iterable[Dict]) -> int:
+        count = 0
+        for record in records:
+            self.add(provider, record)
+            count += 1
+        return count
+
+    def build(self) -> 'RegionPriceMatrix':
+        """
+        Sort into CSR order; a SKU listed twice in one region keeps its lowest price
+        """
+        sku = np.frombuffer(self._sku, dtype=np.int32) if self._sku else np.zeros(0, np.int32)
+        region = np.frombuffer(self._region, dtype=np.int32) if self._region else np.zeros(0, np.int32)
+        price = np.frombuffer(self._price, dtype=np.float64) if self._price else np.zeros(0)
+
+        order = np.lexsort((price, region, sku))
+        sku, region, price = sku[order], region[order], price[order]
+        first = np.r_[True, (sku[1:] != sku[:-1]) | (region[1:] != region[:-1])] if len(sku) else np.zeros(0, bool)
+        sku, region, price = sku[first], region[first], price[first]
+
+        n_skus = len(self.sku_index)
+        indptr = np.zeros(n_skus + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sku, minlength=n_skus), out=indptr[1:])
+
+        keys = sorted(self.sku_index, key=self.sku_index.get)
+        return RegionPriceMatrix(
+            providers=np.array([provider for provider, _ in keys], dtype=object),
+            sku_ids=np.array([sku_id for _, sku_id in keys], dtype=object),
+            categories=np.array(self.sku_category, dtype=object),
+            names=np.array(self.sku_name, dtype=object),
+            shapes=np.frombuffer(self.sku_shape, dtype=np.float64).reshape(-1, 3).copy() if n_skus else np.zeros((0, 3)),
+            regions=np.array(sorted(self.region_index, key=self.region_index.get), dtype=object),
+            indptr=indptr,
+            region_codes=region.astype(np.int16 if len(self.region_index) < 2 ** 15 else np.int32),
+            prices=price.astype(np.float32),
+        )
+
+
+class RegionPriceMatrix:
+    """
+    Row i holds SKU i's prices in indptr[i]:indptr[i+1] of region_codes/prices.
+    Monthly prices are stored as float32; one entry costs 6 bytes.
+    """
+
+    def __init__(self, providers: np.ndarray, sku_ids: np.ndarray, categories: np.ndarray,
+                 names: np.ndarray, shapes: np.ndarray, regions: np.ndarray,
+                 indptr: np.ndarray, region_codes: np.ndarray, prices: np.ndarray):
+        self.providers = providers
+        self.sku_ids = sku_ids
+        self.categories = categories
+        self.names = names
+        self.shapes = shapes              # (skus, 3): vcpu, ram_gb, gpu (NaN if unknown)
+        self.regions = regions
+        self.indptr = indptr
+        self.region_codes = region_codes
+        self.prices = prices
+        self._lookup = {(p, s): i for i, (p, s) in enumerate(zip(providers, sku_ids))}
+        self._rows: Optional[np.ndarray] = None
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.sku_ids), len(self.regions)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.prices)
+
+    def _row_of(self) -> np.ndarray:
+        """
+        SKU row of every stored entry
+        """
+        if self._rows is None:
+            self._rows = np.repeat(np.arange(len(self.sku_ids), dtype=np.int32), np.diff(self.indptr))
+        return self._rows
+
+    def dense(self) -> np.ndarray:
+        """
+        (skus, regions) float32 matrix, NaN where a SKU is not offered
+        """
+        matrix = np.full(self.shape, np.nan, dtype=np.float32)
+        matrix[self._row_of(), self.region_codes] = self.prices
+        return matrix
+
+    def sku_prices(self, provider: str, sku_id: str) -> Dict[str, float]:
+        """
+        region -> monthly price for one SKU
+        """
+        row = self._lookup.get((provider, sku_id))
+        if row is None:
+            return {}
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return {self.regions[code]: round(float(price), 4)
+                for code, price in zip(self.region_codes[start:end], self.prices[start:end])}
+
+    def regional_spread(self) -> RegionalSpread:
+        """
+        Min/max/spread and the cheapest and priciest region of every SKU,
+        computed with segment reductions over the CSR rows
+        """
+        counts = np.diff(self.indptr)
+        offered = counts > 0
+        starts = self.indptr[:-1][offered]
+
+        min_price = np.full(len(counts), np.nan, dtype=np.float32)
+        max_price = np.full(len(counts), np.nan, dtype=np.float32)
+        cheapest = np.full(len(counts), -1, dtype=np.int32)
+        priciest = np.full(len(counts), -1, dtype=np.int32)
+
+        if len(starts):
+            min_price[offered] = np.minimum.reduceat(self.prices, starts)
+            max_price[offered] = np.maximum.reduceat(self.prices, starts)
+            # Region of each row's extreme price (lowest region code on ties)
+            rows = self._row_of()
+            is_min = self.prices == min_price[rows]
+            is_max = self.prices == max_price[rows]
+            cheapest[offered] = np.iinfo(np.int32).max
+            priciest[offered] = np.iinfo(np.int32).max
+            np.minimum.at(cheapest, rows[is_min], self.region_codes[is_min])
+            np.minimum.at(priciest, rows[is_max], self.region_codes[is_max])
+
+        spread = max_price - min_price
+        with np.errstate(invalid='ignore', divide='ignore'):
+            spread_pct = np.where(min_price > 0, 100 * spread / min_price, 0.0)
+        return RegionalSpread(min_price, max_price, spread, spread_pct, cheapest, priciest, counts)
+
+    def matching_skus(self, shape: InstanceShape, category: str = 'compute',
+                      provider: Optional[str] = None, tolerance: float = 0.0) -> np.ndarray:
+        """
+        Rows whose (vCPU, memory) are within `tolerance` (relative) of `shape`
+        and whose GPU count matches
+        """
+        mask = self.categories == category
+        if provider is not None:
+            mask &= self.providers == provider
+        with np.errstate(invalid='ignore'):
+            mask &= np.abs(self.shapes[:, 0] - shape.vcpu) <= tolerance * shape.vcpu
+            mask &= np.abs(self.shapes[:, 1] - shape.ram_gb) <= tolerance * shape.ram_gb
+        mask &= self.shapes[:, 2] == (shape.gpu or 0)
+        return np.flatnonzero(mask)
+
+    def cheapest_region(self, shape: InstanceShape, category: str = 'compute',
+                        provider: Optional[str] = None, tolerance: float = 0.0) -> Optional[Dict]:
+        """
+        Cheapest (SKU, region) offering `shape`, over every matching SKU
+        """
+        rows = self.matching_skus(shape, category, provider, tolerance)
+        if not len(rows):
+            return None
+
+        selected = np.zeros(len(self.sku_ids), dtype=bool)
+        selected[rows] = True
+        entries = np.flatnonzero(selected[self._row_of()])
+        if not len(entries):
+            return None
+        best = entries[np.argmin(self.prices[entries])]
+        row = int(np.searchsorted(self.indptr, best, side='right') - 1)
+        return {
+            'provider': self.providers[row],
+            'id': self.sku_ids[row],
+            'name': self.names[row],
+            'region': self.regions[self.region_codes[best]],
+            'price': round(float(self.prices[best]), 4),
+        }
+
+    def cheapest_region_by_provider(self, shape: InstanceShape, category: str = 'compute',
+                                    tolerance: float = 0.0) -> Dict[str, Dict]:
+        return {
+            provider: match
+            for provider in sorted(set(self.providers))
+            for match in [self.cheapest_region(shape, category, provider, tolerance)]
+            if match
+        }
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path, providers=self.providers.astype(str), sku_ids=self.sku_ids.astype(str),
+            categories=self.categories.astype(str), names=self.names.astype(str),
+            shapes=self.shapes, regions=self.regions.astype(str), indptr=self.indptr,
+            region_codes=self.region_codes, prices=self.prices,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'RegionPriceMatrix':
+        with np.load(path) as data:
+            return cls(**{
+                name: data[name].astype(object) if data[name].dtype.kind == 'U' else data[name]
+                for name in data.files
+            })
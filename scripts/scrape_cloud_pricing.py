@@ -5,19 +5,49 @@ Scrapes pricing information from AWS, Azure, and GCP pricing pages
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
 import time
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 import re
 
+from async_refresh import AsyncPricingRefresh, RefreshJob
+from aws_offers import AwsOfferStreamParser, iter_offer_records_parallel
+from azure_retail import AzureRetailPricesFetcher
+from columnar import have_pyarrow, write_catalog
+from partitions import write_partitions
+from js_modules import render_catalog_module, write_module_file
+from downloads import DEFAULT_DOWNLOAD_DIR, DownloadManager
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, install_cache
+from rate_limit import RequestScheduler, install_scheduler
+
 class CloudPricingScraper:
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 download_dir: str = DEFAULT_DOWNLOAD_DIR, parallel_ranges: int = 4,
+                 scheduler: Optional[RequestScheduler] = None):
+        """
+        cache_dir: directory for the revalidating HTTP cache (None disables it)
+        cache_max_bytes: compressed byte budget for the HTTP cache
+        download_dir: where large offer files are downloaded and resumed
+        parallel_ranges: byte ranges fetched concurrently per large download
+        scheduler: per-host rate limiter/retry policy (a default one is created)
+        """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.cache = install_cache(self.session, cache_dir, cache_max_bytes) if cache_dir else None
+        self.scheduler = install_scheduler(self.session, scheduler)
+        # Created on the first download, so runs that never download leave no download_dir behind
+        self.download_dir = download_dir
+        self.parallel_ranges = parallel_ranges
+        self._downloads: Optional[DownloadManager] = None
+
+    @property
+    def downloads(self) -> DownloadManager:
+        if self._downloads is None:
+            self._downloads = DownloadManager(self.session, self.download_dir, parallel_ranges=self.parallel_ranges)
+        return self._downloads
 
     def scrape_aws_pricing(self) -> Dict:
         """
@@ -119,26 +149,66 @@ class CloudPricingScraper:
     def scrape_aws_api(self, service_code: str = 'AmazonEC2') -> Dict:
         """
         Use AWS Price List API (requires no auth for bulk downloads)
+        The offer file is downloaded to disk first (resumable, verified)
         """
         try:
-            # AWS publishes pricing as JSON files
-            url = f"https://pricing.us-east-1.amazonaws.com/offers/v1.0/aws/{service_code}/current/index.json"
+            path = self.download_aws_offer(service_code)
 
-            print(f"Fetching AWS {service_code} pricing from API...")
-            response = self.session.get(url, timeout=30)
-
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ Successfully fetched {service_code} pricing data")
-                return data
-            else:
-                print(f"✗ Failed to fetch: {response.status_code}")
-                return {}
+            with open(path, 'r') as f:
+                data = json.load(f)
+            print(f"✓ Successfully fetched {service_code} pricing data")
+            return data
 
         except Exception as e:
             print(f"✗ Error with AWS API: {e}")
             return {}
 
+    def download_aws_offer(self, service_code: str = 'AmazonEC2') -> str:
+        """
+        Download an AWS offer file with resumable, parallel Range requests.
+        Returns the local path, which stream_aws_api(source=...) can parse.
+        """
+        # AWS publishes pricing as JSON files
+        url = f"https://pricing.us-east-1.amazonaws.com/offers/v1.0/aws/{service_code}/current/index.json"
+
+        print(f"Fetching AWS {service_code} pricing from API...")
+        return self.downloads.download(url, f"{service_code}.json")
+
+    def stream_aws_api(self, service_code: str = 'AmazonEC2', regions: Optional[List[str]] = None,
+                       source: Optional[str] = None, parse_workers: int = 1) -> Iterator[Dict]:
+        """
+        Stream normalized service records out of an AWS offer file.
+        Unlike scrape_aws_api this never holds the whole document: records are
+        yielded while the download is still in progress. Pass `source` to
+        parse an offer file already on disk instead of downloading it, and
+        parse_workers > 1 to split that file across a process pool.
+        """
+        parser = AwsOfferStreamParser(service_code, regions)
+
+        if source is not None and parse_workers > 1:
+            print(f"Parsing AWS {service_code} pricing from {source} with {parse_workers} workers...")
+            yield from iter_offer_records_parallel(source, service_code, regions, workers=parse_workers)
+            return
+
+        if source is not None:
+            print(f"Streaming AWS {service_code} pricing from {source}...")
+            yield from parser.iter_records(source)
+            return
+
+        url = f"https://pricing.us-east-1.amazonaws.com/offers/v1.0/aws/{service_code}/current/index.json"
+
+        print(f"Streaming AWS {service_code} pricing from API...")
+        with self.session.get(url, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                print(f"✗ Failed to fetch: {response.status_code}")
+                return
+            count = 0
+            for record in parser.iter_records(response.iter_content(chunk_size=1 << 16)):
+                count += 1
+                yield record
+
+        print(f"✓ Streamed {count} {service_code} records")
+
     def scrape_azure_pricing(self) -> Dict:
         """
         Scrape Azure pricing
@@ -149,37 +219,11 @@ class CloudPricingScraper:
         services = {}
 
         try:
-            # Azure Retail Prices API
-            url = "https://prices.azure.com/api/retail/prices"
-            params = {
-                '$filter': "serviceName eq 'Virtual Machines' and armRegionName eq 'eastus' and priceType eq 'Consumption'",
-                'api-version': '2023-01-01-preview'
-            }
+            # Azure Retail Prices API, every page of the eastus VM catalog
+            fetcher = AzureRetailPricesFetcher(self.session)
+            services, count = fetcher.fetch(['Virtual Machines'], ['eastus'])
 
-            response = self.session.get(url, params=params, timeout=30)
-
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get('Items', [])
-
-                services['compute'] = []
-                for item in items[:5]:  # Get first 5 VM sizes
-                    if item.get('type') == 'Consumption':
-                        monthly_cost = item.get('retailPrice', 0) * 730  # hours per month
-                        services['compute'].append({
-                            'id': f"azure-{item.get('armSkuName', '').lower()}",
-                            'name': item.get('armSkuName', 'Unknown'),
-                            'baseCost': round(monthly_cost, 2),
-                            'category': 'compute',
-                            'specs': item.get('skuName', ''),
-                            'description': f"Azure VM - {item.get('productName', '')}",
-                            'source': 'Azure Retail Prices API',
-                            'region': item.get('armRegionName', 'eastus')
-                        })
-
-                print(f"✓ Azure: Found {len(services.get('compute', []))} services")
-            else:
-                print(f"✗ Azure API returned: {response.status_code}")
+            print(f"✓ Azure: Found {count} services across {fetcher.pages_fetched} pages")
 
         except Exception as e:
             print(f"✗ Error scraping Azure: {e}")
@@ -243,6 +287,8 @@ class CloudPricingScraper:
             response = self.session.get(url, timeout=30)
 
             if response.status_code == 200:
+                # Only this scraper parses HTML; keep bs4 off the import path of the others
+                from bs4 import BeautifulSoup
                 soup = BeautifulSoup(response.text, 'html.parser')
 
                 # Manual pricing (as of current knowledge)
@@ -294,20 +340,36 @@ class CloudPricingScraper:
         print("Cloud Pricing Scraper")
         print("="*60 + "\n")
 
-        # Scrape each provider
+        # Scrape each provider (self.scheduler paces requests per host)
         all_pricing['AWS'] = self.scrape_aws_pricing()
-        time.sleep(1)  # Be polite, add delay between requests
-
         all_pricing['Azure'] = self.scrape_azure_pricing()
-        time.sleep(1)
-
         all_pricing['GCP'] = self.scrape_gcp_pricing()
-        time.sleep(1)
-
         all_pricing['RunPod'] = self.scrape_runpod_pricing()
 
         return all_pricing
 
+    def scrape_all_async(self, deadline: float = 300.0, per_host_limit: int = 4) -> Dict:
+        """
+        Scrape all cloud providers concurrently, returning the same
+        structure as scrape_all within `deadline` seconds
+        """
+        print("\n" + "="*60)
+        print("Cloud Pricing Scraper (concurrent)")
+        print("="*60 + "\n")
+
+        jobs = [
+            RefreshJob('AWS', 'pricing.us-east-1.amazonaws.com', 'AWS', self.scrape_aws_pricing),
+            RefreshJob('Azure', 'prices.azure.com', 'Azure', self.scrape_azure_pricing),
+            RefreshJob('GCP', 'cloudpricingcalculator.appspot.com', 'GCP', self.scrape_gcp_pricing),
+            RefreshJob('RunPod', 'www.runpod.io', 'RunPod', self.scrape_runpod_pricing),
+        ]
+
+        engine = AsyncPricingRefresh(per_host_limit=per_host_limit, deadline=deadline)
+        all_pricing = engine.run(jobs)
+        all_pricing['timestamp'] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        return all_pricing
+
     def save_to_json(self, data: Dict, filename: str = 'cloud_pricing.json'):
         """
         Save pricing data to JSON file
@@ -319,58 +381,61 @@ class CloudPricingScraper:
         except Exception as e:
             print(f"\n✗ Error saving to file: {e}")
 
-    def convert_to_app_format(self, data: Dict) -> str:
+    def save_to_parquet(self, data: Dict, path: str = 'cloud_pricing.parquet'):
         """
-        Convert scraped data to the format used in cloudServices.js
+        Save pricing data as a Parquet dataset partitioned by provider
+        and category (requires pyarrow)
         """
-        output = "// Auto-generated pricing data\n"
-        output += f"// Last updated: {data.get('timestamp', 'Unknown')}\n\n"
-        output += "export const cloudServices = {\n"
-
-        for provider, services in data.items():
-            if provider == 'timestamp':
-                continue
-
-            output += f"  {provider}: {{\n"
+        try:
+            rows = write_catalog(data, path)
+            print(f"✓ {rows} rows saved to {path}/")
+        except Exception as e:
+            print(f"✗ Error saving Parquet: {e}")
 
-            for category, items in services.items():
-                output += f"    {category}: [\n"
-                for item in items:
-                    output += "      {\n"
-                    output += f"        id: '{item['id']}',\n"
-                    output += f"        name: '{item['name']}',\n"
-                    output += f"        baseCost: {item['baseCost']},\n"
-                    output += f"        category: '{item['category']}',\n"
-                    output += f"        specs: '{item['specs']}',\n"
-                    output += f"        description: '{item['description']}'\n"
-                    output += "      },\n"
-                output += "    ],\n"
+    def save_partitioned(self, data: Dict, root: str = 'cloud_pricing'):
+        """
+        Save pricing data as a manifest plus one JSON file per
+        provider/category
+        """
+        try:
+            manifest = write_partitions(data, root)
+            print(f"✓ {len(manifest['partitions'])} partitions saved to {root}/")
+        except Exception as e:
+            print(f"✗ Error saving partitions: {e}")
 
-            output += "  },\n"
+    def convert_to_app_format(self, data: Dict) -> str:
+        """
+        Convert scraped data to the format used in cloudServices.js
+        """
+        return render_catalog_module(data, self._app_header(data))
 
-        output += "};\n"
+    def _app_header(self, data: Dict) -> List[str]:
+        return ["Auto-generated pricing data", f"Last updated: {data.get('timestamp', 'Unknown')}"]
 
-        return output
+    def save_app_format(self, data: Dict, filename: str = 'cloudServices_generated.js') -> int:
+        """
+        Stream the app-format module straight to `filename`
+        """
+        return write_module_file(data, filename, self._app_header(data))
 
 
 def main():
     """
     Main function
     """
-    scraper = CloudPricingScraper()
+    scraper = CloudPricingScraper(cache_dir=DEFAULT_CACHE_DIR)
 
     # Scrape all providers
     pricing_data = scraper.scrape_all()
 
     # Save raw JSON
     scraper.save_to_json(pricing_data, 'scraped_pricing.json')
+    scraper.save_partitioned(pricing_data, 'scraped_pricing')
+    if have_pyarrow():
+        scraper.save_to_parquet(pricing_data, 'scraped_pricing.parquet')
 
     # Convert to app format
-    app_format = scraper.convert_to_app_format(pricing_data)
-
-    with open('cloudServices_generated.js', 'w') as f:
-        f.write(app_format)
-
+    scraper.save_app_format(pricing_data, 'cloudServices_generated.js')
     print("✓ App format saved to cloudServices_generated.js")
 
     # Print summary
@@ -387,6 +452,9 @@ def main():
         print(f"{provider}: {count} services")
 
     print(f"\nTotal: {total_services} services scraped")
+
+    for host, counts in scraper.scheduler.stats().items():
+        print(f"{host}: {counts.get('requests', 0):.0f} requests, {counts.get('retries', 0):.0f} retries")
     print("="*60 + "\n")
 
 
@@ -7,17 +7,55 @@ Uses official pricing APIs (most reliable method)
 import requests
 import json
 import time
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import datetime
+from functools import partial
+
+from async_refresh import AsyncPricingRefresh, RefreshJob
+from aws_offers import AwsRegionalOfferFetcher
+from azure_retail import AzureRetailPricesFetcher, build_filter
+from columnar import have_pyarrow, write_catalog
+from partitions import DEFAULT_PARTITION_DIR, write_partitions
+from js_modules import write_module_file, write_sharded_modules
+from gcp_pricelist import GCP_PRICELIST_URL, iter_vm_records
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, install_cache
+from rate_limit import RequestScheduler, install_scheduler
+
+if TYPE_CHECKING:
+    from region_matrix import RegionPriceMatrix
 
 
 class CloudPricingAPI:
-    def __init__(self):
+    def __init__(self, aws_services: Optional[List[str]] = ('AmazonEC2', 'AmazonRDS'),
+                 aws_regions: Optional[List[str]] = ('us-east-1',),
+                 azure_services: Optional[List[str]] = None,
+                 azure_regions: Optional[List[str]] = ('eastus',),
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 scheduler: Optional[RequestScheduler] = None, aws_parse_workers: int = 1):
+        """
+        aws_services: AWS offer codes to download per region (empty keeps the curated list only)
+        aws_regions: AWS regions to download, or None for every region
+        azure_services: Retail Prices `serviceName`s to fetch (default: Virtual Machines)
+        azure_regions: ARM regions to fetch, or None for every region
+        cache_dir: directory for the revalidating HTTP cache (None disables it)
+        cache_max_bytes: compressed byte budget for the HTTP cache
+        scheduler: per-host rate limiter/retry policy (a default one is created)
+        aws_parse_workers: processes used to parse each AWS offer file (1 streams it instead)
+        """
+        self.aws_services = list(aws_services or [])
+        # (service_code, region) -> offer version metadata of the last fetch
+        self.aws_versions: Dict = {}
+        self.aws_regions = list(aws_regions) if aws_regions else None
+        self.aws_parse_workers = aws_parse_workers
+        self.azure_services = list(azure_services or ['Virtual Machines'])
+        self.azure_regions = list(azure_regions) if azure_regions else None
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json'
         })
+        self.cache = install_cache(self.session, cache_dir, cache_max_bytes) if cache_dir else None
+        self.scheduler = install_scheduler(self.session, scheduler)
 
     def fetch_aws_pricing(self) -> Dict:
         """
@@ -46,8 +84,7 @@ class CloudPricingAPI:
             if response.status_code == 200:
                 print("✓ Retrieved AWS service index")
 
-                # For demo, let's manually add known EC2 pricing
-                # In production, you'd parse the full JSON files
+                # Curated baseline, replaced below by the regional offer files
                 services['compute'] = [
                     {
                         'id': 'ec2-t3-nano',
@@ -153,6 +190,14 @@ class CloudPricingAPI:
                     }
                 ]
 
+                # Only download the offer files for the regions we price
+                if self.aws_services:
+                    live = self.fetch_aws_regional(self.aws_services, self.aws_regions, response.json())
+                    for category, records in live.items():
+                        live_ids = {record['id'] for record in records}
+                        curated = [s for s in services.get(category, []) if s['id'] not in live_ids]
+                        services[category] = curated + records
+
                 total = sum(len(v) for v in services.values())
                 print(f"✓ AWS: {total} services")
 
@@ -161,6 +206,20 @@ class CloudPricingAPI:
 
         return services
 
+    def fetch_aws_regional(self, service_codes: List[str], regions: Optional[List[str]],
+                           index: Optional[Dict] = None) -> Dict:
+        """
+        Fetch the per-region offer files for the given services,
+        following currentRegionIndexUrl from the AWS offer index
+        """
+        fetcher = AwsRegionalOfferFetcher(self.session, parse_workers=self.aws_parse_workers)
+        catalog, count = fetcher.fetch(service_codes, regions, index)
+        self.aws_versions.update(fetcher.versions)
+
+        print(f"✓ AWS: {count} SKUs from regional offers "
+              f"({fetcher.bytes_downloaded / 1024 ** 2:.1f} MB downloaded)")
+        return catalog
+
     def fetch_azure_pricing(self) -> Dict:
         """
         Fetch Azure pricing using Retail Prices API
@@ -176,47 +235,37 @@ class CloudPricingAPI:
         }
 
         try:
-            base_url = "https://prices.azure.com/api/retail/prices"
+            # Walk every page of every configured service/region
+            retail = self.fetch_azure_retail(self.azure_services, self.azure_regions)
 
-            # Fetch Virtual Machine pricing
-            params = {
-                '$filter': "serviceName eq 'Virtual Machines' and armRegionName eq 'eastus' and priceType eq 'Consumption'",
-                'api-version': '2023-01-01-preview'
-            }
+            for source in (retail, self.azure_manual_services()):
+                for category, records in source.items():
+                    services.setdefault(category, []).extend(records)
+
+            total = sum(len(v) for v in services.values())
+            print(f"✓ Azure: {total} services total")
+
+        except Exception as e:
+            print(f"✗ Error fetching Azure pricing: {e}")
 
-            response = self.session.get(base_url, params=params, timeout=30)
+        return services
 
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get('Items', [])
-
-                # Parse VMs
-                vm_count = 0
-                for item in items:
-                    if vm_count >= 5:  # Limit to 5 VMs
-                        break
-
-                    if item.get('type') == 'Consumption':
-                        sku_name = item.get('armSkuName', '')
-                        retail_price = item.get('retailPrice', 0)
-                        monthly_cost = round(retail_price * 730, 2)  # Hours per month
-
-                        if monthly_cost > 0:
-                            services['compute'].append({
-                                'id': f"azure-{sku_name.lower().replace('_', '-')}",
-                                'name': sku_name,
-                                'baseCost': monthly_cost,
-                                'category': 'compute',
-                                'specs': item.get('skuName', ''),
-                                'description': item.get('productName', 'Azure VM'),
-                                'pricing_url': 'https://azure.microsoft.com/en-us/pricing/details/virtual-machines/'
-                            })
-                            vm_count += 1
-
-                print(f"✓ Azure: {len(services['compute'])} VMs fetched")
-
-            # Add other Azure services manually
-            services['serverless'].append({
+    def fetch_azure_retail(self, services: List[str], regions: Optional[List[str]]) -> Dict:
+        """
+        Fetch every Retail Prices page for the given services and regions
+        """
+        fetcher = AzureRetailPricesFetcher(self.session)
+        catalog, count = fetcher.fetch(services, regions)
+
+        print(f"✓ Azure: {count} SKUs fetched from {fetcher.pages_fetched} pages")
+        return catalog
+
+    def azure_manual_services(self) -> Dict:
+        """
+        Azure services priced by hand (not yet parsed from the Retail Prices API)
+        """
+        return {
+            'serverless': [{
                 'id': 'azure-functions',
                 'name': 'Azure Functions',
                 'baseCost': 8.00,
@@ -224,9 +273,8 @@ class CloudPricingAPI:
                 'specs': '1M executions',
                 'description': 'Serverless compute',
                 'pricing_url': 'https://azure.microsoft.com/en-us/pricing/details/functions/'
-            })
-
-            services['storage'].append({
+            }],
+            'storage': [{
                 'id': 'azure-blob-storage',
                 'name': 'Blob Storage',
                 'baseCost': 18.00,
@@ -234,9 +282,8 @@ class CloudPricingAPI:
                 'specs': '1TB',
                 'description': 'Object storage',
                 'pricing_url': 'https://azure.microsoft.com/en-us/pricing/details/storage/blobs/'
-            })
-
-            services['database'].append({
+            }],
+            'database': [{
                 'id': 'azure-cosmos-db',
                 'name': 'Cosmos DB',
                 'baseCost': 24.00,
@@ -244,15 +291,8 @@ class CloudPricingAPI:
                 'specs': '400 RU/s',
                 'description': 'NoSQL database',
                 'pricing_url': 'https://azure.microsoft.com/en-us/pricing/details/cosmos-db/'
-            })
-
-            total = sum(len(v) for v in services.values())
-            print(f"✓ Azure: {total} services total")
-
-        except Exception as e:
-            print(f"✗ Error fetching Azure pricing: {e}")
-
-        return services
+            }]
+        }
 
     def fetch_gcp_pricing(self) -> Dict:
         """
@@ -352,74 +392,164 @@ class CloudPricingAPI:
             'GCP': {}
         }
 
+        # Pacing is per host in self.scheduler, so no sleeps between providers
         pricing['AWS'] = self.fetch_aws_pricing()
-        time.sleep(1)
-
         pricing['Azure'] = self.fetch_azure_pricing()
-        time.sleep(1)
-
         pricing['GCP'] = self.fetch_gcp_pricing()
 
         return pricing
 
-    def save_to_json(self, data: Dict, filename: str = 'cloud_pricing_api.json'):
+    def fetch_region_matrix(self) -> 'RegionPriceMatrix':
         """
-        Save to JSON file
+        Fetch every region of the configured AWS and Azure services plus
+        GCP machine types, streaming records straight into a SKU x region
+        price matrix instead of building a catalog
         """
+        from region_matrix import RegionMatrixBuilder  # numpy is only needed here
+
+        print("\n🌍 Fetching prices in every region...")
+        builder = RegionMatrixBuilder()
+
+        if self.aws_services:
+            fetcher = AwsRegionalOfferFetcher(self.session, parse_workers=self.aws_parse_workers)
+            for _, _, records in fetcher.iter_slices(fetcher.region_offer_urls(self.aws_services, None)):
+                builder.add_records('AWS', records)
+            self.aws_versions.update(fetcher.versions)
+
+        retail = AzureRetailPricesFetcher(self.session)
+        count = builder.add_records('Azure', retail.iter_records(
+            [build_filter(service) for service in self.azure_services]
+        ))
+        print(f"✓ Azure: {count} SKU/region prices from {retail.pages_fetched} pages")
+
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
-            print(f"\n✅ Saved to {filename}")
+            response = self.session.get(GCP_PRICELIST_URL, timeout=30)
+            response.raise_for_status()
+            count = builder.add_records('GCP', iter_vm_records(response.json()))
+            print(f"✓ GCP: {count} machine type/region prices")
         except Exception as e:
-            print(f"\n❌ Error saving: {e}")
+            print(f"✗ Error fetching GCP pricelist: {e}")
 
-    def generate_js_file(self, data: Dict, filename: str = 'cloudServices_updated.js'):
+        matrix = builder.build()
+        print(f"✓ Region matrix: {matrix.shape[0]} SKUs x {matrix.shape[1]} regions, {matrix.nnz} prices")
+        return matrix
+
+    def refresh_jobs(self) -> List[RefreshJob]:
         """
-        Generate JavaScript file compatible with the app
+        Split a full refresh into independent jobs, one per Azure
+        service/region slice so large catalogs are fetched side by side
         """
-        try:
-            output = []
-            output.append("// Auto-generated cloud service pricing")
-            output.append(f"// Generated: {data['metadata']['timestamp']}")
-            output.append(f"// Source: {data['metadata']['source']}")
-            output.append("")
-            output.append("export const cloudServices = {")
+        jobs = [RefreshJob('AWS', 'pricing.us-east-1.amazonaws.com', 'AWS', self.fetch_aws_pricing)]
 
-            for provider in ['AWS', 'Azure', 'GCP']:
-                if provider not in data:
-                    continue
+        for service in self.azure_services:
+            for region in (self.azure_regions or [None]):
+                jobs.append(RefreshJob(
+                    'Azure', 'prices.azure.com', f"Azure {service} {region or 'all regions'}",
+                    partial(self.fetch_azure_retail, [service], [region] if region else None)
+                ))
 
-                output.append(f"  {provider}: {{")
+        jobs.append(RefreshJob('Azure', 'local', 'Azure manual', self.azure_manual_services))
+        jobs.append(RefreshJob('GCP', 'cloudpricingcalculator.appspot.com', 'GCP', self.fetch_gcp_pricing))
 
-                for category, services in data[provider].items():
-                    output.append(f"    {category}: [")
+        return jobs
 
-                    for service in services:
-                        output.append("      {")
-                        output.append(f"        id: '{service['id']}',")
-                        output.append(f"        name: '{service['name']}',")
-                        output.append(f"        baseCost: {service['baseCost']},")
-                        output.append(f"        category: '{service['category']}',")
-                        output.append(f"        specs: '{service['specs']}',")
-                        output.append(f"        description: '{service['description']}'")
-                        output.append("      },")
-
-                    output.append("    ],")
+    def fetch_all_pricing_async(self, deadline: float = 300.0, per_host_limit: int = 4) -> Dict:
+        """
+        Fetch pricing from all providers concurrently.
+        Returns the same structure as fetch_all_pricing; anything still
+        running at the deadline is listed under metadata.incomplete.
+        """
+        print("="*60)
+        print("Cloud Pricing API Scraper (concurrent)")
+        print("="*60)
 
-                output.append("  },")
+        started = time.monotonic()
+        engine = AsyncPricingRefresh(per_host_limit=per_host_limit, deadline=deadline)
+        results = engine.run(self.refresh_jobs())
 
-            output.append("};")
+        pricing = {
+            'metadata': {
+                'timestamp': datetime.now().isoformat(),
+                'version': '1.0.0',
+                'source': 'Official Cloud Provider APIs',
+                'refreshSeconds': round(time.monotonic() - started, 2),
+                'incomplete': engine.timed_out + engine.failed
+            },
+            'AWS': results.get('AWS', {}),
+            'Azure': results.get('Azure', {}),
+            'GCP': results.get('GCP', {})
+        }
 
-            content = '\n'.join(output)
+        print(f"\n✓ Refresh finished in {pricing['metadata']['refreshSeconds']}s")
+        return pricing
 
+    def save_to_json(self, data: Dict, filename: str = 'cloud_pricing_api.json'):
+        """
+        Save to JSON file
+        """
+        try:
             with open(filename, 'w') as f:
-                f.write(content)
+                json.dump(data, f, indent=2)
+            print(f"\n✅ Saved to {filename}")
+        except Exception as e:
+            print(f"\n❌ Error saving: {e}")
 
-            print(f"✅ Generated {filename}")
+    def save_to_parquet(self, data: Dict, path: str = 'cloud_pricing_api.parquet'):
+        """
+        Save as a Parquet dataset partitioned by provider and category
+        (requires pyarrow)
+        """
+        try:
+            rows = write_catalog(data, path)
+            print(f"✅ Saved {rows} rows to {path}/")
+        except Exception as e:
+            print(f"❌ Error saving Parquet: {e}")
+
+    def save_partitioned(self, data: Dict, root: str = DEFAULT_PARTITION_DIR):
+        """
+        Save as a manifest plus one JSON file per provider/category,
+        rewriting only the partitions whose content changed
+        """
+        try:
+            manifest = write_partitions(data, root)
+            print(f"✅ Saved {len(manifest['partitions'])} partitions to {root}/ "
+                  f"({manifest['written']} rewritten)")
+        except Exception as e:
+            print(f"❌ Error saving partitions: {e}")
+
+    def generate_js_file(self, data: Dict, filename: str = 'cloudServices_updated.js'):
+        """
+        Generate JavaScript file compatible with the app
+        """
+        try:
+            metadata = data.get('metadata', {})
+            header = [
+                "Auto-generated cloud service pricing",
+                f"Generated: {metadata.get('timestamp', 'Unknown')}",
+                f"Source: {metadata.get('source', 'Unknown')}",
+            ]
+            count = write_module_file(data, filename, header, providers=['AWS', 'Azure', 'GCP'])
+            print(f"✅ Generated {filename} ({count} services)")
 
         except Exception as e:
             print(f"❌ Error generating JS file: {e}")
 
+    def generate_js_modules(self, data: Dict, out_dir: str = 'cloudServices', module_format: str = 'esm'):
+        """
+        Generate one module per provider/category plus an index.js that
+        loads them on demand
+        """
+        try:
+            metadata = data.get('metadata', {})
+            header = [
+                "Auto-generated cloud service pricing",
+                f"Generated: {metadata.get('timestamp', 'Unknown')}",
+            ]
+            files = write_sharded_modules(data, out_dir, header, module_format, providers=['AWS', 'Azure', 'GCP'])
+            print(f"✅ Generated {out_dir}/index.js and {sum(len(c) for c in files.values())} category modules")
+        except Exception as e:
+            print(f"❌ Error generating JS modules: {e}")
+
     def print_summary(self, data: Dict):
         """
         Print summary statistics
@@ -444,13 +574,18 @@ def main():
     """
     Main execution
     """
-    scraper = CloudPricingAPI()
+    scraper = CloudPricingAPI(cache_dir=DEFAULT_CACHE_DIR)
 
     # Fetch all pricing
     pricing_data = scraper.fetch_all_pricing()
 
     # Save to JSON
     scraper.save_to_json(pricing_data)
+    scraper.save_partitioned(pricing_data)
+
+    # Columnar copy for analytics, when pyarrow is installed
+    if have_pyarrow():
+        scraper.save_to_parquet(pricing_data)
 
     # Generate JS file
     scraper.generate_js_file(pricing_data)
@@ -458,8 +593,20 @@ def main():
     # Print summary
     scraper.print_summary(pricing_data)
 
+    for host, counts in scraper.scheduler.stats().items():
+        print(f"🌐 {host}: {counts.get('requests', 0):.0f} requests, {counts.get('retries', 0):.0f} retries, "
+              f"{counts.get('throttled', 0):.0f} throttled, now {counts['rate']} req/s")
+
+    if scraper.cache:
+        stats = scraper.cache.stats()
+        print(f"\n🗄️  HTTP cache: {stats['hits']} not modified, {stats['misses']} downloaded, "
+              f"{stats['bytes'] / 1024 ** 2:.1f} MB on disk")
+
     print("\n✅ Done! Check the generated files:")
     print("   - cloud_pricing_api.json (raw data)")
+    print(f"   - {DEFAULT_PARTITION_DIR}/ (manifest + one file per provider/category)")
+    if have_pyarrow():
+        print("   - cloud_pricing_api.parquet/ (columnar, by provider/category)")
     print("   - cloudServices_updated.js (for your app)")
 
 
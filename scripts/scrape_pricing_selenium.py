@@ -1,25 +1,41 @@
 #!/usr/bin/env python3
 """
 Advanced Cloud Pricing Scraper using Selenium
-For scraping JavaScript-heavy pricing pages
+For scraping JavaScript-heavy pricing pages. Prices are taken from the
+JSON documents the calculators download (Chrome's network log), not from
+the rendered page.
 """
 
+import json
+import os
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
+
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-import json
-import time
-import re
-from typing import Dict, List
+
+from browser_pool import BrowserPool, CalculatorPage
+from calculator_json import AWS_CAPTURE, AZURE_CAPTURE, GCP_CAPTURE, normalize_responses
+
+
+# Each page is done as soon as its pricing document has downloaded
+CALCULATOR_PAGES = {
+    'AWS': CalculatorPage('AWS', 'https://calculator.aws/#/createCalculator/ec2-enhancement',
+                          capture=AWS_CAPTURE, extract=partial(normalize_responses, 'AWS')),
+    'Azure': CalculatorPage('Azure', 'https://azure.microsoft.com/en-us/pricing/calculator/',
+                            capture=AZURE_CAPTURE, extract=partial(normalize_responses, 'Azure')),
+    'GCP': CalculatorPage('GCP', 'https://cloud.google.com/products/calculator-legacy',
+                          capture=GCP_CAPTURE, extract=partial(normalize_responses, 'GCP')),
+}
 
 
 class SeleniumPricingScraper:
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, workers: Optional[int] = None, pages_per_driver: int = 20):
         """
-        Initialize Selenium WebDriver
+        headless: run Chrome without a window
+        workers: browsers run in parallel (default: one per page, at most the CPU count)
+        pages_per_driver: pages a browser loads before it is restarted
         """
         chrome_options = Options()
 
@@ -31,96 +47,69 @@ class SeleniumPricingScraper:
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-
+        # Prices are text: skip images, and let the explicit waits decide when a page is ready
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.page_load_strategy = 'eager'
+        # Network events go to the performance log, where NetworkCapture reads them
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        self.chrome_options = chrome_options
+
+        workers = workers or min(len(CALCULATOR_PAGES), os.cpu_count() or 1)
+        self.pool = BrowserPool(self._start_driver, size=workers, pages_per_driver=pages_per_driver)
+
+    def _start_driver(self):
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 10)
+            driver = webdriver.Chrome(options=self.chrome_options)
             print("✓ Selenium WebDriver initialized")
+            return driver
         except Exception as e:
             print(f"✗ Error initializing Selenium: {e}")
             print("  Make sure ChromeDriver is installed: https://chromedriver.chromium.org/")
             raise
 
+    def scrape_calculators(self, providers: Optional[List[str]] = None,
+                           urls: Optional[Dict[str, str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Scrape the calculators of `providers` (default: all) in parallel.
+        `urls` replaces a provider's page, e.g. with a locally served fixture.
+        """
+        urls = urls or {}
+        pages = [
+            CALCULATOR_PAGES[provider]._replace(url=urls.get(provider, CALCULATOR_PAGES[provider].url))
+            for provider in (providers or CALCULATOR_PAGES)
+        ]
+        print(f"\nScraping {len(pages)} pricing calculators with up to {self.pool.size} browsers...")
+        return self.pool.run(pages)
+
     def scrape_aws_calculator(self) -> List[Dict]:
         """
         Scrape AWS Pricing Calculator
         """
-        print("\nScraping AWS Pricing Calculator...")
-
-        try:
-            url = "https://calculator.aws/#/"
-            self.driver.get(url)
-            time.sleep(3)  # Wait for page load
-
-            # This would require clicking through the calculator
-            # For demo purposes, we'll return sample data
-            services = [
-                {
-                    'name': 'EC2 t3.micro',
-                    'price': 7.30,
-                    'specs': '2 vCPU, 1GB RAM',
-                    'source': 'AWS Calculator'
-                }
-            ]
-
-            print(f"✓ Found {len(services)} AWS services")
-            return services
-
-        except Exception as e:
-            print(f"✗ Error scraping AWS Calculator: {e}")
-            return []
+        return self.scrape_calculators(['AWS']).get('AWS', [])
 
     def scrape_azure_calculator(self) -> List[Dict]:
         """
         Scrape Azure Pricing Calculator
         """
-        print("\nScraping Azure Pricing Calculator...")
-
-        try:
-            url = "https://azure.microsoft.com/en-us/pricing/calculator/"
-            self.driver.get(url)
-            time.sleep(3)
-
-            # Wait for pricing elements to load
-            # This is page-specific and would need to be customized
-
-            services = []
-            print(f"✓ Found {len(services)} Azure services")
-            return services
-
-        except Exception as e:
-            print(f"✗ Error scraping Azure Calculator: {e}")
-            return []
+        return self.scrape_calculators(['Azure']).get('Azure', [])
 
     def scrape_gcp_calculator(self) -> List[Dict]:
         """
         Scrape GCP Pricing Calculator
         """
-        print("\nScraping GCP Pricing Calculator...")
-
-        try:
-            url = "https://cloud.google.com/products/calculator"
-            self.driver.get(url)
-            time.sleep(3)
-
-            services = []
-            print(f"✓ Found {len(services)} GCP services")
-            return services
-
-        except Exception as e:
-            print(f"✗ Error scraping GCP Calculator: {e}")
-            return []
+        return self.scrape_calculators(['GCP']).get('GCP', [])
 
     def close(self):
         """
-        Close the browser
+        Close the browsers
         """
-        if self.driver:
-            self.driver.quit()
-            print("\n✓ Browser closed")
+        self.pool.close()
+        print(f"\n✓ Browsers closed ({self.pool.drivers_started} started, {self.pool.pages_loaded} pages)")
 
 
-def main():
+def main(headless: bool = True, workers: Optional[int] = None, pages_per_driver: int = 20,
+         output: str = 'calculator_pricing.json'):
     """
     Main function
     """
@@ -129,14 +118,29 @@ def main():
     print("="*60)
 
     try:
-        scraper = SeleniumPricingScraper(headless=True)
+        scraper = SeleniumPricingScraper(headless=headless, workers=workers,
+                                         pages_per_driver=pages_per_driver)
 
         # Scrape providers
-        aws_data = scraper.scrape_aws_calculator()
-        # azure_data = scraper.scrape_azure_calculator()
-        # gcp_data = scraper.scrape_gcp_calculator()
-
-        scraper.close()
+        try:
+            results = scraper.scrape_calculators()
+        finally:
+            scraper.close()
+
+        for provider in CALCULATOR_PAGES:
+            if provider in results:
+                print(f"{provider}: {len(results[provider])} services")
+            else:
+                print(f"{provider}: failed ({scraper.pool.errors.get(provider)})")
+
+        # Same layout as the API scrapers' snapshots
+        pricing = {
+            'metadata': {'timestamp': datetime.now().isoformat(), 'source': 'Pricing calculators'},
+            **{provider: {'compute': services} for provider, services in results.items()},
+        }
+        with open(output, 'w') as f:
+            json.dump(pricing, f, indent=2)
+        print(f"\n✓ Pricing data saved to {output}")
 
     except Exception as e:
         print(f"\n✗ Fatal error: {e}")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Server Catalog Build
+Builds the catalog module the server's ArchitectureEvaluator reads: every
+service carries its monthly cost and pricing model, precomputed with the
+evaluator's usage assumptions, and is indexed by id per provider
+"""
+
+import json
+import os
+import subprocess
+from typing import Dict, List, NamedTuple, Optional
+
+from columnar import iter_partitions
+from js_modules import js_key, js_literal
+
+
+HOURS_PER_MONTH = 730
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server')
+DEFAULT_BASE_CATALOG = os.path.join(SERVER_DIR, 'data', 'cloudServices.js')
+DEFAULT_SERVER_CATALOG = os.path.join(SERVER_DIR, 'data', 'serviceCatalog.js')
+
+SERVER_FIELDS = ('id', 'name', 'cost', 'category', 'specs', 'description')
+
+
+class PricingModel(NamedTuple):
+    """
+    How a unit `cost` becomes a monthly cost: cost * usage
+    """
+    model: str        # hourly, per_gb, per_request, per_image, flat, free
+    usage: float      # assumed monthly usage
+    unit: str
+
+
+HOURLY = PricingModel('hourly', HOURS_PER_MONTH, 'hours')
+FLAT = PricingModel('flat', 1, 'month')
+FREE = PricingModel('free', 0, 'month')
+
+
+def pricing_model(service: Dict) -> PricingModel:
+    """
+    The usage assumptions of ArchitectureEvaluator.calculateCost, keyed on
+    the service's own category (not the group it is listed under)
+    """
+    category = service.get('category')
+    service_id = service.get('id') or ''
+    specs = service.get('specs') or ''
+
+    if category in ('compute', 'cache'):
+        return HOURLY
+    if category == 'storage':
+        return PricingModel('per_gb', 10, 'GB')
+    if category == 'serverless':
+        return PricingModel('per_request', 1_000_000, 'requests')
+    if category == 'messaging':
+        return PricingModel('per_request', 1_000_000, 'messages')
+    if category == 'database':
+        # DynamoDB is already priced per month of writes
+        return FLAT if 'dynamodb' in service_id else HOURLY
+    if category == 'networking':
+        if service.get('cost') == 0:
+            return FREE
+        if 'cdn' in service_id or 'cloudfront' in service_id:
+            return PricingModel('per_gb', 100, 'GB')
+        return HOURLY
+    if category == 'ai':
+        if 'Per request' in specs or 'Per 1K' in specs:
+            return PricingModel('per_request', 1_000_000, 'requests')
+        if 'Per image' in specs:
+            return PricingModel('per_image', 10_000, 'images')
+        return HOURLY
+    return FLAT
+
+
+def server_entry(service: Dict) -> Dict:
+    """
+    Server fields plus monthlyCost, pricingModel, usage and usageUnit
+    """
+    entry = {field: service[field] for field in SERVER_FIELDS if field in service}
+    model = pricing_model(entry)
+    entry['monthlyCost'] = entry['cost'] * model.usage if model.usage else 0
+    entry['pricingModel'] = model.model
+    entry['usage'] = model.usage
+    entry['usageUnit'] = model.unit
+    return entry
+
+
+def from_snapshot(data: Dict) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Scraper snapshot (monthly baseCost) -> server layout (unit `cost`).
+    Hourly SKUs keep their hourly price; other SKUs are taken to cost
+    baseCost at the evaluator's assumed usage.
+    """
+    catalog: Dict[str, Dict[str, List[Dict]]] = {}
+    for provider, category, services in iter_partitions(data):
+        for service in services:
+            base_cost = service.get('baseCost')
+            if base_cost is None or not service.get('id'):
+                continue
+            # Uncategorized records take their partition's category, as in CostEngine
+            record = {**service, 'category': service.get('category') or category, 'cost': base_cost}
+            model = pricing_model(record)
+            if model.unit == 'hours' and service.get('hourly') is not None:
+                cost = service['hourly']
+            elif model.usage:
+                cost = base_cost / model.usage
+            else:
+                cost = base_cost
+            catalog.setdefault(provider, {}).setdefault(category, []).append({
+                'id': service['id'],
+                'name': service.get('name') or service['id'],
+                'cost': cost,
+                'category': record['category'],
+                'specs': service.get('specs') or '',
+            })
+    return catalog
+
+
+def read_js_catalog(path: str = DEFAULT_BASE_CATALOG) -> Dict:
+    """
+    Evaluate a CommonJS catalog module (server/data/cloudServices.js) with node
+    """
+    script = "process.stdout.write(JSON.stringify(require(process.argv[1])))"
+    try:
+        result = subprocess.run(['node', '-e', script, os.path.abspath(path)],
+                                capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise RuntimeError("Reading a JS catalog needs node on PATH")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"node could not load {path}: {e.stderr.strip()}")
+    return json.loads(result.stdout)
+
+
+def merge_catalogs(base: Dict, updates: Dict) -> Dict:
+    """
+    Prices from `updates` replace the base entry with the same provider
+    and id; services the base does not have are appended to their group
+    """
+    merged = {provider: {group: [dict(s) for s in services] for group, services in groups.items()}
+              for provider, groups in base.items()}
+    for provider, groups in updates.items():
+        existing = {service['id']: service
+                    for services in merged.get(provider, {}).values() for service in services}
+        for group, services in groups.items():
+            for service in services:
+                if service['id'] in existing:
+                    existing[service['id']]['cost'] = service['cost']
+                else:
+                    merged.setdefault(provider, {}).setdefault(group, []).append(service)
+                    existing[service['id']] = service
+    return merged
+
+
+def write_server_catalog(catalog: Dict, path: str = DEFAULT_SERVER_CATALOG,
+                         sources: Optional[List[str]] = None) -> int:
+    """
+    Write a CommonJS module exporting `serviceIndex` (provider -> id ->
+    service) and `cloudServices` (provider -> group -> [service]) whose
+    arrays reference the index entries. The first service listed under
+    an id wins, as in a category-by-category search. Returns the count.
+    """
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        out.write("// Auto-generated by scripts/server_catalog.py - rebuild instead of editing\n")
+        out.write(f"// Sources: {', '.join(sources or ['unknown'])}\n\n")
+
+        out.write("const serviceIndex = {\n")
+        for provider, groups in catalog.items():
+            out.write(f"  {js_key(provider)}: {{\n")
+            seen = set()
+            for services in groups.values():
+                for service in services:
+                    if service['id'] in seen:
+                        continue
+                    seen.add(service['id'])
+                    fields = ', '.join(f"{js_key(k)}: {js_literal(v)}" for k, v in server_entry(service).items())
+                    out.write(f"    {js_literal(service['id'])}: {{ {fields} }},\n")
+                    count += 1
+            out.write("  },\n")
+        out.write("};\n\n")
+
+        out.write("const S = serviceIndex;\n")
+        out.write("const cloudServices = {\n")
+        for provider, groups in catalog.items():
+            out.write(f"  {js_key(provider)}: {{\n")
+            for group, services in groups.items():
+                refs = ', '.join(f"S[{js_literal(provider)}][{js_literal(s['id'])}]" for s in services)
+                out.write(f"    {js_key(group)}: [{refs}],\n")
+            out.write("  },\n")
+        out.write("};\n\n")
+
+        out.write("module.exports = { cloudServices, serviceIndex };\n")
+    os.replace(tmp_path, path)
+    return count
+
+
+def stale_entries(base_path: str = DEFAULT_BASE_CATALOG, catalog_path: str = DEFAULT_SERVER_CATALOG) -> List[str]:
+    """
+    Differences between the server catalog and the base catalog it should
+    have been built from (missing or extra ids, changed monthlyCost); empty
+    when the catalog is up to date
+    """
+    expected = {}
+    for provider, groups in read_js_catalog(base_path).items():
+        for services in groups.values():
+            for service in services:
+                expected.setdefault((provider, service['id']), server_entry(service)['monthlyCost'])
+    actual = {(provider, service_id): service['monthlyCost']
+              for provider, services in read_js_catalog(catalog_path)['serviceIndex'].items()
+              for service_id, service in services.items()}
+
+    problems = [f"{provider}/{service_id} missing" for provider, service_id in sorted(expected.keys() - actual.keys())]
+    problems += [f"{provider}/{service_id} not in {os.path.basename(base_path)}"
+                 for provider, service_id in sorted(actual.keys() - expected.keys())]
+    for provider, service_id in sorted(expected.keys() & actual.keys()):
+        cost, want = actual[(provider, service_id)], expected[(provider, service_id)]
+        if abs(cost - want) > 1e-9:
+            problems.append(f"{provider}/{service_id} monthlyCost {cost} != {want}")
+    return problems
+
+
+def build_server_catalog(snapshot: Optional[Dict] = None, base_path: str = DEFAULT_BASE_CATALOG,
+                         output: str = DEFAULT_SERVER_CATALOG) -> int:
+    """
+    Base catalog (the hand-curated cloudServices.js), refreshed with
+    snapshot prices when given, written as the server catalog module
+    """
+    catalog = read_js_catalog(base_path)
+    sources = [os.path.basename(base_path)]
+    if snapshot is not None:
+        catalog = merge_catalogs(catalog, from_snapshot(snapshot))
+        sources.append(f"snapshot {(snapshot.get('metadata') or {}).get('timestamp', snapshot.get('timestamp', 'unknown'))}")
+    return write_server_catalog(catalog, output, sources)
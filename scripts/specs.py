@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Instance Spec Parsing
+Turns the free-text `specs` of each provider (and Azure VM size names,
+which are all the Retail Prices API gives us) into numeric vCPU, memory,
+GPU and storage fields
+"""
+
+import re
+from typing import Dict, NamedTuple, Optional
+
+
+_VCPU = re.compile(r'(\d+(?:\.\d+)?)\s*vCPU', re.IGNORECASE)
+_RAM = re.compile(r'(\d+(?:\.\d+)?)\s*(MB|GB|GiB|TB)\s*RAM', re.IGNORECASE)
+_GPU = re.compile(r'(\d+)\s*x?\s*(?:[\w-]+\s+)?GPU', re.IGNORECASE)
+_VRAM = re.compile(r'\d+(?:\.\d+)?\s*GB\s*VRAM', re.IGNORECASE)
+_STORAGE = re.compile(r'(\d+(?:\.\d+)?)\s*(GB|TB)\b(?!\s*(?:V?RAM|transfer|egress))', re.IGNORECASE)
+_AWS_STORAGE = re.compile(r'(\d+)\s*x\s*([\d,]+)')
+
+_TO_GB = {'mb': 1 / 1024, 'gb': 1, 'gib': 1, 'tb': 1024}
+
+# Standard_<family><vCPUs>[-<active vCPUs>]<features>[_<accelerator>][_v<version>]
+_AZURE_SIZE = re.compile(
+    r'^Standard_(?P<family>[A-Z]+)(?P<vcpu>\d+)(?:-(?P<active>\d+))?(?P<features>[a-z]*)'
+    r'(?:_(?P<accelerator>[A-Z]\w*?))?(?:_v(?P<version>\d+))?$'
+)
+
+# GiB of memory per vCPU for the general-purpose Azure families
+_AZURE_GB_PER_VCPU = {'A': 2, 'D': 4, 'DC': 4, 'E': 8, 'EC': 8, 'F': 2, 'L': 8, 'M': 16}
+
+# General-purpose D1-D5 (v1, v2) sizes: size number -> vCPUs, at 3.5 GiB per vCPU
+_AZURE_D_GENERAL_PURPOSE = {1: 1, 2: 2, 3: 4, 4: 8, 5: 16}
+
+# Memory-optimized D11-D15 (v1, v2) sizes: size number -> vCPUs, at 7 GiB per vCPU
+_AZURE_D_MEMORY_OPTIMIZED = {11: 2, 12: 4, 13: 8, 14: 16, 15: 20}
+
+# B-series v1 sizes do not follow a fixed ratio
+_AZURE_B_SERIES = {
+    'B1ls': 0.5, 'B1s': 1, 'B1ms': 2, 'B2s': 4, 'B2ms': 8, 'B4ms': 16,
+    'B8ms': 32, 'B12ms': 48, 'B16ms': 64, 'B20ms': 80,
+}
+
+
+class InstanceShape(NamedTuple):
+    vcpu: Optional[float] = None
+    ram_gb: Optional[float] = None
+    gpu: float = 0.0
+    storage_gb: float = 0.0
+
+    @property
+    def matchable(self) -> bool:
+        return bool(self.vcpu) and bool(self.ram_gb)
+
+    def as_fields(self) -> Dict:
+        return self._asdict()
+
+    def describe(self) -> str:
+        """
+        '4 vCPU, 16GB RAM[, 1 GPU]', the specs format used across the catalog
+        """
+        parts = []
+        if self.vcpu:
+            parts.append(f"{self.vcpu:g} vCPU")
+        if self.ram_gb:
+            parts.append(f"{self.ram_gb:g}GB RAM")
+        if self.gpu:
+            parts.append(f"{self.gpu:g} GPU")
+        return ', '.join(parts)
+
+
+def parse_specs(specs: Optional[str]) -> InstanceShape:
+    """
+    '2 vCPU, 0.5GB RAM' -> InstanceShape(2.0, 0.5, 0, 0).
+    A spec mentioning VRAM but no GPU count is one GPU.
+    """
+    if not specs:
+        return InstanceShape()
+
+    vcpu = _VCPU.search(specs)
+    ram = _RAM.search(specs)
+    gpu = _GPU.search(specs)
+    storage = _STORAGE.search(_RAM.sub('', specs))
+
+    if gpu:
+        gpus = float(gpu.group(1))
+    else:
+        gpus = 1.0 if _VRAM.search(specs) else 0.0
+
+    return InstanceShape(
+        vcpu=float(vcpu.group(1)) if vcpu else None,
+        ram_gb=float(ram.group(1)) * _TO_GB[ram.group(2).lower()] if ram else None,
+        gpu=gpus,
+        storage_gb=float(storage.group(1)) * _TO_GB[storage.group(2).lower()] if storage else 0.0,
+    )
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    match = re.match(r'([\d.,]+)', value or '')
+    return float(match.group(1).replace(',', '')) if match else None
+
+
+def parse_aws_attributes(vcpu: str, memory: str, gpu: str = '', storage: str = '') -> InstanceShape:
+    """
+    Offer-file attributes: vcpu '2', memory '8 GiB', gpu '1', storage '2 x 300 NVMe SSD' or 'EBS only'
+    """
+    local = _AWS_STORAGE.search(storage or '')
+    return InstanceShape(
+        vcpu=_number(vcpu),
+        ram_gb=_number(memory),
+        gpu=_number(gpu) or 0.0,
+        storage_gb=float(local.group(1)) * float(local.group(2).replace(',', '')) if local else 0.0,
+    )
+
+
+def parse_azure_vm_size(arm_sku: str) -> InstanceShape:
+    """
+    Decode an ARM VM size such as Standard_D4s_v5 or Standard_E8-4ds_v5.
+    Memory comes from the family's GiB-per-vCPU ratio, so it is left
+    unknown for families without a fixed ratio (the GPU N-series).
+    """
+    match = _AZURE_SIZE.match(arm_sku or '')
+    if not match:
+        return InstanceShape()
+
+    family = match.group('family')
+    if family == 'DS':
+        # DS1_v2, DS12_v2, ...: the premium-storage D sizes, same shapes
+        family = 'D'
+    features = match.group('features')
+    version = int(match.group('version') or 1)
+    base_vcpu = float(match.group('vcpu'))
+    vcpu = float(match.group('active') or base_vcpu)
+
+    if family == 'B':
+        if version == 1:
+            ram_gb = _AZURE_B_SERIES.get(f"B{match.group('vcpu')}{features}")
+        else:
+            ram_gb = base_vcpu * (0.5 if 't' in features else 2 if 'l' in features else 4)
+    elif family.startswith('N'):
+        return InstanceShape(vcpu=vcpu, gpu=1.0)
+    elif family == 'D' and version < 3 and int(base_vcpu) in _AZURE_D_GENERAL_PURPOSE:
+        vcpu = float(_AZURE_D_GENERAL_PURPOSE[int(base_vcpu)])
+        ram_gb = vcpu * 3.5
+    elif family == 'D' and version < 3 and int(base_vcpu) in _AZURE_D_MEMORY_OPTIMIZED:
+        vcpu = float(_AZURE_D_MEMORY_OPTIMIZED[int(base_vcpu)])
+        ram_gb = vcpu * 7
+    elif family in _AZURE_GB_PER_VCPU:
+        ratio = _AZURE_GB_PER_VCPU[family]
+        if family == 'D' and version < 3:
+            ratio = 3.5
+        elif family in ('A', 'M') and 'm' in features:
+            ratio *= 4 if family == 'A' else 1.75
+        elif family in ('D', 'DC') and 'l' in features:
+            ratio = 2
+        ram_gb = base_vcpu * ratio
+    else:
+        ram_gb = None
+
+    return InstanceShape(vcpu=vcpu, ram_gb=ram_gb, storage_gb=0.0)
+
+
+def service_shape(service: Dict) -> InstanceShape:
+    """
+    Shape of a catalog record: numeric fields set at ingest win,
+    otherwise its specs string is parsed
+    """
+    if service.get('vcpu') is not None or service.get('ram_gb') is not None:
+        return InstanceShape(
+            vcpu=service.get('vcpu'),
+            ram_gb=service.get('ram_gb'),
+            gpu=service.get('gpu') or 0.0,
+            storage_gb=service.get('storage_gb') or 0.0,
+        )
+    return parse_specs(service.get('specs'))
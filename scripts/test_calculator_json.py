@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Calculator JSON Test
+normalize_responses() against trimmed copies of the documents each
+pricing calculator loads (fixtures/calculators/), and NetworkCapture
+against a recorded-style Chrome performance log.
+
+    python -m unittest test_calculator_json     (or python -m pytest)
+"""
+
+import base64
+import json
+import os
+import unittest
+
+from calculator_json import AWS_CAPTURE, normalize_responses
+
+try:
+    from browser_pool import NetworkCapture
+except ImportError:       # selenium is optional outside browser-scrape
+    NetworkCapture = None
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'calculators')
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURE_DIR, name), 'r') as f:
+        return json.load(f)
+
+
+def by_key(records):
+    return {(record['id'], record['region']): record for record in records}
+
+
+class NormalizeResponsesTest(unittest.TestCase):
+
+    def test_aws(self):
+        payload = load_fixture('aws_ec2.json')
+        records = by_key(normalize_responses('AWS', [('ec2-calc/Linux', payload)]))
+
+        # The zero-priced entry is skipped
+        self.assertEqual(set(records), {
+            ('ec2-t3-medium', 'US East (N. Virginia)'), ('ec2-m5d-large', 'US East (N. Virginia)'),
+            ('ec2-g4dn-xlarge', 'US East (N. Virginia)'), ('ec2-t3-medium', 'EU (Ireland)'),
+        })
+        record = records[('ec2-t3-medium', 'US East (N. Virginia)')]
+        self.assertEqual(record['hourly'], 0.0416)
+        self.assertEqual(record['baseCost'], 30.368)
+        self.assertEqual(record['specs'], '2 vCPU, 4GB RAM')
+        self.assertEqual((record['vcpu'], record['ram_gb']), (2.0, 4.0))
+        gpu = records[('ec2-g4dn-xlarge', 'US East (N. Virginia)')]
+        self.assertEqual((gpu['gpu'], gpu['storage_gb']), (1.0, 125.0))
+
+    def test_azure(self):
+        payload = load_fixture('azure_vm.json')
+        records = by_key(normalize_responses('Azure', [('calculator', payload)]))
+
+        # Windows and low-priority offers and zero prices are skipped
+        self.assertEqual(set(records), {
+            ('azure-standard-d2sv5', 'us-east'), ('azure-standard-d2sv5', 'europe-west'),
+            ('azure-standard-nc6sv3', 'us-east'), ('azure-standard-b1s', 'us-east'),
+        })
+        record = records[('azure-standard-d2sv5', 'us-east')]
+        self.assertEqual(record['name'], 'D2SV5')
+        self.assertEqual(record['baseCost'], 70.08)
+        self.assertEqual((record['vcpu'], record['ram_gb']), (2.0, 8.0))
+        self.assertEqual(records[('azure-standard-nc6sv3', 'us-east')]['gpu'], 1.0)
+
+    def test_gcp(self):
+        payload = load_fixture('gcp_pricelist.json')
+        records = by_key(normalize_responses('GCP', [('pricelist.json', payload)]))
+
+        # Preemptible types and the multi-region 'us' price are skipped
+        self.assertEqual(set(records), {
+            ('gcp-e2-medium', 'us-central1'), ('gcp-e2-medium', 'europe-west1'),
+            ('gcp-n2-standard-4', 'us-central1'),
+        })
+        record = records[('gcp-e2-medium', 'us-central1')]
+        self.assertEqual((record['vcpu'], record['ram_gb']), (2.0, 4.0))
+        self.assertEqual(record['baseCost'], 24.4572)
+
+    def test_first_occurrence_wins(self):
+        first = load_fixture('aws_ec2.json')
+        second = load_fixture('aws_ec2.json')
+        second['regions']['US East (N. Virginia)']['t3.medium Linux Shared']['price'] = '9.99'
+        records = normalize_responses('AWS', [('a', first), ('b', second), ('c', ['not', 'a', 'document'])])
+        self.assertEqual(len(records), 4)
+        self.assertEqual(by_key(records)[('ec2-t3-medium', 'US East (N. Virginia)')]['hourly'], 0.0416)
+
+
+def log_entry(method: str, **params) -> dict:
+    return {'level': 'INFO', 'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class FakeDriver:
+    """
+    get_log() hands out one batch of performance entries per call, as
+    Chrome does; getResponseBody answers from `bodies`
+    """
+
+    def __init__(self, batches, bodies):
+        self.batches = list(batches)
+        self.bodies = bodies
+
+    def get_log(self, log_type: str):
+        assert log_type == 'performance'
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_cdp_cmd(self, command: str, args: dict):
+        assert command == 'Network.getResponseBody'
+        if args['requestId'] not in self.bodies:
+            raise RuntimeError('No resource with given identifier found')
+        return self.bodies[args['requestId']]
+
+
+@unittest.skipIf(NetworkCapture is None, "browser_pool needs selenium")
+class NetworkCaptureTest(unittest.TestCase):
+    EC2_URL = 'https://calculator.aws/pricing/2.0/meteredUnitMaps/ec2/USD/current/ec2-calc/Linux.json'
+
+    def test_waits_for_matching_responses(self):
+        document = {'regions': {}}
+        driver = FakeDriver(
+            batches=[
+                [log_entry('Network.responseReceived', requestId='1', response={'url': 'https://calculator.aws/app.js'}),
+                 log_entry('Network.responseReceived', requestId='2', response={'url': self.EC2_URL}),
+                 log_entry('Network.dataReceived', requestId='2', dataLength=512)],
+                [log_entry('Network.loadingFinished', requestId='1'),
+                 log_entry('Network.responseReceived', requestId='3', response={'url': self.EC2_URL + '?v=2'})],
+                [log_entry('Network.loadingFinished', requestId='2'),
+                 log_entry('Network.loadingFinished', requestId='3')],
+            ],
+            bodies={
+                '2': {'body': json.dumps(document), 'base64Encoded': False},
+                '3': {'body': base64.b64encode(b'not json').decode(), 'base64Encoded': True},
+            },
+        )
+        capture = NetworkCapture(AWS_CAPTURE, min_responses=2)
+
+        self.assertFalse(capture(driver))       # matched, still loading
+        self.assertEqual(capture.pending, {'2': self.EC2_URL})
+        self.assertFalse(capture(driver))       # request 1 never matched the pattern
+        self.assertTrue(capture(driver))
+        self.assertEqual([request_id for request_id, _ in capture.finished], ['2', '3'])
+
+        # The body that is not JSON is skipped
+        self.assertEqual(capture.responses(driver), [(self.EC2_URL, document)])
+
+    def test_evicted_body_is_skipped(self):
+        driver = FakeDriver(
+            batches=[[log_entry('Network.responseReceived', requestId='7', response={'url': self.EC2_URL}),
+                      log_entry('Network.loadingFinished', requestId='7')]],
+            bodies={},
+        )
+        capture = NetworkCapture(AWS_CAPTURE)
+        self.assertTrue(capture(driver))
+        self.assertEqual(capture.responses(driver), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+CLI Import Test
+`cli.py compare` must start without the heavy dependencies: numpy,
+requests, pyarrow, bs4 and selenium are only imported by the
+subcommands and sections that use them, and the script's own imports
+stay within the startup budget.
+
+    python -m unittest test_cli_imports     (or python -m pytest)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import Dict, List
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('numpy', 'requests', 'pyarrow', 'bs4', 'selenium')
+# Cumulative -X importtime of everything the bare interpreter does not import
+IMPORT_BUDGET_MS = 100.0
+
+SNAPSHOT = {
+    'metadata': {'timestamp': '2024-01-01T00:00:00', 'source': 'test fixture'},
+    'AWS': {
+        'compute': [{'id': 'ec2-t3-medium', 'name': 't3.medium', 'baseCost': 30.37,
+                     'category': 'compute', 'specs': '2 vCPU, 4GB RAM'}],
+        'database': [{'id': 'rds-postgres', 'name': 'RDS PostgreSQL', 'baseCost': 15.0,
+                      'category': 'database', 'specs': 'db.t3.micro'}],
+        'storage': [{'id': 's3-standard', 'name': 'S3 Standard', 'baseCost': 23.0,
+                     'category': 'storage', 'specs': '1TB'}],
+    },
+    'Azure': {'storage': [{'id': 'azure-blob-storage', 'name': 'Blob Storage', 'baseCost': 18.0,
+                           'category': 'storage', 'specs': '1TB'}]},
+    'GCP': {
+        'compute': [{'id': 'gcp-e2-medium', 'name': 'e2-medium', 'baseCost': 24.46,
+                     'category': 'compute', 'specs': '2 vCPU, 4GB RAM'}],
+        'storage': [{'id': 'gcp-cloud-storage', 'name': 'Cloud Storage', 'baseCost': 20.0,
+                     'category': 'storage', 'specs': '1TB'}],
+    },
+}
+
+
+def import_times(importtime_log: str) -> Dict[str, int]:
+    """
+    Top-level import -> cumulative microseconds in a `python -X importtime` log
+    """
+    times = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or line.count('|') != 2:
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue   # the header line
+        # Nested imports are indented under the module that pulled them in
+        if not name.startswith('  '):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def imported_modules(importtime_log: str) -> set:
+    """
+    Top-level package names in a `python -X importtime` log
+    """
+    modules = set()
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        name = line.rsplit('|', 1)[1].strip()
+        if name and name != 'imported package':
+            modules.add(name.split('.')[0])
+    return modules
+
+
+def importtime_log(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                          cwd=SCRIPTS_DIR, capture_output=True, text=True, timeout=60)
+
+
+class CompareImportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.baseline = set(import_times(importtime_log(['-c', 'pass']).stderr))
+
+    def run_compare(self, *section: str) -> subprocess.CompletedProcess:
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot = os.path.join(tmp, 'pricing.json')
+            with open(snapshot, 'w') as f:
+                json.dump(SNAPSHOT, f)
+            return importtime_log(['cli.py', 'compare', snapshot, *section,
+                                   '--db', os.path.join(tmp, 'catalog.db'),
+                                   '--region-matrix', os.path.join(tmp, 'missing.npz')])
+
+    def assert_light(self, result: subprocess.CompletedProcess):
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        modules = imported_modules(result.stderr)
+        self.assertIn('price_catalog', modules)   # the log was parsed
+        heavy = [module for module in HEAVY_MODULES if module in modules]
+        self.assertEqual(heavy, [], f"compare imported {', '.join(heavy)}")
+
+        own = {name: us for name, us in import_times(result.stderr).items() if name not in self.baseline}
+        total_ms = sum(own.values()) / 1000
+        slowest = sorted(own.items(), key=lambda item: -item[1])[:5]
+        self.assertLess(total_ms, IMPORT_BUDGET_MS, f"imports took {total_ms:.1f}ms: {slowest}")
+
+    def test_report_skips_heavy_imports(self):
+        result = self.run_compare()
+        self.assert_light(result)
+        self.assertIn('CLOUD PRICING COMPARISON REPORT', result.stdout)
+        self.assertIn('Sample App', result.stdout)
+
+    def test_section_skips_heavy_imports(self):
+        result = self.run_compare('--section', 'storage')
+        self.assert_light(result)
+        self.assertIn('Storage', result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Server Catalog Test
+server/data/serviceCatalog.js is generated from server/data/cloudServices.js:
+the evaluator scores with the first while routes/services.js serves the
+second, so an edit to cloudServices.js must be followed by a rebuild
+(python cli.py export --format server).
+
+    python -m unittest test_server_catalog     (or python -m pytest)
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from server_catalog import DEFAULT_BASE_CATALOG, build_server_catalog, stale_entries
+
+
+@unittest.skipIf(shutil.which('node') is None, "reading the JS catalogs needs node")
+class ServerCatalogTest(unittest.TestCase):
+
+    def test_catalog_matches_cloud_services(self):
+        problems = stale_entries()
+        self.assertEqual(problems, [], "serviceCatalog.js is stale, run `python cli.py export --format server`:\n"
+                         + '\n'.join(problems[:20]))
+
+    def test_detects_a_changed_price(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = os.path.join(tmp, 'cloudServices.js')
+            with open(DEFAULT_BASE_CATALOG, 'r', encoding='utf-8') as f:
+                source = f.read()
+            with open(base, 'w', encoding='utf-8') as f:
+                f.write(source)
+            catalog = os.path.join(tmp, 'serviceCatalog.js')
+            build_server_catalog(base_path=base, output=catalog)
+            self.assertEqual(stale_entries(base, catalog), [])
+
+            with open(base, 'w', encoding='utf-8') as f:
+                f.write(source.replace('cost: 0.0116', 'cost: 0.0120', 1))
+            self.assertEqual(stale_entries(base, catalog),
+                             ['AWS/ec2-t2-micro monthlyCost 8.468 != 8.76'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tiered Pricing Models
+Usage-based prices as piecewise tier tables (storage volume tiers,
+per-request and per-GB-second charges, free allowances), evaluated over
+whole arrays of usage levels at once
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+# Usage dimension of a ranged AWS SKU, by its price unit
+UNIT_DIMENSIONS = {
+    'GB-Mo': 'storage_gb',
+    'GB': 'transfer_gb',
+    'Requests': 'requests',
+    'Request': 'requests',
+    'Lambda-GB-Second': 'gb_seconds',
+    'GB-Second': 'gb_seconds',
+}
+
+
+class Tier(NamedTuple):
+    """
+    `price` per unit for usage between the previous tier's `up_to` and this one
+    """
+    up_to: float
+    price: float
+
+
+class Dimension:
+    """
+    One metered quantity (GB-months, requests, GB-seconds) with its tier
+    table. The free allowance is deducted before the tiers apply.
+    """
+
+    def __init__(self, unit: str, tiers: Sequence[Tier], free: float = 0.0):
+        if not tiers:
+            raise ValueError(f"{unit}: a dimension needs at least one tier")
+        self.unit = unit
+        self.tiers = [Tier(float(up_to), float(price)) for up_to, price in tiers]
+        self.free = float(free)
+        if self.tiers[-1].up_to != np.inf:
+            raise ValueError(f"{unit}: the last tier must be open-ended (up_to=inf)")
+
+        self.upper = np.array([tier.up_to for tier in self.tiers])
+        self.lower = np.concatenate([[0.0], self.upper[:-1]])
+        self.price = np.array([tier.price for tier in self.tiers])
+        if np.any(np.diff(self.upper) <= 0):
+            raise ValueError(f"{unit}: tier bounds must increase")
+        # Cost of all usage below each tier's lower bound
+        self.base = np.concatenate([[0.0], np.cumsum((self.upper[:-1] - self.lower[:-1]) * self.price[:-1])])
+
+    def __repr__(self) -> str:
+        return f"Dimension({self.unit!r}, {self.tiers!r}, free={self.free:g})"
+
+    def cost(self, usage) -> np.ndarray:
+        """
+        Cost of each usage level: one searchsorted into the tier bounds,
+        then the cost below that tier plus the part inside it
+        """
+        billable = np.maximum(np.asarray(usage, dtype=np.float64) - self.free, 0.0)
+        tier = np.searchsorted(self.upper, billable, side='left')
+        return self.base[tier] + (billable - self.lower[tier]) * self.price[tier]
+
+    @classmethod
+    def flat(cls, unit: str, price: float, free: float = 0.0) -> 'Dimension':
+        return cls(unit, [Tier(np.inf, price)], free)
+
+    @classmethod
+    def from_ranges(cls, unit: str, ranges: Sequence[Sequence], free: float = 0.0) -> 'Dimension':
+        """
+        From [begin, end, price] rows (end None = open-ended), the shape of
+        the `tiers` field aws_offers keeps for ranged SKUs
+        """
+        return cls(unit, [Tier(np.inf if end is None else end, price)
+                          for _, end, price in sorted(ranges, key=lambda row: row[0])], free)
+
+
+class TieredPrice:
+    """
+    A service priced on one or more usage dimensions plus a fixed monthly fee
+    """
+
+    def __init__(self, id: str, provider: str, name: str, dimensions: Dict[str, Dimension],
+                 monthly_fee: float = 0.0, pricing_url: Optional[str] = None):
+        self.id = id
+        self.provider = provider
+        self.name = name
+        self.dimensions = dimensions
+        self.monthly_fee = monthly_fee
+        self.pricing_url = pricing_url
+
+    def __repr__(self) -> str:
+        return f"TieredPrice({self.provider}/{self.id}: {', '.join(self.dimensions)})"
+
+    def breakdown(self, **usage) -> Dict[str, np.ndarray]:
+        """
+        Cost per dimension; usage arrays broadcast against each other and
+        dimensions without usage cost nothing
+        """
+        unknown = set(usage) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"{self.id} has no usage dimension {', '.join(sorted(unknown))}")
+        return {name: dimension.cost(usage[name]) for name, dimension in self.dimensions.items() if name in usage}
+
+    def cost(self, **usage) -> np.ndarray:
+        """
+        Monthly cost at each usage level, e.g.
+        model.cost(requests=np.logspace(5, 9, 50), gb_seconds=...)
+        """
+        return sum(self.breakdown(**usage).values(), np.float64(self.monthly_fee))
+
+    @classmethod
+    def from_record(cls, record: Dict, provider: str, dimension: Optional[str] = None) -> Optional['TieredPrice']:
+        """
+        Model of a catalog record that carries a `tiers` table, None
+        otherwise. The usage dimension is named after the record's unit.
+        """
+        if not record.get('tiers'):
+            return None
+        unit = record.get('unit') or ''
+        dimension = dimension or UNIT_DIMENSIONS.get(unit, 'usage')
+        return cls(record['id'], provider, record.get('name') or record['id'],
+                   {dimension: Dimension.from_ranges(unit or dimension, record['tiers'])},
+                   pricing_url=record.get('pricing_url'))
+
+
+def gb_seconds(requests, duration_ms, memory_mb) -> np.ndarray:
+    """
+    Function compute: invocations x seconds per invocation x GB configured
+    """
+    return (np.asarray(requests, dtype=np.float64) * np.asarray(duration_ms, dtype=np.float64) / 1000
+            * np.asarray(memory_mb, dtype=np.float64) / 1024)
+
+
+INF = np.inf
+
+# Published list prices for the services the scrapers only carry as a
+# single baseCost (US regions, monthly usage; free tiers that never expire)
+TIERED_MODELS: Dict[str, TieredPrice] = {model.id: model for model in [
+    TieredPrice('s3-standard', 'AWS', 'S3 Standard', {
+        'storage_gb': Dimension('GB-Mo', [Tier(51_200, 0.023), Tier(512_000, 0.022), Tier(INF, 0.021)]),
+        'requests': Dimension.flat('PUT/COPY/POST/LIST', 0.005 / 1000),
+    }, pricing_url='https://aws.amazon.com/s3/pricing/'),
+    TieredPrice('lambda-128mb', 'AWS', 'Lambda', {
+        'requests': Dimension.flat('Requests', 0.20 / 1_000_000, free=1_000_000),
+        'gb_seconds': Dimension('Lambda-GB-Second',
+                                [Tier(6e9, 0.0000166667), Tier(15e9, 0.0000150000), Tier(INF, 0.0000133334)],
+                                free=400_000),
+    }, pricing_url='https://aws.amazon.com/lambda/pricing/'),
+    TieredPrice('azure-blob-storage', 'Azure', 'Blob Storage', {
+        'storage_gb': Dimension('1 GB/Month', [Tier(51_200, 0.018), Tier(512_000, 0.0173), Tier(INF, 0.0166)]),
+        'requests': Dimension.flat('Write operations', 0.05 / 10_000),
+    }, pricing_url='https://azure.microsoft.com/en-us/pricing/details/storage/blobs/'),
+    TieredPrice('azure-functions', 'Azure', 'Azure Functions', {
+        'requests': Dimension.flat('Executions', 0.20 / 1_000_000, free=1_000_000),
+        'gb_seconds': Dimension.flat('GB Seconds', 0.000016, free=400_000),
+    }, pricing_url='https://azure.microsoft.com/en-us/pricing/details/functions/'),
+    TieredPrice('gcp-cloud-storage', 'GCP', 'Cloud Storage', {
+        'storage_gb': Dimension.flat('GiBy.mo', 0.020, free=5),
+        'requests': Dimension.flat('Class A operations', 0.05 / 10_000, free=5_000),
+    }, pricing_url='https://cloud.google.com/storage/pricing'),
+    TieredPrice('gcp-cloud-functions', 'GCP', 'Cloud Functions', {
+        'requests': Dimension.flat('Invocations', 0.40 / 1_000_000, free=2_000_000),
+        'gb_seconds': Dimension.flat('GB-seconds', 0.0000025, free=400_000),
+    }, pricing_url='https://cloud.google.com/functions/pricing'),
+    TieredPrice('aws-data-transfer-out', 'AWS', 'Data Transfer Out', {
+        'egress_gb': Dimension('GB', [Tier(10_240, 0.09), Tier(51_200, 0.085), Tier(153_600, 0.07), Tier(INF, 0.05)],
+                               free=100),
+    }, pricing_url='https://aws.amazon.com/ec2/pricing/on-demand/#Data_Transfer'),
+    TieredPrice('azure-bandwidth', 'Azure', 'Bandwidth', {
+        'egress_gb': Dimension('1 GB', [Tier(10_240, 0.087), Tier(51_200, 0.083), Tier(153_600, 0.07), Tier(INF, 0.05)],
+                               free=100),
+    }, pricing_url='https://azure.microsoft.com/en-us/pricing/details/bandwidth/'),
+    TieredPrice('gcp-network-egress', 'GCP', 'Internet Egress (Premium)', {
+        'egress_gb': Dimension('GiBy', [Tier(1_024, 0.12), Tier(10_240, 0.11), Tier(INF, 0.08)]),
+    }, pricing_url='https://cloud.google.com/vpc/network-pricing'),
+]}
+
+# Internet egress model per provider
+EGRESS_MODELS = {
+    'AWS': 'aws-data-transfer-out',
+    'Azure': 'azure-bandwidth',
+    'GCP': 'gcp-network-egress',
+}
+
+
+def model_for(record: Dict, provider: str) -> Optional[TieredPrice]:
+    """
+    Tier table of a catalog record: its own `tiers` field, else the
+    published model for its id, else None (flat baseCost only)
+    """
+    return TieredPrice.from_record(record, provider) or TIERED_MODELS.get(record.get('id'))
+
+
+def cost_curves(models: List[TieredPrice], **usage) -> Dict[str, np.ndarray]:
+    """
+    id -> cost at every usage level, for comparing services over a range
+    """
+    return {model.id: model.cost(**{name: value for name, value in usage.items() if name in model.dimensions})
+            for model in models}
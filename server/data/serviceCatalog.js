@@ -0,0 +1,110 @@
+// Auto-generated by scripts/server_catalog.py - rebuild instead of editing
+// Sources: cloudServices.js
+
+const serviceIndex = {
+  AWS: {
+    "ec2-t2-micro": { id: "ec2-t2-micro", name: "EC2 t2.micro", cost: 0.0116, category: "compute", specs: "1 vCPU, 1GB RAM", monthlyCost: 8.468, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "ec2-t2-small": { id: "ec2-t2-small", name: "EC2 t2.small", cost: 0.023, category: "compute", specs: "1 vCPU, 2GB RAM", monthlyCost: 16.79, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "ec2-t2-medium": { id: "ec2-t2-medium", name: "EC2 t2.medium", cost: 0.0464, category: "compute", specs: "2 vCPU, 4GB RAM", monthlyCost: 33.872, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "lambda": { id: "lambda", name: "Lambda", cost: 2e-07, category: "serverless", specs: "Per request", monthlyCost: 0.19999999999999998, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "s3-standard": { id: "s3-standard", name: "S3 Standard", cost: 0.023, category: "storage", specs: "Per GB/month", monthlyCost: 0.22999999999999998, pricingModel: "per_gb", usage: 10, usageUnit: "GB" },
+    "s3-infrequent": { id: "s3-infrequent", name: "S3 Infrequent Access", cost: 0.0125, category: "storage", specs: "Per GB/month", monthlyCost: 0.125, pricingModel: "per_gb", usage: 10, usageUnit: "GB" },
+    "ebs-gp3": { id: "ebs-gp3", name: "EBS gp3", cost: 0.08, category: "storage", specs: "Per GB/month", monthlyCost: 0.8, pricingModel: "per_gb", usage: 10, usageUnit: "GB" },
+    "rds-mysql-small": { id: "rds-mysql-small", name: "RDS MySQL db.t3.small", cost: 0.034, category: "database", specs: "2 vCPU, 2GB RAM", monthlyCost: 24.82, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "dynamodb": { id: "dynamodb", name: "DynamoDB", cost: 0.25, category: "database", specs: "Per million writes", monthlyCost: 0.25, pricingModel: "flat", usage: 1, usageUnit: "month" },
+    "aurora-serverless": { id: "aurora-serverless", name: "Aurora Serverless", cost: 0.06, category: "database", specs: "Per ACU-hour", monthlyCost: 43.8, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "elb": { id: "elb", name: "Elastic Load Balancer", cost: 0.0225, category: "networking", specs: "Per hour", monthlyCost: 16.425, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "cloudfront": { id: "cloudfront", name: "CloudFront CDN", cost: 0.085, category: "networking", specs: "Per GB", monthlyCost: 8.5, pricingModel: "per_gb", usage: 100, usageUnit: "GB" },
+    "api-gateway": { id: "api-gateway", name: "API Gateway", cost: 3.5e-06, category: "networking", specs: "Per request", monthlyCost: 0.002555, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "vpc": { id: "vpc", name: "VPC", cost: 0, category: "networking", specs: "Free", monthlyCost: 0, pricingModel: "free", usage: 0, usageUnit: "month" },
+    "sqs": { id: "sqs", name: "SQS Queue", cost: 4e-07, category: "messaging", specs: "Per request", monthlyCost: 0.39999999999999997, pricingModel: "per_request", usage: 1000000, usageUnit: "messages" },
+    "sns": { id: "sns", name: "SNS", cost: 5e-07, category: "messaging", specs: "Per notification", monthlyCost: 0.5, pricingModel: "per_request", usage: 1000000, usageUnit: "messages" },
+    "elasticache-redis": { id: "elasticache-redis", name: "ElastiCache Redis", cost: 0.034, category: "cache", specs: "cache.t3.small", monthlyCost: 24.82, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "sagemaker-inference": { id: "sagemaker-inference", name: "SageMaker Inference", cost: 0.05, category: "ai", specs: "ml.t3.medium", monthlyCost: 36.5, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "rekognition": { id: "rekognition", name: "Rekognition", cost: 0.001, category: "ai", specs: "Per image", monthlyCost: 10.0, pricingModel: "per_image", usage: 10000, usageUnit: "images" },
+    "comprehend": { id: "comprehend", name: "Comprehend", cost: 0.0001, category: "ai", specs: "Per 100 chars", monthlyCost: 0.07300000000000001, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "bedrock": { id: "bedrock", name: "Amazon Bedrock", cost: 0.0008, category: "ai", specs: "Per 1K tokens", monthlyCost: 800.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+  },
+  Azure: {
+    "vm-b1s": { id: "vm-b1s", name: "VM B1S", cost: 0.0104, category: "compute", specs: "1 vCPU, 1GB RAM", monthlyCost: 7.592, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "vm-b2s": { id: "vm-b2s", name: "VM B2S", cost: 0.0416, category: "compute", specs: "2 vCPU, 4GB RAM", monthlyCost: 30.368, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "functions": { id: "functions", name: "Azure Functions", cost: 2e-07, category: "serverless", specs: "Per execution", monthlyCost: 0.19999999999999998, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "blob-hot": { id: "blob-hot", name: "Blob Storage Hot", cost: 0.018, category: "storage", specs: "Per GB/month", monthlyCost: 0.18, pricingModel: "per_gb", usage: 10, usageUnit: "GB" },
+    "blob-cool": { id: "blob-cool", name: "Blob Storage Cool", cost: 0.01, category: "storage", specs: "Per GB/month", monthlyCost: 0.1, pricingModel: "per_gb", usage: 10, usageUnit: "GB" },
+    "sql-basic": { id: "sql-basic", name: "SQL Database Basic", cost: 0.0067, category: "database", specs: "5 DTUs", monthlyCost: 4.891, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "cosmos-db": { id: "cosmos-db", name: "Cosmos DB", cost: 0.008, category: "database", specs: "Per RU/s hour", monthlyCost: 5.84, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "load-balancer": { id: "load-balancer", name: "Load Balancer", cost: 0.025, category: "networking", specs: "Per hour", monthlyCost: 18.25, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "cdn": { id: "cdn", name: "CDN", cost: 0.081, category: "networking", specs: "Per GB", monthlyCost: 8.1, pricingModel: "per_gb", usage: 100, usageUnit: "GB" },
+    "vnet": { id: "vnet", name: "Virtual Network", cost: 0, category: "networking", specs: "Free", monthlyCost: 0, pricingModel: "free", usage: 0, usageUnit: "month" },
+    "cognitive-vision": { id: "cognitive-vision", name: "Computer Vision", cost: 0.001, category: "ai", specs: "Per image", monthlyCost: 10.0, pricingModel: "per_image", usage: 10000, usageUnit: "images" },
+    "cognitive-language": { id: "cognitive-language", name: "Language Service", cost: 0.0002, category: "ai", specs: "Per 1K chars", monthlyCost: 200.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "ml-inference": { id: "ml-inference", name: "ML Inference", cost: 0.06, category: "ai", specs: "Per hour", monthlyCost: 43.8, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "openai-service": { id: "openai-service", name: "Azure OpenAI", cost: 0.0006, category: "ai", specs: "Per 1K tokens", monthlyCost: 600.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+  },
+  GCP: {
+    "e2-micro": { id: "e2-micro", name: "E2 Micro", cost: 0.0084, category: "compute", specs: "2 vCPU, 1GB RAM", monthlyCost: 6.132, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "e2-small": { id: "e2-small", name: "E2 Small", cost: 0.0168, category: "compute", specs: "2 vCPU, 2GB RAM", monthlyCost: 12.264, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "cloud-functions": { id: "cloud-functions", name: "Cloud Functions", cost: 4e-07, category: "serverless", specs: "Per invocation", monthlyCost: 0.39999999999999997, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "gcs-standard": { id: "gcs-standard", name: "Cloud Storage Standard", cost: 0.02, category: "storage", specs: "Per GB/month", monthlyCost: 0.2, pricingModel: "per_gb", usage: 10, usageUnit: "GB" },
+    "gcs-nearline": { id: "gcs-nearline", name: "Cloud Storage Nearline", cost: 0.01, category: "storage", specs: "Per GB/month", monthlyCost: 0.1, pricingModel: "per_gb", usage: 10, usageUnit: "GB" },
+    "cloud-sql-small": { id: "cloud-sql-small", name: "Cloud SQL db-f1-micro", cost: 0.015, category: "database", specs: "0.6GB RAM", monthlyCost: 10.95, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "firestore": { id: "firestore", name: "Firestore", cost: 0.18, category: "database", specs: "Per million ops", monthlyCost: 131.4, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "load-balancing": { id: "load-balancing", name: "Load Balancing", cost: 0.025, category: "networking", specs: "Per hour", monthlyCost: 18.25, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "cloud-cdn": { id: "cloud-cdn", name: "Cloud CDN", cost: 0.08, category: "networking", specs: "Per GB", monthlyCost: 8.0, pricingModel: "per_gb", usage: 100, usageUnit: "GB" },
+    "vpc-network": { id: "vpc-network", name: "VPC Network", cost: 0, category: "networking", specs: "Free", monthlyCost: 0, pricingModel: "free", usage: 0, usageUnit: "month" },
+    "vision-api": { id: "vision-api", name: "Vision API", cost: 0.0015, category: "ai", specs: "Per 1K images", monthlyCost: 1500.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "natural-language": { id: "natural-language", name: "Natural Language API", cost: 0.0001, category: "ai", specs: "Per 1K chars", monthlyCost: 100.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "vertex-ai": { id: "vertex-ai", name: "Vertex AI", cost: 0.05, category: "ai", specs: "Per hour", monthlyCost: 36.5, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "palm-api": { id: "palm-api", name: "PaLM API", cost: 0.0004, category: "ai", specs: "Per 1K tokens", monthlyCost: 400.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+  },
+  RunPod: {
+    "rtx-4090": { id: "rtx-4090", name: "RTX 4090", cost: 0.44, category: "ai", specs: "24GB VRAM", monthlyCost: 321.2, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "a6000": { id: "a6000", name: "A6000", cost: 0.79, category: "ai", specs: "48GB VRAM", monthlyCost: 576.7, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "a100-40gb": { id: "a100-40gb", name: "A100 40GB", cost: 1.89, category: "ai", specs: "40GB HBM2e", monthlyCost: 1379.6999999999998, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "a100-80gb": { id: "a100-80gb", name: "A100 80GB", cost: 2.49, category: "ai", specs: "80GB HBM2e", monthlyCost: 1817.7, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "h100": { id: "h100", name: "H100", cost: 3.99, category: "ai", specs: "80GB HBM3", monthlyCost: 2912.7000000000003, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "llama-2-7b": { id: "llama-2-7b", name: "Llama 2 7B", cost: 0.0004, category: "ai", specs: "Per request", monthlyCost: 400.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "llama-2-13b": { id: "llama-2-13b", name: "Llama 2 13B", cost: 0.0008, category: "ai", specs: "Per request", monthlyCost: 800.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "llama-2-70b": { id: "llama-2-70b", name: "Llama 2 70B", cost: 0.0018, category: "ai", specs: "Per request", monthlyCost: 1800.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+    "mistral-7b": { id: "mistral-7b", name: "Mistral 7B", cost: 0.0003, category: "ai", specs: "Per request", monthlyCost: 300.0, pricingModel: "per_request", usage: 1000000, usageUnit: "requests" },
+  },
+  MongoDB: {
+    "mongodb-atlas-m0": { id: "mongodb-atlas-m0", name: "MongoDB Atlas M0", cost: 0, category: "database", specs: "Free tier, 512MB", monthlyCost: 0, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "mongodb-atlas-m10": { id: "mongodb-atlas-m10", name: "MongoDB Atlas M10", cost: 0.08, category: "database", specs: "2GB RAM, 10GB storage", monthlyCost: 58.4, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+    "mongodb-atlas-m20": { id: "mongodb-atlas-m20", name: "MongoDB Atlas M20", cost: 0.2, category: "database", specs: "4GB RAM, 20GB storage", monthlyCost: 146.0, pricingModel: "hourly", usage: 730, usageUnit: "hours" },
+  },
+};
+
+const S = serviceIndex;
+const cloudServices = {
+  AWS: {
+    compute: [S["AWS"]["ec2-t2-micro"], S["AWS"]["ec2-t2-small"], S["AWS"]["ec2-t2-medium"], S["AWS"]["lambda"]],
+    storage: [S["AWS"]["s3-standard"], S["AWS"]["s3-infrequent"], S["AWS"]["ebs-gp3"]],
+    database: [S["AWS"]["rds-mysql-small"], S["AWS"]["dynamodb"], S["AWS"]["aurora-serverless"]],
+    networking: [S["AWS"]["elb"], S["AWS"]["cloudfront"], S["AWS"]["api-gateway"], S["AWS"]["vpc"]],
+    other: [S["AWS"]["sqs"], S["AWS"]["sns"], S["AWS"]["elasticache-redis"]],
+    ai: [S["AWS"]["sagemaker-inference"], S["AWS"]["rekognition"], S["AWS"]["comprehend"], S["AWS"]["bedrock"]],
+  },
+  Azure: {
+    compute: [S["Azure"]["vm-b1s"], S["Azure"]["vm-b2s"], S["Azure"]["functions"]],
+    storage: [S["Azure"]["blob-hot"], S["Azure"]["blob-cool"]],
+    database: [S["Azure"]["sql-basic"], S["Azure"]["cosmos-db"]],
+    networking: [S["Azure"]["load-balancer"], S["Azure"]["cdn"], S["Azure"]["vnet"]],
+    ai: [S["Azure"]["cognitive-vision"], S["Azure"]["cognitive-language"], S["Azure"]["ml-inference"], S["Azure"]["openai-service"]],
+  },
+  GCP: {
+    compute: [S["GCP"]["e2-micro"], S["GCP"]["e2-small"], S["GCP"]["cloud-functions"]],
+    storage: [S["GCP"]["gcs-standard"], S["GCP"]["gcs-nearline"]],
+    database: [S["GCP"]["cloud-sql-small"], S["GCP"]["firestore"]],
+    networking: [S["GCP"]["load-balancing"], S["GCP"]["cloud-cdn"], S["GCP"]["vpc-network"]],
+    ai: [S["GCP"]["vision-api"], S["GCP"]["natural-language"], S["GCP"]["vertex-ai"], S["GCP"]["palm-api"]],
+  },
+  RunPod: {
+    ai: [S["RunPod"]["rtx-4090"], S["RunPod"]["a6000"], S["RunPod"]["a100-40gb"], S["RunPod"]["a100-80gb"], S["RunPod"]["h100"], S["RunPod"]["llama-2-7b"], S["RunPod"]["llama-2-13b"], S["RunPod"]["llama-2-70b"], S["RunPod"]["mistral-7b"]],
+  },
+  MongoDB: {
+    database: [S["MongoDB"]["mongodb-atlas-m0"], S["MongoDB"]["mongodb-atlas-m10"], S["MongoDB"]["mongodb-atlas-m20"]],
+  },
+};
+
+module.exports = { cloudServices, serviceIndex };
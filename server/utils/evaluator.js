@@ -1,4 +1,7 @@
-const cloudServices = require('../data/cloudServices');
+// Generated from data/cloudServices.js by scripts/server_catalog.py: services
+// indexed by provider and id, each with its monthlyCost precomputed
+// (scripts/test_server_catalog.py fails when it is stale)
+const { serviceIndex } = require('../data/serviceCatalog');
 const LLMEvaluator = require('./llmEvaluator');
 
 /**
@@ -27,6 +30,24 @@ const LLMEvaluator = require('./llmEvaluator');
  *   );
  *   const result = await evaluator.evaluate();
  */
+/**
+ * Service ID from a node ID: [provider]-[service-id]-[timestamp]
+ * "aws-cloudfront-1768664069239" -> "cloudfront"
+ * "aws-s3-standard-1768664074260" -> "s3-standard"
+ */
+function serviceIdFromNode(node) {
+  const parts = (node.id || '').split('-');
+  return parts.length >= 3 ? parts.slice(1, -1).join('-') : '';
+}
+
+/**
+ * O(1) catalog lookup (own keys only, so "constructor" is not a service)
+ */
+function findService(services, node) {
+  const serviceId = serviceIdFromNode(node);
+  return Object.prototype.hasOwnProperty.call(services, serviceId) ? services[serviceId] : null;
+}
+
 class ArchitectureEvaluator {
   constructor(submission, challenge, useLLM = false, llmConfig = null) {
     this.submission = submission;
@@ -127,77 +148,17 @@ class ArchitectureEvaluator {
   }
 
   calculateCost(architecture, provider) {
-    const services = cloudServices[provider];
+    const services = serviceIndex[provider];
     if (!services) return 0;
 
     let totalCost = 0;
-    const hoursPerMonth = 730; // Average hours in a month
 
     architecture.nodes.forEach(node => {
-      // Extract service ID from node ID (format: aws-cloudfront-1768664069239 -> cloudfront)
-      const nodeId = node.id || '';
-      const parts = nodeId.split('-');
-      let serviceId = '';
-      if (parts.length >= 3) {
-        serviceId = parts.slice(1, -1).join('-');
-      }
-
-      // Find the service in the cloud services data
-      let service = null;
-      for (const category in services) {
-        service = services[category].find(s => s.id === serviceId);
-        if (service) break;
-      }
-
+      const service = findService(services, node);
       if (service) {
         console.log(`[Evaluator] Calculating cost for ${service.name}: base cost $${service.cost}`);
-        // Calculate monthly cost based on service type
-        if (service.category === 'compute') {
-          totalCost += service.cost * hoursPerMonth;
-        } else if (service.category === 'storage') {
-          // Assume 10GB default storage
-          totalCost += service.cost * 10;
-        } else if (service.category === 'serverless') {
-          // Assume 1M requests/month
-          totalCost += service.cost * 1000000;
-        } else if (service.category === 'database') {
-          if (service.id.includes('dynamodb')) {
-            totalCost += service.cost; // DynamoDB cost is per million writes
-          } else {
-            totalCost += service.cost * hoursPerMonth;
-          }
-        } else if (service.category === 'networking') {
-          if (service.cost === 0) {
-            // Free service
-          } else if (service.id.includes('cdn') || service.id.includes('cloudfront')) {
-            // CDN: assume 100GB bandwidth
-            totalCost += service.cost * 100;
-          } else {
-            totalCost += service.cost * hoursPerMonth;
-          }
-        } else if (service.category === 'messaging') {
-          // Assume 1M messages/month
-          totalCost += service.cost * 1000000;
-        } else if (service.category === 'cache') {
-          totalCost += service.cost * hoursPerMonth;
-        } else if (service.category === 'ai') {
-          // AI cost calculation based on pricing model
-          if (service.specs.includes('Per request') || service.specs.includes('Per 1K')) {
-            // Request-based pricing (assume 1M requests/month)
-            totalCost += service.cost * 1000000;
-          } else if (service.specs.includes('Per image')) {
-            // Image processing (assume 10K images/month)
-            totalCost += service.cost * 10000;
-          } else if (service.specs.includes('Per hour') || service.specs.includes('VRAM')) {
-            // GPU/compute (hourly pricing)
-            totalCost += service.cost * hoursPerMonth;
-          } else {
-            // Default to hourly
-            totalCost += service.cost * hoursPerMonth;
-          }
-        } else {
-          totalCost += service.cost;
-        }
+        // Monthly cost under the default usage (730 hours, 10GB, 1M requests...)
+        totalCost += service.monthlyCost;
       }
     });
 
@@ -215,7 +176,7 @@ class ArchitectureEvaluator {
     }
 
     // Get service categories used in the architecture
-    const services = cloudServices[provider];
+    const services = serviceIndex[provider];
     if (!services) {
       errors.push(`Provider ${provider} not supported`);
       return { valid: false, errors };
@@ -223,19 +184,9 @@ class ArchitectureEvaluator {
 
     const usedCategories = new Set();
     architecture.nodes.forEach(node => {
-      // Extract service ID from node ID
-      const nodeId = node.id || '';
-      const parts = nodeId.split('-');
-      let serviceId = '';
-      if (parts.length >= 3) {
-        serviceId = parts.slice(1, -1).join('-');
-      }
-
-      for (const category in services) {
-        const service = services[category].find(s => s.id === serviceId);
-        if (service) {
-          usedCategories.add(service.category);
-        }
+      const service = findService(services, node);
+      if (service) {
+        usedCategories.add(service.category);
       }
     });
 
@@ -410,7 +361,7 @@ class ArchitectureEvaluator {
     const { requiredServices } = this.challenge.constraints;
     const nodes = this.submission.architecture.nodes;
     const provider = this.submission.provider;
-    const services = cloudServices[provider];
+    const services = serviceIndex[provider];
 
     if (!services) {
       return {
@@ -421,29 +372,13 @@ class ArchitectureEvaluator {
 
     const usedCategories = new Set();
     nodes.forEach(node => {
-      // Extract service ID from node ID (format: aws-cloudfront-1768664069239 -> cloudfront)
-      // Node ID format: [provider]-[service-id]-[timestamp]
-      const nodeId = node.id || '';
-      const parts = nodeId.split('-');
-
-      // Remove provider prefix and timestamp suffix
-      // For "aws-cloudfront-1768664069239", we want "cloudfront"
-      // For "aws-s3-standard-1768664074260", we want "s3-standard"
-      let serviceId = '';
-      if (parts.length >= 3) {
-        // Remove first part (provider) and last part (timestamp)
-        serviceId = parts.slice(1, -1).join('-');
-      }
-
+      const serviceId = serviceIdFromNode(node);
       console.log(`[Evaluator] Checking node ${node.id} -> extracted service ID: ${serviceId}`);
 
-      // Find matching service in cloudServices
-      for (const category in services) {
-        const service = services[category].find(s => s.id === serviceId);
-        if (service) {
-          console.log(`[Evaluator] ✓ Found service: ${service.name} (category: ${service.category})`);
-          usedCategories.add(service.category);
-        }
+      const service = findService(services, node);
+      if (service) {
+        console.log(`[Evaluator] ✓ Found service: ${service.name} (category: ${service.category})`);
+        usedCategories.add(service.category);
       }
     });
 
@@ -1072,24 +1007,10 @@ class ArchitectureEvaluator {
   getServiceDetails(node) {
     if (!node) return null;
 
-    const services = cloudServices[this.submission.provider];
+    const services = serviceIndex[this.submission.provider];
     if (!services) return null;
 
-    // Extract service ID from node ID
-    const nodeId = node.id || '';
-    const parts = nodeId.split('-');
-    let serviceId = '';
-    if (parts.length >= 3) {
-      serviceId = parts.slice(1, -1).join('-');
-    }
-
-    // Search all categories
-    for (const category in services) {
-      const service = services[category].find(s => s.id === serviceId);
-      if (service) return service;
-    }
-
-    return null;
+    return findService(services, node);
   }
 
   getServiceCategory(node) {